@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+from schema import CELL_COLUMNS
+
+# Assumed FFB price used for revenue impact
+FFB_PRICE = 2800  # Rp per kg
+
+# Threshold buckets with precomputed per-cell suffix sums; a threshold only
+# re-aggregates the rows of the one bucket it falls into
+PARTIAL_BUCKETS = 256
+
+# Output columns produced for every grouping, after the grouping keys
+PRODUCTION_COLUMNS = [
+    'Jumlah_Pemanen', 'Produksi_Sebelum_ton', 'Produksi_Sesudah_ton', 'Peningkatan_ton',
+    'Revenue_Impact_juta', 'Avg_Quality_Before', 'Avg_Quality_After'
+]
+
+# Per-group sums every what-if scenario is computed from (see scenario.ScenarioCube)
+SCENARIO_INPUTS = ['Jumlah_Pemanen', 'days_before', 'days_after', 'prod_before', 'prod_after']
+
+
+def aggregate_production(df, by='Estate', ffb_price=FFB_PRICE):
+    """Aggregate production, revenue impact and quality for any combination of grouping keys"""
+    keys = [by] if isinstance(by, str) else list(by)
+
+    # Monthly production per worker in float64 so large sums stay exact
+    work = pd.DataFrame({key: df[key] for key in keys})
+    work['prod_before'] = (df['Tonase_Sebelum_kg_per_hari'].to_numpy(dtype='float64') *
+                           df['Hari_Kerja_Sebelum'].to_numpy(dtype='float64'))
+    work['prod_after'] = (df['Tonase_Sesudah_kg_per_hari'].to_numpy(dtype='float64') *
+                          df['Hari_Kerja_Sesudah'].to_numpy(dtype='float64'))
+    work['quality_before'] = df['Kualitas_Score_Sebelum'].to_numpy(dtype='float64')
+    work['quality_after'] = df['Kualitas_Score_Sesudah'].to_numpy(dtype='float64')
+
+    # Single grouped pass; sort=False keeps groups in order of first appearance
+    grouped = work.groupby(keys, observed=True, sort=False).agg(
+        Jumlah_Pemanen=('prod_before', 'size'),
+        prod_before=('prod_before', 'sum'),
+        prod_after=('prod_after', 'sum'),
+        Avg_Quality_Before=('quality_before', 'mean'),
+        Avg_Quality_After=('quality_after', 'mean')
+    )
+
+    return finish_production(grouped, ffb_price).reset_index()
+
+
+def finish_production(grouped, ffb_price=FFB_PRICE):
+    """Turn summed monthly production (prod_before/prod_after, kg) into the ton and revenue columns"""
+    gain = grouped['prod_after'] - grouped['prod_before']
+    grouped['Produksi_Sebelum_ton'] = grouped['prod_before'] / 1000
+    grouped['Produksi_Sesudah_ton'] = grouped['prod_after'] / 1000
+    grouped['Peningkatan_ton'] = gain / 1000
+    grouped['Revenue_Impact_juta'] = gain * ffb_price / 1_000_000
+    return grouped[PRODUCTION_COLUMNS]
+
+
+# Means behind the KPI cards and Key Findings: key -> column
+KPI_MEANS = {
+    'tonnage_before': 'Tonase_Sebelum_kg_per_hari',
+    'tonnage_after': 'Tonase_Sesudah_kg_per_hari',
+    'tonnage_gain_pct': 'Peningkatan_Tonase_pct',
+    'quality_before': 'Kualitas_Score_Sebelum',
+    'quality_after': 'Kualitas_Score_Sesudah',
+    'loss_before': 'Brondolan_Loss_Sebelum_pct',
+    'loss_after': 'Brondolan_Loss_Sesudah_pct',
+    'income_before': 'Pendapatan_Sebelum',
+    'income_after': 'Pendapatan_Sesudah',
+    'income_gain': 'Peningkatan_Pendapatan'
+}
+
+
+def summary_kpis(df):
+    """Return the worker count and KPI means of a filtered frame"""
+    kpis = {'count': len(df)}
+    for key, col in KPI_MEANS.items():
+        kpis[key] = df[col].mean()
+    return kpis
+
+
+def _measures(column):
+    """Yield (name, float64 values) of every additive measure; column(col) returns a column as float64"""
+    yield 'rows', np.ones_like(column('Tonase_Sebelum_kg_per_hari'))
+    for key, col in KPI_MEANS.items():
+        values = column(col)
+        valid = ~np.isnan(values)
+        yield key, np.where(valid, values, 0.0)
+        yield f'{key}_n', valid.astype('float64')
+    for period, suffix in (('Sebelum', 'before'), ('Sesudah', 'after')):
+        days = column(f'Hari_Kerja_{period}')
+        yield f'prod_{suffix}', np.nan_to_num(column(f'Tonase_{period}_kg_per_hari') * days)
+        yield f'days_{suffix}', np.nan_to_num(days)
+
+
+class CellAggregates:
+    """Additive partial sums per (Estate, Tingkat_Sertifikasi) cell behind the KPI cards and estate rollup.
+
+    Any selection of estates and levels is answered by adding the sums and counts
+    of the selected cells, independent of the number of rows. For the improvement
+    threshold, per-cell suffix sums are kept at PARTIAL_BUCKETS positions of the
+    FilterIndex's sorted order, so only the rows between the threshold and the next
+    bucket are re-aggregated. The frame is kept by reference for that and must not
+    be modified.
+    """
+
+    def __init__(self, df, filter_index, cell_columns=CELL_COLUMNS, buckets=PARTIAL_BUCKETS):
+        self.df = df
+        grouped = df.groupby(cell_columns, observed=True, sort=False)
+        # Rows with a missing key get NaN from ngroup; as code -1 they belong to no cell
+        self.codes = np.nan_to_num(grouped.ngroup().to_numpy(dtype='float64'), nan=-1).astype(np.int64)
+        self.cells = grouped.size().index.to_frame(index=False)
+        n_cells = len(self.cells)
+        in_cell = self.codes >= 0
+        rows = np.flatnonzero(in_cell)
+        codes = self.codes[in_cell]
+        self.first_row = np.full(n_cells, len(df))
+        np.minimum.at(self.first_row, codes, rows)
+
+        # Rows in the FilterIndex's order of the range column; NaNs sort last and never pass a threshold
+        self.order = filter_index.order
+        self.sorted_values = filter_index.sorted_values
+        self.n_valid = filter_index.n_valid
+        self.bucket_size = max(1, -(-self.n_valid // buckets))
+        n_buckets = -(-self.n_valid // self.bucket_size)
+
+        # Sums per (bucket, cell, measure); rows with a NaN threshold value go to a last, never-suffixed bucket
+        position = np.empty(len(df), dtype=np.int64)
+        position[self.order] = np.arange(len(df))
+        bucket = np.minimum(position // self.bucket_size, n_buckets)
+        bucket[position >= self.n_valid] = n_buckets
+        index = bucket[in_cell] * n_cells + codes
+
+        self.names = []
+        sums = []
+        for name, measure in _measures(lambda col: df[col].to_numpy(dtype='float64')):
+            self.names.append(name)
+            sums.append(np.bincount(index, weights=measure[in_cell], minlength=(n_buckets + 1) * n_cells))
+        sums = np.stack(sums, axis=-1).reshape(n_buckets + 1, n_cells, len(self.names))
+
+        # suffix[b] sums the rows at sorted positions >= b * bucket_size
+        self.total = sums.sum(axis=0)
+        self.suffix = np.zeros_like(sums)
+        self.suffix[:n_buckets] = np.cumsum(sums[n_buckets - 1::-1], axis=0)[::-1] if n_buckets else 0
+
+        # suffix_first[b] is each cell's first row among those same rows, for the estate order under a threshold
+        first = np.full((n_buckets + 1) * n_cells, len(df))
+        np.minimum.at(first, index, rows)
+        first = first.reshape(n_buckets + 1, n_cells)
+        self.suffix_first = np.full_like(first, len(df))
+        self.suffix_first[:n_buckets] = np.minimum.accumulate(first[n_buckets - 1::-1], axis=0)[::-1] if n_buckets else 0
+
+    def _threshold(self, min_value):
+        """Suffix bucket of min_value and the rows in a cell between the threshold and that bucket"""
+        start = int(np.searchsorted(self.sorted_values[:self.n_valid],
+                                    self.sorted_values.dtype.type(min_value), side='left'))
+        bucket = -(-start // self.bucket_size)
+        partial = self.order[start:min(bucket * self.bucket_size, self.n_valid)]
+        return bucket, partial[self.codes[partial] >= 0]
+
+    def cell_totals(self, min_value=None):
+        """(cells x measures) sums of the rows at or above min_value (of every row when None)"""
+        if min_value is None:
+            return self.total
+        bucket, partial = self._threshold(min_value)
+        totals = self.suffix[bucket].copy()
+
+        # Rows above the threshold but below the bucket boundary are aggregated directly
+        if len(partial):
+            codes = self.codes[partial]
+            measures = _measures(lambda col: self.df[col].to_numpy()[partial].astype('float64'))
+            for j, (_, measure) in enumerate(measures):
+                totals[:, j] += np.bincount(codes, weights=measure, minlength=len(self.cells))
+        return totals
+
+    def cell_first_rows(self, min_value=None):
+        """First row of each cell among the rows at or above min_value; len(df) for a cell without any"""
+        if min_value is None:
+            return self.first_row
+        bucket, partial = self._threshold(min_value)
+        first = self.suffix_first[bucket].copy()
+        np.minimum.at(first, self.codes[partial], partial)
+        return first
+
+    def estate_totals(self, selections, min_value=None):
+        """Per-estate sums of every measure over the selected cells, estates in order of first appearance"""
+        selected = np.ones(len(self.cells), dtype=bool)
+        for col, values in selections.items():
+            selected &= self.cells[col].isin(list(values)).to_numpy()
+        totals = pd.DataFrame(self.cell_totals(min_value)[selected], columns=self.names)
+
+        # Estates in order of first appearance among the selected rows passing the threshold,
+        # as aggregate_production with sort=False on those rows
+        totals['Estate'] = self.cells.loc[selected, 'Estate'].reset_index(drop=True)
+        totals = totals.iloc[np.argsort(self.cell_first_rows(min_value)[selected], kind='stable')]
+        grouped = totals.groupby('Estate', observed=True, sort=False).sum()
+        return grouped[grouped['rows'] > 0]
+
+    def summary(self, selections, min_value=None, ffb_price=FFB_PRICE):
+        """KPIs (as summary_kpis) and estate rollup (as aggregate_production) of the selected cells"""
+        grouped = self.estate_totals(selections, min_value)
+
+        column_sums = grouped.sum()
+        kpis = {'count': int(column_sums['rows'])}
+        for key in KPI_MEANS:
+            kpis[key] = column_sums[key] / column_sums[f'{key}_n'] if column_sums[f'{key}_n'] else np.nan
+
+        grouped['Jumlah_Pemanen'] = grouped['rows'].astype('int64')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            grouped['Avg_Quality_Before'] = grouped['quality_before'] / grouped['quality_before_n']
+            grouped['Avg_Quality_After'] = grouped['quality_after'] / grouped['quality_after_n']
+        return kpis, finish_production(grouped, ffb_price).reset_index()
+
+    def scenario_inputs(self, selections, min_value=None):
+        """Per-estate inputs of the scenario sweep, as scenario.scenario_inputs on the selected rows"""
+        grouped = self.estate_totals(selections, min_value)
+        grouped['Jumlah_Pemanen'] = grouped['rows'].astype('int64')
+        return grouped[SCENARIO_INPUTS]
@@ -0,0 +1,153 @@
+import argparse
+import json
+import time
+import tracemalloc
+
+from aggregation import aggregate_production
+from charts import estate_figures, financial_figures, productivity_figures, quality_figures
+from derive import derive_metrics
+from export import export_csv
+from filter_index import FilterIndex
+from ingest import read_harvester_csv
+from ranking import top_k
+from synthetic import generate_dummy_data
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+# A stage is reported as a regression when it is this much slower than the baseline
+DEFAULT_TOLERANCE = 1.25
+
+# ...and at least this many seconds slower, so sub-millisecond noise is ignored
+MIN_REGRESSION_SECONDS = 0.05
+
+# CSV ingestion is skipped above this size; the serialized file would not fit comfortably in memory
+INGEST_MAX_ROWS = 1_000_000
+
+
+def run_stage(records, n_rows, stage, func, *args):
+    """Run one stage, recording wall time and peak traced memory"""
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    records.append({
+        'rows': n_rows,
+        'stage': stage,
+        'seconds': round(seconds, 4),
+        'peak_mb': round((peak - base) / 1_048_576, 1)
+    })
+    return result
+
+
+def apply_filters(df, filter_index):
+    """Filter as main() does with a typical selection: half the estates, two levels, median threshold"""
+    estates = filter_index.options['Estate']
+    min_value, max_value = filter_index.value_range()
+    rows = filter_index.select({
+        'Estate': estates[:max(1, len(estates) // 2)],
+        'Tingkat_Sertifikasi': ['Madya', 'Mahir']
+    }, (min_value + max_value) / 2)
+    return df.iloc[rows]
+
+
+def top_performers(df):
+    """Build the two Top Performers tables"""
+    return top_k(df, 'Peningkatan_Tonase_pct'), top_k(df, 'Kualitas_Score_Sesudah')
+
+
+def build_figures(df, estate_metrics):
+    """Build and serialize every comparison section figure"""
+    sections = [productivity_figures(df), quality_figures(df), financial_figures(df), estate_figures(estate_metrics)]
+    return sum(len(value.to_json()) for section in sections for key, value in section.items() if key.startswith('fig_'))
+
+
+def run_pipeline(n_rows, ingest_max_rows=INGEST_MAX_ROWS):
+    """Run ingestion -> derive -> filter -> aggregate -> figures for one dataset size"""
+    records = []
+    df = run_stage(records, n_rows, 'generate', generate_dummy_data, n_rows)
+
+    if n_rows <= ingest_max_rows:
+        raw = export_csv(df)
+        df = run_stage(records, n_rows, 'ingest_csv', read_harvester_csv, raw)
+        del raw
+
+    run_stage(records, n_rows, 'derive', derive_metrics, df)
+    filter_index = run_stage(records, n_rows, 'filter_index', FilterIndex, df)
+    df_filtered = run_stage(records, n_rows, 'filter', apply_filters, df, filter_index)
+    estate_metrics = run_stage(records, n_rows, 'estate_production', aggregate_production, df_filtered)
+    run_stage(records, n_rows, 'top_performers', top_performers, df_filtered)
+    run_stage(records, n_rows, 'figures', build_figures, df_filtered, estate_metrics)
+    return records
+
+
+def compare(records, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Attach baseline timings and return the stages slower than tolerance x baseline"""
+    reference = {(r['rows'], r['stage']): r for r in baseline}
+    regressions = []
+    for record in records:
+        previous = reference.get((record['rows'], record['stage']))
+        if previous is None or previous['seconds'] <= 0:
+            continue
+        record['baseline_seconds'] = previous['seconds']
+        record['ratio'] = round(record['seconds'] / previous['seconds'], 2)
+        if record['ratio'] > tolerance and record['seconds'] - previous['seconds'] > MIN_REGRESSION_SECONDS:
+            regressions.append(record)
+    return regressions
+
+
+def print_report(records):
+    print(f"{'rows':>12}  {'stage':<18} {'seconds':>9} {'peak MB':>9} {'baseline':>9} {'ratio':>6}")
+    for r in records:
+        baseline = f"{r['baseline_seconds']:.4f}" if 'baseline_seconds' in r else '-'
+        ratio = f"{r['ratio']:.2f}" if 'ratio' in r else '-'
+        print(f"{r['rows']:>12,}  {r['stage']:<18} {r['seconds']:>9.4f} {r['peak_mb']:>9.1f} {baseline:>9} {ratio:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard data pipeline without a Streamlit server")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="Comma-separated row counts")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Overwrite the baseline with this run")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--output', help="Write this run's results as JSON")
+    args = parser.parse_args()
+
+    # Warm up imports and Plotly's validators so the first size isn't penalized
+    run_pipeline(100)
+
+    tracemalloc.start()
+    records = []
+    for n_rows in (int(size) for size in args.sizes.split(',')):
+        records.extend(run_pipeline(n_rows))
+    tracemalloc.stop()
+
+    regressions = []
+    if not args.save_baseline:
+        try:
+            with open(args.baseline) as f:
+                regressions = compare(records, json.load(f), args.tolerance)
+        except FileNotFoundError:
+            print(f"Baseline {args.baseline} tidak ditemukan; jalankan dengan --save-baseline")
+
+    print_report(records)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(records, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(records, f, indent=2)
+        print(f"Baseline disimpan ke {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} stage lebih lambat dari {args.tolerance}x baseline:")
+        for r in regressions:
+            print(f"  {r['rows']:,} baris / {r['stage']}: {r['seconds']:.4f}s vs {r['baseline_seconds']:.4f}s")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
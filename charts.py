@@ -0,0 +1,368 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Above this many values box plots are summarized server-side instead of shipping raw data
+BOX_SUMMARY_THRESHOLD = 5_000
+MAX_BOX_OUTLIERS = 200
+
+# Scatter switches to WebGL above the first threshold and to a binned heatmap above the second
+SCATTER_GL_THRESHOLD = 5_000
+SCATTER_DENSITY_THRESHOLD = 200_000
+
+CERTIFICATION_COLORS = {
+    'Dasar': '#42a5f5',
+    'Madya': '#ffa726',
+    'Mahir': '#ef5350'
+}
+
+
+def summarize_box(values, max_outliers=MAX_BOX_OUTLIERS):
+    """Compute Tukey box statistics and a capped, evenly spaced sample of outliers"""
+    values = np.asarray(values, dtype='float64')
+    values = np.sort(values[~np.isnan(values)])
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+
+    # Whiskers end at the most extreme data points still inside 1.5 * IQR
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    outliers = values[(values < inside[0]) | (values > inside[-1])]
+    if len(outliers) > max_outliers:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, max_outliers).round().astype(int)]
+
+    return {
+        'q1': q1, 'median': median, 'q3': q3, 'mean': values.mean(),
+        'lowerfence': inside[0], 'upperfence': inside[-1], 'outliers': outliers
+    }
+
+
+def sketch_box(sketch, scale=1, max_outliers=MAX_BOX_OUTLIERS):
+    """Tukey box statistics from a quantile sketch; fences and outliers are bucket representatives"""
+    q1, median, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    low_limit, high_limit = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    values, _, low, high = sketch.bucket_table()
+
+    # Whiskers end inside the outermost buckets that reach within 1.5 * IQR
+    inside = (high >= low_limit) & (low <= high_limit)
+    lowerfence = max(low[inside][0], low_limit)
+    upperfence = min(high[inside][-1], high_limit)
+    outliers = values[~inside].clip(sketch.min, sketch.max)
+    if len(outliers) > max_outliers:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, max_outliers).round().astype(int)]
+
+    return {
+        'q1': q1 * scale, 'median': median * scale, 'q3': q3 * scale, 'mean': sketch.sum / sketch.count * scale,
+        'lowerfence': lowerfence * scale, 'upperfence': upperfence * scale, 'outliers': outliers * scale
+    }
+
+
+def box_traces(values, name, color, threshold=BOX_SUMMARY_THRESHOLD, sketch=None, scale=1):
+    """Return box plot traces, precomputed server-side (from a sketch when given) when there are many values"""
+    if len(values) <= threshold or np.isnan(np.asarray(values, dtype='float64')).all():
+        return [go.Box(y=values, name=name, marker_color=color)]
+
+    stats = summarize_box(values) if sketch is None else sketch_box(sketch, scale)
+    return [
+        go.Box(
+            x=[name], name=name, legendgroup=name, marker_color=color, boxpoints=False,
+            q1=[stats['q1']], median=[stats['median']], q3=[stats['q3']], mean=[stats['mean']],
+            lowerfence=[stats['lowerfence']], upperfence=[stats['upperfence']]
+        ),
+        go.Scatter(
+            x=[name] * len(stats['outliers']), y=stats['outliers'], mode='markers',
+            name=name, legendgroup=name, showlegend=False, marker_color=color
+        )
+    ]
+
+
+def improvement_scatter(df, gl_threshold=SCATTER_GL_THRESHOLD, density_threshold=SCATTER_DENSITY_THRESHOLD):
+    """Plot tonnage improvement against work experience, scaled to the number of workers"""
+    title = 'Peningkatan Produktivitas vs Pengalaman Kerja'
+    labels = {
+        'Lama_Bekerja_tahun': 'Lama Bekerja (tahun)',
+        'Peningkatan_Tonase_pct': 'Peningkatan Tonase (%)',
+        'Tingkat_Sertifikasi': 'Tingkat Sertifikasi'
+    }
+
+    if len(df) > density_threshold:
+        # Bin server-side: one cell per year of experience, 50 improvement bins
+        data = df[['Lama_Bekerja_tahun', 'Peningkatan_Tonase_pct']].dropna()
+        years = data['Lama_Bekerja_tahun'].to_numpy()
+        improvement = data['Peningkatan_Tonase_pct'].to_numpy()
+        year_edges = np.arange(np.floor(years.min()), np.ceil(years.max()) + 2) - 0.5
+        counts, x_edges, y_edges = np.histogram2d(years, improvement, bins=[year_edges, 50])
+        fig = go.Figure(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=counts.T,
+            colorscale='Greens',
+            colorbar_title='Jumlah Pemanen'
+        ))
+        fig.update_layout(
+            title=title,
+            xaxis_title=labels['Lama_Bekerja_tahun'],
+            yaxis_title=labels['Peningkatan_Tonase_pct']
+        )
+        return fig
+
+    return px.scatter(
+        df,
+        x='Lama_Bekerja_tahun',
+        y='Peningkatan_Tonase_pct',
+        size='Tonase_Sesudah_kg_per_hari',
+        color='Tingkat_Sertifikasi',
+        hover_data=['Nama_Pekerja', 'Estate'],
+        title=title,
+        labels=labels,
+        color_discrete_map=CERTIFICATION_COLORS,
+        render_mode='webgl' if len(df) > gl_threshold else 'svg'
+    )
+
+
+def productivity_figures(df, sketches=None):
+    """Build the Produktivitas tab figures; sketches (column -> QuantileSketch) replace full-column quantiles"""
+    sketches = sketches or {}
+
+    # Tonase comparison
+    fig_tonnage = go.Figure()
+    fig_tonnage.add_traces(box_traces(df['Tonase_Sebelum_kg_per_hari'], 'Sebelum Sertifikasi', '#ff7043',
+                                      sketch=sketches.get('Tonase_Sebelum_kg_per_hari')))
+    fig_tonnage.add_traces(box_traces(df['Tonase_Sesudah_kg_per_hari'], 'Sesudah Sertifikasi', '#66bb6a',
+                                      sketch=sketches.get('Tonase_Sesudah_kg_per_hari')))
+    fig_tonnage.update_layout(
+        title='Distribusi Tonase Harian (kg/hari)',
+        yaxis_title='Tonase (kg)',
+        showlegend=True,
+        height=400
+    )
+
+    # Trees harvested comparison
+    fig_trees = go.Figure()
+    fig_trees.add_traces(box_traces(df['Jumlah_Pokok_Sebelum'], 'Sebelum Sertifikasi', '#ff7043',
+                                    sketch=sketches.get('Jumlah_Pokok_Sebelum')))
+    fig_trees.add_traces(box_traces(df['Jumlah_Pokok_Sesudah'], 'Sesudah Sertifikasi', '#66bb6a',
+                                    sketch=sketches.get('Jumlah_Pokok_Sesudah')))
+    fig_trees.update_layout(
+        title='Distribusi Jumlah Pokok Dipanen per Hari',
+        yaxis_title='Jumlah Pokok',
+        showlegend=True,
+        height=400
+    )
+
+    # Scatter plot: improvement vs experience
+    fig_scatter = improvement_scatter(df)
+    fig_scatter.update_layout(height=500)
+
+    return {'fig_tonnage': fig_tonnage, 'fig_trees': fig_trees, 'fig_scatter': fig_scatter}
+
+
+def quality_figures(df):
+    """Build the Kualitas Panen tab metrics table and figures"""
+    # Quality metrics before and after
+    quality_metrics = pd.DataFrame({
+        'Metrik': ['Brondolan Loss', 'Buah Mentah', 'Buah Busuk', 'Gagang Panjang'],
+        'Sebelum': [
+            df['Brondolan_Loss_Sebelum_pct'].mean(),
+            df['Buah_Mentah_Sebelum_pct'].mean(),
+            df['Buah_Busuk_Sebelum_pct'].mean(),
+            df['Gagang_Panjang_Sebelum_pct'].mean()
+        ],
+        'Sesudah': [
+            df['Brondolan_Loss_Sesudah_pct'].mean(),
+            df['Buah_Mentah_Sesudah_pct'].mean(),
+            df['Buah_Busuk_Sesudah_pct'].mean(),
+            df['Gagang_Panjang_Sesudah_pct'].mean()
+        ]
+    })
+
+    quality_metrics['Penurunan'] = quality_metrics['Sebelum'] - quality_metrics['Sesudah']
+    quality_metrics['Penurunan_pct'] = (quality_metrics['Penurunan'] / quality_metrics['Sebelum'] * 100).round(1)
+
+    fig_quality = go.Figure()
+    fig_quality.add_trace(go.Bar(
+        name='Sebelum',
+        x=quality_metrics['Metrik'],
+        y=quality_metrics['Sebelum'],
+        marker_color='#ff7043'
+    ))
+    fig_quality.add_trace(go.Bar(
+        name='Sesudah',
+        x=quality_metrics['Metrik'],
+        y=quality_metrics['Sesudah'],
+        marker_color='#66bb6a'
+    ))
+    fig_quality.update_layout(
+        title='Perbandingan Metrik Kualitas (%)',
+        yaxis_title='Persentase',
+        barmode='group',
+        height=400
+    )
+
+    # Quality score distribution
+    fig_quality_score = go.Figure()
+    fig_quality_score.add_trace(go.Histogram(
+        x=df['Kualitas_Score_Sebelum'],
+        name='Sebelum Sertifikasi',
+        marker_color='#ff7043',
+        opacity=0.7,
+        nbinsx=20
+    ))
+    fig_quality_score.add_trace(go.Histogram(
+        x=df['Kualitas_Score_Sesudah'],
+        name='Sesudah Sertifikasi',
+        marker_color='#66bb6a',
+        opacity=0.7,
+        nbinsx=20
+    ))
+    fig_quality_score.update_layout(
+        title='Distribusi Skor Kualitas',
+        xaxis_title='Skor Kualitas (0-100)',
+        yaxis_title='Jumlah Pemanen',
+        barmode='overlay',
+        height=400
+    )
+
+    return {'quality_metrics': quality_metrics, 'fig_quality': fig_quality, 'fig_quality_score': fig_quality_score}
+
+
+def financial_figures(df, sketches=None):
+    """Build the Dampak Finansial tab figures and income breakdown"""
+    sketches = sketches or {}
+
+    # Income comparison
+    fig_income = go.Figure()
+    fig_income.add_traces(box_traces(df['Pendapatan_Sebelum'] / 1_000_000, 'Sebelum Sertifikasi', '#ff7043',
+                                     sketch=sketches.get('Pendapatan_Sebelum'), scale=1 / 1_000_000))
+    fig_income.add_traces(box_traces(df['Pendapatan_Sesudah'] / 1_000_000, 'Sesudah Sertifikasi', '#66bb6a',
+                                     sketch=sketches.get('Pendapatan_Sesudah'), scale=1 / 1_000_000))
+    fig_income.update_layout(
+        title='Distribusi Pendapatan Bulanan',
+        yaxis_title='Pendapatan (Juta Rupiah)',
+        showlegend=True,
+        height=400
+    )
+
+    # Income improvement by certification level
+    income_by_cert = df.groupby('Tingkat_Sertifikasi', observed=True).agg({
+        'Peningkatan_Pendapatan': 'mean'
+    }).reset_index()
+
+    fig_cert_income = px.bar(
+        income_by_cert,
+        x='Tingkat_Sertifikasi',
+        y='Peningkatan_Pendapatan',
+        title='Rata-rata Peningkatan Pendapatan per Tingkat Sertifikasi',
+        labels={
+            'Tingkat_Sertifikasi': 'Tingkat Sertifikasi',
+            'Peningkatan_Pendapatan': 'Peningkatan (Rupiah)'
+        },
+        color='Tingkat_Sertifikasi',
+        color_discrete_map=CERTIFICATION_COLORS
+    )
+    fig_cert_income.update_layout(height=400, showlegend=False)
+    fig_cert_income.update_traces(text=income_by_cert['Peningkatan_Pendapatan'].apply(lambda x: f'Rp {x/1000:.0f}K'), textposition='outside')
+
+    # Financial breakdown
+    premium_before = df['Tonase_Sebelum_kg_per_hari'] * df['Premi_per_kg'] * df['Hari_Kerja_Sebelum']
+    premium_after = df['Tonase_Sesudah_kg_per_hari'] * df['Premi_per_kg'] * df['Hari_Kerja_Sesudah']
+
+    return {
+        'fig_income': fig_income,
+        'fig_cert_income': fig_cert_income,
+        'avg_base_salary': df['Upah_Dasar_per_hari'].mean() * df['Hari_Kerja_Sesudah'].mean(),
+        'avg_premium_before': premium_before.mean(),
+        'avg_premium_after': premium_after.mean(),
+        'total_additional_income': df['Peningkatan_Pendapatan'].sum()
+    }
+
+
+def estate_figures(estate_metrics, by='Estate'):
+    """Build the Performa Estate tab figure and rounded metrics table, one bar group per value of by"""
+    fig_estate = go.Figure()
+    fig_estate.add_trace(go.Bar(
+        name='Produksi Sebelum',
+        x=estate_metrics[by],
+        y=estate_metrics['Produksi_Sebelum_ton'],
+        marker_color='#ff7043'
+    ))
+    fig_estate.add_trace(go.Bar(
+        name='Produksi Sesudah',
+        x=estate_metrics[by],
+        y=estate_metrics['Produksi_Sesudah_ton'],
+        marker_color='#66bb6a'
+    ))
+    fig_estate.update_layout(
+        title=f"Total Produksi per {by.replace('_', ' ')} (Ton)",
+        yaxis_title='Produksi (Ton)',
+        barmode='group',
+        height=400
+    )
+
+    # Estate metrics table
+    estate_metrics_display = estate_metrics.copy()
+    estate_metrics_display['Produksi_Sebelum_ton'] = estate_metrics_display['Produksi_Sebelum_ton'].round(2)
+    estate_metrics_display['Produksi_Sesudah_ton'] = estate_metrics_display['Produksi_Sesudah_ton'].round(2)
+    estate_metrics_display['Peningkatan_ton'] = estate_metrics_display['Peningkatan_ton'].round(2)
+    estate_metrics_display['Revenue_Impact_juta'] = estate_metrics_display['Revenue_Impact_juta'].round(2)
+    estate_metrics_display['Avg_Quality_Before'] = estate_metrics_display['Avg_Quality_Before'].round(1)
+    estate_metrics_display['Avg_Quality_After'] = estate_metrics_display['Avg_Quality_After'].round(1)
+
+    return {'fig_estate': fig_estate, 'estate_metrics_display': estate_metrics_display}
+
+
+def scenario_heatmap(grid, metric, wage):
+    """Premium x FFB price heatmap of one scenario metric at a fixed wage"""
+    fig = go.Figure(go.Heatmap(
+        z=grid.to_numpy(),
+        x=[f'{price:,.0f}' for price in grid.columns],
+        y=[f'{premium:,.0f}' for premium in grid.index],
+        text=np.round(grid.to_numpy(), 1),
+        texttemplate='%{text:,.1f}',
+        colorscale='RdYlGn',
+        colorbar=dict(title=metric.split(' (')[0])
+    ))
+    fig.update_layout(
+        title=f'{metric} — Upah Dasar Rp {wage:,.0f}/hari',
+        xaxis_title='Harga TBS (Rp/kg)',
+        yaxis_title='Premi (Rp/kg)',
+        height=450
+    )
+    return fig
+
+
+def cohort_figures(heatmap, decay, label):
+    """Cohort x estate heatmap and gain-by-months-since-certification curves of one cohort metric"""
+    fig_cohort = go.Figure(go.Heatmap(
+        z=heatmap.to_numpy(),
+        x=list(heatmap.columns),
+        y=heatmap.index.strftime('%Y-%m'),
+        colorscale='Viridis',
+        colorbar=dict(title=label.split(' (')[0])
+    ))
+    fig_cohort.update_layout(
+        title=f'{label} per Kohort Sertifikasi dan Estate',
+        xaxis_title='Estate',
+        yaxis_title='Bulan Sertifikasi',
+        yaxis=dict(autorange='reversed'),
+        height=450
+    )
+
+    fig_decay = go.Figure()
+    for col in decay.columns:
+        fig_decay.add_trace(go.Scatter(
+            x=decay.index,
+            y=decay[col],
+            mode='lines+markers',
+            name=col,
+            line=dict(color=CERTIFICATION_COLORS.get(col, '#616161'), dash='solid' if col in CERTIFICATION_COLORS else 'dash')
+        ))
+    fig_decay.update_layout(
+        title=f'{label} menurut Lama Sejak Sertifikasi',
+        xaxis_title='Bulan Sejak Sertifikasi',
+        yaxis_title=label,
+        height=450
+    )
+
+    return {'fig_cohort': fig_cohort, 'fig_decay': fig_decay}
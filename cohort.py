@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from schema import CELL_COLUMNS
+
+COHORT_DATE_COLUMN = 'Tanggal_Sertifikasi'
+COHORT_COLUMN = 'Kohort'
+
+# Gains tracked per cohort: key -> (label, column or (after, before) pair)
+COHORT_METRICS = {
+    'tonnage_gain': ('Peningkatan Tonase (%)', 'Peningkatan_Tonase_pct'),
+    'quality_gain': ('Peningkatan Skor Kualitas (poin)', ('Kualitas_Score_Sesudah', 'Kualitas_Score_Sebelum')),
+    'income_gain': ('Tambahan Pendapatan (Rp/bulan)', 'Peningkatan_Pendapatan')
+}
+
+MONTHS_COLUMN = 'Bulan_Sejak_Sertifikasi'
+
+
+def _metric_values(df, source):
+    if isinstance(source, tuple):
+        after, before = source
+        return df[after].to_numpy(dtype='float64') - df[before].to_numpy(dtype='float64')
+    return df[source].to_numpy(dtype='float64')
+
+
+def cohort_cells(df):
+    """Worker count, sum and count of every cohort metric per (certification month, Estate, level), in one grouped pass"""
+    if COHORT_DATE_COLUMN not in df.columns:
+        return empty_cohort_cells()
+    work = pd.DataFrame({
+        COHORT_COLUMN: pd.to_datetime(df[COHORT_DATE_COLUMN]).dt.to_period('M').dt.to_timestamp(),
+        **{col: df[col] for col in CELL_COLUMNS}
+    })
+    work['Jumlah_Pemanen'] = 1
+    for key, (_, source) in COHORT_METRICS.items():
+        values = _metric_values(df, source)
+        valid = ~np.isnan(values)
+        work[key] = np.where(valid, values, 0.0)
+        work[f'{key}_n'] = valid.astype('int64')
+    cells = work.groupby([COHORT_COLUMN] + CELL_COLUMNS, observed=True).sum().reset_index()
+    return cells.astype({col: str for col in CELL_COLUMNS})
+
+
+def empty_cohort_cells():
+    """Cohort cells of a dataset without certification dates"""
+    columns = [COHORT_COLUMN] + CELL_COLUMNS + ['Jumlah_Pemanen']
+    columns += [name for key in COHORT_METRICS for name in (key, f'{key}_n')]
+    cells = pd.DataFrame({col: pd.Series(dtype='float64') for col in columns})
+    return cells.astype({COHORT_COLUMN: 'datetime64[ns]', **{col: str for col in CELL_COLUMNS}})
+
+
+class CohortMatrix:
+    """Certification-month cohorts x Estate x Tingkat_Sertifikasi sums of the tonnage, quality and income gains.
+
+    The cells are additive, so the cohort heatmap, decay curves and cohort table of
+    any estate and level selection are sums of the selected cells, without touching
+    the rows. Months since certification are counted back from the reference month,
+    by default the latest cohort.
+    """
+
+    def __init__(self, cells, reference=None):
+        self.cells = cells
+        if reference is None and len(cells):
+            reference = cells[COHORT_COLUMN].max()
+        self.reference = reference
+
+    def __len__(self):
+        return len(self.cells)
+
+    def _selected(self, selections):
+        cells = self.cells
+        for col, values in selections.items():
+            cells = cells[cells[col].isin([str(value) for value in values])]
+        return cells
+
+    def _means(self, cells, keys):
+        """Mean of every metric per group of keys, from the summed cells"""
+        grouped = cells.groupby(keys, sort=True).sum(numeric_only=True)
+        means = pd.DataFrame({'Jumlah_Pemanen': grouped['Jumlah_Pemanen'].astype('int64')})
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for key in COHORT_METRICS:
+                means[key] = grouped[key] / grouped[f'{key}_n'].replace(0, np.nan)
+        return means
+
+    def heatmap(self, metric, selections, by='Estate'):
+        """Cohort x group frame of one metric's mean"""
+        means = self._means(self._selected(selections), [COHORT_COLUMN, by])
+        return means[metric].unstack(by)
+
+    def decay(self, metric, selections, by='Tingkat_Sertifikasi'):
+        """Months since certification x group frame of one metric's mean, plus an overall column"""
+        cells = self._selected(selections).copy()
+        if self.reference is None:
+            return pd.DataFrame(columns=['Semua'], dtype='float64')
+        cohorts = cells[COHORT_COLUMN].dt
+        cells[MONTHS_COLUMN] = (self.reference.year - cohorts.year) * 12 + self.reference.month - cohorts.month
+        curves = self._means(cells, [MONTHS_COLUMN, by])[metric].unstack(by)
+        curves['Semua'] = self._means(cells, [MONTHS_COLUMN])[metric]
+        return curves
+
+    def cohort_table(self, selections):
+        """Worker count and mean gains per cohort, labelled with COHORT_METRICS labels"""
+        table = self._means(self._selected(selections), [COHORT_COLUMN]).reset_index()
+        table[COHORT_COLUMN] = table[COHORT_COLUMN].dt.strftime('%Y-%m')
+        return table.rename(columns={key: label for key, (label, _) in COHORT_METRICS.items()})
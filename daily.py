@@ -0,0 +1,340 @@
+import os
+import pickle
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+from derive import derive_metrics
+
+# Columns of a per-worker-per-day harvest record
+DAILY_COLUMNS = [
+    'ID_Pekerja', 'Estate', 'Tanggal', 'Tonase_kg', 'Jumlah_Pokok',
+    'Brondolan_Loss_pct', 'Buah_Mentah_pct', 'Buah_Busuk_pct', 'Gagang_Panjang_pct'
+]
+
+# Metrics accumulated per record; Hari_Kerja counts one worked day per record
+METRICS = [
+    'Tonase_kg', 'Jumlah_Pokok', 'Hari_Kerja',
+    'Brondolan_Loss_pct', 'Buah_Mentah_pct', 'Buah_Busuk_pct', 'Gagang_Panjang_pct'
+]
+DEFECT_METRICS = ['Brondolan_Loss_pct', 'Buah_Mentah_pct', 'Buah_Busuk_pct', 'Gagang_Panjang_pct']
+
+# Rolling windows in days; the ring buffer keeps one slot per day of the longest window
+ROLLING_WINDOWS = (30, 90)
+RING_DAYS = max(ROLLING_WINDOWS)
+
+# Roster columns carried into the before/after view
+ROSTER_COLUMNS = [
+    'Nama_Pekerja', 'Tanggal_Sertifikasi', 'Tingkat_Sertifikasi',
+    'Upah_Dasar_per_hari', 'Premi_per_kg', 'Lama_Bekerja_tahun', 'Usia'
+]
+
+# Sentinel for workers without a certification date: every record counts as "before"
+NO_CERTIFICATION = np.iinfo(np.int64).max
+
+# Saved record batches go to one .npz file each in a directory next to the store file
+HISTORY_SUFFIX = '.history'
+
+
+def to_epoch_days(dates):
+    """Convert dates to integer days since 1970-01-01"""
+    return pd.to_datetime(dates).to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+
+class DailyHarvestStore:
+    """Append-only daily harvest records reduced to incremental per-worker aggregates.
+
+    Each load adds its records to cumulative before/after-certification sums and
+    to a per-worker ring buffer of the last RING_DAYS days, from which the 30/90-day
+    rolling sums are maintained. The records are also kept as compact (worker, day,
+    metrics) history, which is only rescanned for the workers whose certification
+    date is registered or changed after their records were loaded. Once saved, the
+    history lives on disk as one file per batch and is read back one batch at a time.
+    """
+
+    def __init__(self):
+        self.worker_ids = []
+        self.worker_positions = {}
+        self.estates = []
+        self.estate_codes = {}
+        self.roster = pd.DataFrame(columns=['ID_Pekerja'] + ROSTER_COLUMNS)
+        self.current_day = None
+        self.loaded_batches = set()
+        self.version = 0
+        self.lock = threading.Lock()
+        # Record batches not saved yet; saved ones are history_files files in history_dir
+        self.history = []
+        self.history_dir = None
+        self.history_files = 0
+        self._allocate(0)
+
+    def _allocate(self, n):
+        n_metrics = len(METRICS)
+        self.estate_of = np.zeros(n, dtype=np.int32)
+        self.cert_day = np.full(n, NO_CERTIFICATION, dtype=np.int64)
+        self.first_day = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+        self.last_day = np.full(n, np.iinfo(np.int64).min, dtype=np.int64)
+        self.before = np.zeros((n, n_metrics))
+        self.after = np.zeros((n, n_metrics))
+        self.rolling = {window: np.zeros((n, n_metrics)) for window in ROLLING_WINDOWS}
+        self.ring = np.zeros((n, RING_DAYS, n_metrics), dtype=np.float32)
+
+    def _grow(self, n):
+        """Extend the per-worker arrays to n workers"""
+        extra = n - len(self.cert_day)
+        if extra <= 0:
+            return
+        old = (self.estate_of, self.cert_day, self.first_day, self.last_day,
+               self.before, self.after, self.rolling, self.ring)
+        self._allocate(extra)
+        self.estate_of = np.concatenate([old[0], self.estate_of])
+        self.cert_day = np.concatenate([old[1], self.cert_day])
+        self.first_day = np.concatenate([old[2], self.first_day])
+        self.last_day = np.concatenate([old[3], self.last_day])
+        self.before = np.concatenate([old[4], self.before])
+        self.after = np.concatenate([old[5], self.after])
+        self.rolling = {w: np.concatenate([old[6][w], self.rolling[w]]) for w in ROLLING_WINDOWS}
+        self.ring = np.concatenate([old[7], self.ring])
+
+    def _positions(self, ids):
+        """Map worker IDs to array positions, registering unseen workers"""
+        codes, uniques = pd.factorize(ids, sort=False)
+        lookup = np.empty(len(uniques), dtype=np.int64)
+        for i, worker_id in enumerate(uniques):
+            position = self.worker_positions.get(worker_id)
+            if position is None:
+                position = self.worker_positions[worker_id] = len(self.worker_ids)
+                self.worker_ids.append(worker_id)
+            lookup[i] = position
+        self._grow(len(self.worker_ids))
+        return lookup[codes]
+
+    def register_roster(self, roster):
+        """Register worker metadata; Tanggal_Sertifikasi splits records into before/after"""
+        roster = roster[[col for col in ['ID_Pekerja'] + ROSTER_COLUMNS if col in roster.columns]]
+        positions = self._positions(roster['ID_Pekerja'].to_numpy())
+        if 'Tanggal_Sertifikasi' in roster.columns:
+            cert = pd.to_datetime(roster['Tanggal_Sertifikasi'])
+            known = cert.notna().to_numpy()
+            previous = self.cert_day.copy()
+            self.cert_day[positions[known]] = to_epoch_days(cert[known])
+            self._resplit(np.flatnonzero(self.cert_day != previous))
+        if len(self.roster):
+            roster = pd.concat([self.roster, roster])
+        self.roster = roster.drop_duplicates('ID_Pekerja', keep='last').reset_index(drop=True)
+        self.version += 1
+
+    def _split(self, positions, days, values):
+        """Add records to the before or after sums, by their worker's current certification date"""
+        n_workers = len(self.worker_ids)
+        after = days >= self.cert_day[positions]
+        for mask, totals in ((~after, self.before), (after, self.after)):
+            for j in range(len(METRICS)):
+                totals[:, j] += np.bincount(positions[mask], weights=values[mask, j], minlength=n_workers)
+
+    def _history_path(self, i, directory=None):
+        return os.path.join(directory or self.history_dir, f'{i:06d}.npz')
+
+    def _batches(self):
+        """Record batches as (positions, days, values): the saved ones read one file at a time, then the unsaved ones"""
+        for i in range(self.history_files):
+            with np.load(self._history_path(i)) as batch:
+                yield batch['positions'], batch['days'], batch['values']
+        yield from self.history
+
+    def _resplit(self, changed):
+        """Recompute the before/after sums of workers whose certification date changed from their history"""
+        if len(changed) == 0 or not (self.history or self.history_files):
+            return
+        self.before[changed] = 0
+        self.after[changed] = 0
+        for positions, days, values in self._batches():
+            mask = np.isin(positions, changed)
+            if mask.any():
+                self._split(positions[mask], days[mask], values[mask])
+
+    def _advance(self, day):
+        """Move the window end to day, retiring the days that fall out of each window"""
+        if self.current_day is None:
+            self.current_day = day
+            return
+        steps = day - self.current_day
+        if steps <= 0:
+            return
+        if steps >= RING_DAYS:
+            self.ring[:] = 0
+            for window in ROLLING_WINDOWS:
+                self.rolling[window][:] = 0
+        else:
+            for d in range(self.current_day + 1, day + 1):
+                for window in ROLLING_WINDOWS:
+                    if window < RING_DAYS:
+                        self.rolling[window] -= self.ring[:, (d - window) % RING_DAYS]
+                # The slot being reused held day d - RING_DAYS, which leaves the longest window
+                self.rolling[RING_DAYS] -= self.ring[:, d % RING_DAYS]
+                self.ring[:, d % RING_DAYS] = 0
+        self.current_day = day
+
+    def append(self, records, batch_id=None):
+        """Fold a batch of daily records into the aggregates; returns False if batch_id was already loaded"""
+        if batch_id is not None and batch_id in self.loaded_batches:
+            return False
+        if len(records) == 0:
+            return True
+
+        positions = self._positions(records['ID_Pekerja'].to_numpy())
+        days = to_epoch_days(records['Tanggal'])
+        # Values are rounded to float32 once so the ring buffer and the rolling sums
+        # add and later subtract exactly the same numbers
+        values = np.column_stack([
+            np.ones(len(records)) if metric == 'Hari_Kerja' else records[metric].to_numpy(dtype='float64')
+            for metric in METRICS
+        ]).astype(np.float32)
+        n_workers = len(self.worker_ids)
+
+        # Latest estate per worker
+        codes, uniques = pd.factorize(records['Estate'], sort=False)
+        estate_lookup = np.array([self._estate_code(estate) for estate in uniques], dtype=np.int32)
+        self.estate_of[positions] = estate_lookup[codes]
+
+        # Observed date range per worker
+        np.minimum.at(self.first_day, positions, days)
+        np.maximum.at(self.last_day, positions, days)
+
+        # Cumulative sums before/after each worker's certification date; the records are
+        # kept so a roster registered (or corrected) later can re-split them
+        self._split(positions, days, values)
+        self.history.append((positions, days, values))
+
+        # Ring buffer and rolling sums for records inside the longest window
+        self._advance(int(days.max()))
+        age = self.current_day - days
+        recent = age < RING_DAYS
+        np.add.at(self.ring, (positions[recent], days[recent] % RING_DAYS), values[recent])
+        for window in ROLLING_WINDOWS:
+            mask = age < window
+            for j in range(len(METRICS)):
+                self.rolling[window][:, j] += np.bincount(positions[mask], weights=values[mask, j], minlength=n_workers)
+
+        if batch_id is not None:
+            self.loaded_batches.add(batch_id)
+        self.version += 1
+        return True
+
+    def _estate_code(self, estate):
+        code = self.estate_codes.get(estate)
+        if code is None:
+            code = self.estate_codes[estate] = len(self.estates)
+            self.estates.append(estate)
+        return code
+
+    @staticmethod
+    def _rates(totals, prefix='', suffix=''):
+        """Turn summed metrics into per-day tonnage/trees and mean defect rates"""
+        days = totals[:, METRICS.index('Hari_Kerja')]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            per_day = totals / days[:, None]
+        columns = {
+            f'{prefix}Tonase{suffix}_kg_per_hari': per_day[:, METRICS.index('Tonase_kg')].round(1),
+            f'{prefix}Jumlah_Pokok{suffix}': per_day[:, METRICS.index('Jumlah_Pokok')].round(1),
+        }
+        for metric in DEFECT_METRICS:
+            name = metric[:-len('_pct')]
+            columns[f'{prefix}{name}{suffix}_pct'] = per_day[:, METRICS.index(metric)].round(2)
+        return columns
+
+    def rolling_summary(self, window=30, by='worker'):
+        """Rolling-window tonnage, defect rates and days worked per worker or per estate"""
+        totals = self.rolling[window]
+        if by == 'estate':
+            grouped = np.zeros((len(self.estates), len(METRICS)))
+            np.add.at(grouped, self.estate_of, totals)
+            frame = pd.DataFrame({'Estate': self.estates})
+            totals = grouped
+        else:
+            frame = pd.DataFrame({
+                'ID_Pekerja': self.worker_ids,
+                'Estate': pd.Categorical.from_codes(self.estate_of, self.estates) if self.estates else None
+            })
+        frame[f'Tonase_{window}d_kg'] = totals[:, METRICS.index('Tonase_kg')]
+        frame[f'Hari_Kerja_{window}d'] = totals[:, METRICS.index('Hari_Kerja')]
+        for name, values in self._rates(totals).items():
+            frame[name] = values
+        return frame
+
+    def worker_summary(self):
+        """Before/after per-worker view in the dashboard's schema, derived from the aggregates"""
+        # ID_Pekerja is object dtype even when empty, so the roster merge keys always match
+        frame = pd.DataFrame({
+            'ID_Pekerja': pd.Series(self.worker_ids, dtype=object),
+            'Estate': pd.Categorical.from_codes(self.estate_of, self.estates) if self.estates else None
+        })
+        frame = frame.merge(self.roster.astype({'ID_Pekerja': object}), on='ID_Pekerja', how='left')
+
+        # Days worked normalized to a 30-day month over the observed span of each period
+        cert = self.cert_day
+        has_cert = cert != NO_CERTIFICATION
+        before_end = np.where(has_cert, np.minimum(self.last_day, cert - 1), self.last_day)
+        after_start = np.where(has_cert, np.maximum(self.first_day, cert), self.last_day + 1)
+        spans = {
+            'Sebelum': np.maximum(before_end - self.first_day + 1, 1),
+            'Sesudah': np.maximum(self.last_day - after_start + 1, 1)
+        }
+
+        for period, totals in (('Sebelum', self.before), ('Sesudah', self.after)):
+            for name, values in self._rates(totals, suffix=f'_{period}').items():
+                frame[name] = values
+            worked = totals[:, METRICS.index('Hari_Kerja')]
+            frame[f'Hari_Kerja_{period}'] = (worked / spans[period] * 30).round(1)
+
+        # Only workers observed both before and after certification can be compared
+        frame = frame[(self.before[:, METRICS.index('Hari_Kerja')] > 0) &
+                      (self.after[:, METRICS.index('Hari_Kerja')] > 0)].reset_index(drop=True)
+        frame['Estate'] = frame['Estate'].astype('category')
+        if 'Tingkat_Sertifikasi' in frame.columns:
+            frame['Tingkat_Sertifikasi'] = frame['Tingkat_Sertifikasi'].astype('category')
+        return derive_metrics(frame)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        # Stores saved before the history was kept can't re-split their records
+        self.__dict__.update({'history': [], 'history_dir': None, 'history_files': 0, **state})
+        self.lock = threading.Lock()
+
+    def save(self, path):
+        """Persist the aggregates and the ring buffer; only the batches loaded since the last save are written.
+
+        The history directory is append-only: each unsaved batch becomes a new file
+        before the store file, which records how many of them are valid, is replaced.
+        """
+        path = os.fspath(path)
+        history_dir = path + HISTORY_SUFFIX
+        os.makedirs(history_dir, exist_ok=True)
+        if self.history_dir and os.path.abspath(self.history_dir) != os.path.abspath(history_dir):
+            # Saving to a new location carries the batches saved at the old one along
+            for i in range(self.history_files):
+                shutil.copyfile(self._history_path(i), self._history_path(i, history_dir))
+        self.history_dir = history_dir
+        for positions, days, values in self.history:
+            np.savez(self._history_path(self.history_files), positions=positions, days=days, values=values)
+            self.history_files += 1
+        self.history = []
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(self, f)
+        os.replace(path + '.tmp', path)
+
+    @staticmethod
+    def load(path):
+        path = os.fspath(path)
+        with open(path, 'rb') as f:
+            store = pickle.load(f)
+        # The history sits next to the store file, wherever it was moved
+        if store.history_files:
+            store.history_dir = path + HISTORY_SUFFIX
+        return store
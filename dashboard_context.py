@@ -0,0 +1,539 @@
+import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import pandas as pd
+import os
+
+from aggregation import CellAggregates, aggregate_production
+from cohort import CohortMatrix, cohort_cells
+from daily import DailyHarvestStore
+from derive import derive_metrics
+from detail_table import DetailTable
+from export import export_csv
+from filter_index import FilterIndex
+from profiler import SectionProfiler
+from ranking import top_k
+from rollup import RollupCube, rollup_cells
+from shared import SharedDatasets
+from sketch import SKETCH_COLUMNS, SketchIndex
+from ingest import content_hash, read_harvester_files
+from insights import LOW_PERFORMER_QUANTILE
+from store import AnalyticalStore
+from synthetic import generate_dummy_data
+from validation import validate_daily_frame, validate_roster_frame
+
+# Section profiler defaults
+PROFILING_DEFAULT = os.environ.get('DASHBOARD_PROFILING') == '1'
+PROFILE_DIR = os.environ.get('DASHBOARD_PROFILE_DIR', 'profiling')
+
+# Data modes: one pre-aggregated row per worker, or append-only daily harvest records
+DATA_MODES = ["Per Pemanen", "Harian"]
+# Daily store file; its record batches are kept in the directory DASHBOARD_DAILY_STORE.history
+DAILY_STORE_PATH = os.environ.get('DASHBOARD_DAILY_STORE')
+
+# Optional on-disk analytical store shared by all sessions; filters and aggregates run inside it
+STORE_PATH = os.environ.get('DASHBOARD_STORE_PATH')
+
+# Thread pool size for parsing several uploaded CSVs (unset = Python's default)
+UPLOAD_WORKERS = int(os.environ.get('DASHBOARD_UPLOAD_WORKERS', '0')) or None
+
+# Optional comma-separated list of valid estate names; without it, likely typos are only reported
+ALLOWED_ESTATES = [name.strip() for name in os.environ.get('DASHBOARD_ESTATES', '').split(',') if name.strip()] or None
+
+# Process pool size for the significance tests (unset = single process)
+STATS_WORKERS = int(os.environ.get('DASHBOARD_STATS_WORKERS', '0')) or None
+
+# Session State key of the current run's DashboardContext, read by the pages
+CONTEXT_KEY = 'dashboard_context'
+
+# The demo data has the optional Afdeling and Mandor levels, so the estate drill-down has something to open
+DEMO_HIERARCHY = {'afdelings': 3, 'mandors': 2}
+
+@st.cache_resource
+def get_shared_datasets():
+    """Process-wide registry holding each loaded dataset once for all sessions"""
+    return SharedDatasets()
+
+def is_active_session(session_id):
+    """Whether a Streamlit session is still connected; always true outside a server runtime"""
+    return not runtime.exists() or runtime.get_instance().is_active_session(session_id)
+
+def acquire_dataset(dataset_key, load, message="Membaca data CSV..."):
+    """Reference the shared (df, filter index, sketch index, cell aggregates, detail table) for dataset_key from this session, loading it at most once"""
+    datasets = get_shared_datasets()
+    datasets.prune(is_active_session)
+    
+    def build():
+        with st.spinner(message):
+            df = load()
+            filter_index = FilterIndex(df)
+            return df, filter_index, SketchIndex.from_frame(df), CellAggregates(df, filter_index), DetailTable(df)
+    
+    ctx = get_script_run_ctx()
+    return datasets.acquire(ctx.session_id if ctx else None, dataset_key, build)
+
+def release_dataset():
+    """Drop this session's reference to its shared dataset"""
+    ctx = get_script_run_ctx()
+    get_shared_datasets().release(ctx.session_id if ctx else None)
+
+def uploads_key(raws):
+    """Dataset key of a set of uploaded files; a single file keeps its own content hash"""
+    if len(raws) == 1:
+        return content_hash(raws[0])
+    return content_hash(''.join(content_hash(raw) for raw in raws).encode())
+
+def load_uploads(dataset_key, raws, names):
+    """Parse, validate and merge uploaded CSVs in parallel, keeping the per-file report for this session"""
+    df, report, duplicates, quarantine, typos = read_harvester_files(raws, names, UPLOAD_WORKERS, ALLOWED_ESTATES)
+    st.session_state['upload_report'] = (dataset_key, report, duplicates, quarantine, typos)
+    if len(df) == 0:
+        raise ValueError("Tidak ada baris yang lolos validasi")
+    return derive_metrics(df)
+
+def show_upload_report(dataset_key):
+    """Per-file parse report and quarantine download, shown to the session that read the files"""
+    upload_report = st.session_state.get('upload_report')
+    if upload_report is None or upload_report[0] != dataset_key:
+        return
+    _, file_report, duplicates, quarantine, typos = upload_report
+    with st.expander(f"📄 {len(file_report)} file dibaca", expanded=len(quarantine) > 0 or len(typos) > 0):
+        st.dataframe(file_report, hide_index=True, use_container_width=True)
+        st.caption(f"{duplicates} baris duplikat ID_Pekerja dihapus (Tanggal_Sertifikasi terbaru dipakai)")
+        if typos:
+            names = ', '.join(f"'{name}' (mungkin '{other}')" for name, other in typos.items())
+            st.warning(f"Estate kemungkinan salah ketik, baris tetap dipakai: {names}. "
+                       "Atur DASHBOARD_ESTATES untuk mengkarantina estate yang tidak dikenal.")
+        if len(quarantine):
+            st.warning(f"{len(quarantine)} baris dikarantina karena gagal validasi")
+            st.download_button(
+                label="📥 Download Laporan Karantina (CSV)",
+                data=lambda: export_csv(quarantine),
+                file_name="karantina_data_pemanen.csv",
+                mime="text/csv"
+            )
+
+def generate_demo_data():
+    """Dummy dataset shown when nothing is uploaded"""
+    return generate_dummy_data(**DEMO_HIERARCHY)
+
+@st.cache_resource
+def get_template_csv():
+    """Serialize the template dataset once per process"""
+    return export_csv(generate_demo_data())
+
+@st.cache_resource
+def get_profiler():
+    """Process-wide section profiler shared by all sessions"""
+    return SectionProfiler()
+
+@st.cache_resource
+def get_daily_store():
+    """Process-wide daily harvest store, restored from DASHBOARD_DAILY_STORE when set"""
+    if DAILY_STORE_PATH and os.path.exists(DAILY_STORE_PATH):
+        return DailyHarvestStore.load(DAILY_STORE_PATH)
+    return DailyHarvestStore()
+
+def load_daily_data(store, roster_file, daily_files):
+    """Validate newly uploaded roster and daily files and fold them into the store; already-loaded files are skipped.
+    
+    Raises ValueError when a file lacks required columns. The per-file report and
+    quarantined rows go to the same upload report as the per-worker uploads.
+    """
+    reports = []
+    with store.lock:
+        version = store.version
+        try:
+            if roster_file is not None:
+                raw = roster_file.getvalue()
+                batch_id = f'roster-{content_hash(raw)}'
+                if batch_id not in store.loaded_batches:
+                    roster, *report = read_harvester_files([raw], [roster_file.name], allowed_estates=ALLOWED_ESTATES,
+                                                           validate=validate_roster_frame)
+                    reports.append(report)
+                    store.register_roster(roster)
+                    store.loaded_batches.add(batch_id)
+            for daily_file in daily_files or []:
+                raw = daily_file.getvalue()
+                batch_id = content_hash(raw)
+                if batch_id not in store.loaded_batches:
+                    records, *report = read_harvester_files([raw], [daily_file.name], allowed_estates=ALLOWED_ESTATES,
+                                                            validate=validate_daily_frame, dedup_key=None)
+                    reports.append(report)
+                    store.append(records, batch_id=batch_id)
+        finally:
+            # Files folded in before an invalid one stay loaded, so they are saved either way
+            if DAILY_STORE_PATH and store.version != version:
+                store.save(DAILY_STORE_PATH)
+        dataset_key = f'daily-{store.version}'
+    
+    if reports:
+        file_reports, duplicates, quarantines, typos = zip(*reports)
+        st.session_state['upload_report'] = (
+            dataset_key,
+            pd.concat(file_reports, ignore_index=True),
+            sum(duplicates),
+            pd.concat(quarantines, ignore_index=True),
+            {name: other for found in typos for name, other in found.items()}
+        )
+    
+    def summarize():
+        with store.lock:
+            return store.worker_summary()
+    
+    # The before/after view is shared per store version
+    return dataset_key, acquire_dataset(dataset_key, summarize, "Menyusun ringkasan sebelum/sesudah...")
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_rolling_summary(dataset_key, window, _store):
+    """Per-estate rolling aggregates, read under the store lock and cached per store version"""
+    with _store.lock:
+        return _store.rolling_summary(window, by='estate')
+
+@st.cache_resource
+def get_analytical_store():
+    """Process-wide on-disk store at DASHBOARD_STORE_PATH, holding one table per dataset"""
+    return AnalyticalStore(STORE_PATH)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_store_summary(dataset_key, filter_key, _store):
+    """KPI means, estate rollup and low-performer count computed inside the store"""
+    estates, levels, min_improvement = filter_key
+    return {
+        'kpis': _store.kpis(estates, levels, min_improvement),
+        'estate_metrics': _store.estate_production(estates, levels, min_improvement),
+        'low_performers': _store.count_below_quantile(estates, levels, min_improvement, 'Peningkatan_Tonase_pct', LOW_PERFORMER_QUANTILE)
+    }
+
+@st.cache_data(max_entries=2, show_spinner="Memuat data dari penyimpanan...")
+def get_store_rows(dataset_key, filter_key, _store):
+    """Filtered rows fetched from the store, only for the row-level views that need them"""
+    return _store.fetch(*filter_key)
+
+@st.cache_resource(max_entries=2)
+def get_store_detail_table(dataset_key, filter_key, _store):
+    """Paging index over the filtered rows fetched from the store"""
+    return DetailTable(get_store_rows(dataset_key, filter_key, _store))
+
+def calculate_estate_production(df):
+    """Calculate estate-level production metrics"""
+    return aggregate_production(df, by='Estate')
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_frame_summary(dataset_key, filter_key, _cell_aggregates, _sketch_index):
+    """Same summary as get_store_summary, added up from the in-memory per-cell partial sums and sketches"""
+    estates, levels, min_improvement = filter_key
+    selections = {'Estate': estates, 'Tingkat_Sertifikasi': levels}
+    
+    # KPI means and estate rollup from the selected cells' sums; only the threshold bucket touches rows
+    kpis, estate_metrics = _cell_aggregates.summary(selections, min_improvement)
+    
+    # Low performers from the merged per-cell sketches instead of a full-column quantile
+    improvement = _sketch_index.merged('Peningkatan_Tonase_pct', selections).truncated(min_improvement)
+    threshold = improvement.quantile(LOW_PERFORMER_QUANTILE)
+    
+    return {
+        'kpis': kpis,
+        'estate_metrics': estate_metrics,
+        'low_performers': round(improvement.count_below(threshold))
+    }
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_dataset_cohorts(dataset_key, _df):
+    """Cohort cells of the whole dataset, grouped once and shared by every filter state"""
+    return CohortMatrix(cohort_cells(_df))
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def get_filtered_cohorts(dataset_key, filter_key, _rows, _reference):
+    """Cohort cells regrouped from the filtered rows, for thresholds that cut through estate x level cells"""
+    return CohortMatrix(cohort_cells(_rows()), _reference)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_store_cohorts(dataset_key, filter_key, _store):
+    """Cohort cells of the filtered rows grouped inside the store"""
+    return CohortMatrix(_store.cohort_cells(*filter_key), _store.cohort_reference())
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_dataset_rollup(dataset_key, _df):
+    """Rollup cube of the whole dataset, grouped once and shared by every filter state"""
+    return RollupCube(rollup_cells(_df))
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def get_filtered_rollup(dataset_key, filter_key, _rows):
+    """Rollup cube regrouped from the filtered rows, for thresholds that cut through its cells"""
+    return RollupCube(rollup_cells(_rows()))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_store_rollup(dataset_key, filter_key, _store):
+    """Rollup cube of the filtered rows grouped inside the store"""
+    return RollupCube(_store.rollup_cells(*filter_key))
+
+class DashboardContext:
+    """Loaded dataset and sidebar filter state of one script run, shared by every page.
+
+    With the analytical store, filters run as SQL and rows are only fetched when a
+    page asks for them; otherwise the shared frame and its indexes answer directly.
+    Pages call only the accessors they need, so each computes just its own views.
+    """
+    
+    def __init__(self, dataset_key, filter_key, timer, value_range, store=None, dataset=None, daily_store=None):
+        self.dataset_key = dataset_key
+        self.filter_key = filter_key
+        self.timer = timer
+        self.value_range = value_range
+        self.store = store
+        self.daily_store = daily_store
+        estates, levels, self.min_improvement = filter_key
+        self.selections = {'Estate': estates, 'Tingkat_Sertifikasi': levels}
+        if store is None:
+            self.df, self.filter_index, self.sketch_index, self.cell_aggregates, self.detail_table = dataset
+        self._positions = None
+    
+    def cuts_cells(self):
+        """Whether the improvement threshold drops rows inside estate x level cells"""
+        return self.min_improvement > self.value_range[0]
+    
+    def positions(self):
+        """Positions of the filtered rows in the shared frame, selected on first use"""
+        if self._positions is None:
+            # Apply filters via the precomputed bitmaps and sorted positions
+            self._positions = self.filter_index.select(self.selections, self.min_improvement)
+        return self._positions
+    
+    def rows(self):
+        """The filtered rows; fetched from the store, or a view of the shared frame"""
+        if self.store is not None:
+            return get_store_rows(self.dataset_key, self.filter_key, self.store)
+        positions = self.positions()
+        # Selecting every row reuses the shared frame instead of copying it
+        return self.df if len(positions) == len(self.df) else self.df.iloc[positions]
+    
+    def summary(self):
+        """KPI means, estate rollup and low-performer count of the filter state"""
+        if self.store is not None:
+            return get_store_summary(self.dataset_key, self.filter_key, self.store)
+        return get_frame_summary(self.dataset_key, self.filter_key, self.cell_aggregates, self.sketch_index)
+    
+    def sketches(self):
+        """Merged sketches of the selected cells, or None when they don't describe the selection"""
+        # Sketches are per estate x level cell, so they only describe selections that
+        # don't cut through a cell with the improvement threshold
+        if self.store is not None or self.cuts_cells():
+            return None
+        return {col: self.sketch_index.merged(col, self.selections) for col in SKETCH_COLUMNS}
+    
+    def rank(self, metric, columns, k, by, largest):
+        """Top (or bottom) k filtered rows by metric within each group"""
+        if self.store is not None:
+            return self.store.top_k(*self.filter_key, metric, columns, k, by, largest)
+        return top_k(self.rows(), metric, k, by, largest, columns)
+    
+    def detail(self):
+        """Paging index and the positions of the filtered rows in it (None = all rows)"""
+        if self.store is not None:
+            return get_store_detail_table(self.dataset_key, self.filter_key, self.store), None
+        return self.detail_table, self.positions()
+    
+    def scenario_inputs(self):
+        """Per-estate sums behind the scenario sweep"""
+        if self.store is not None:
+            return self.store.scenario_inputs(*self.filter_key)
+        return self.cell_aggregates.scenario_inputs(self.selections, self.min_improvement)
+    
+    def cohorts(self):
+        """Cohort cells of the filter state"""
+        if self.store is not None:
+            return get_store_cohorts(self.dataset_key, self.filter_key, self.store)
+        # Cohort cells are per estate x level like the sketches; a cutting threshold regroups the filtered rows
+        dataset_cohorts = get_dataset_cohorts(self.dataset_key, self.df)
+        if self.cuts_cells():
+            return get_filtered_cohorts(self.dataset_key, self.filter_key, self.rows, dataset_cohorts.reference)
+        return dataset_cohorts
+    
+    def rollup(self):
+        """Estate -> Afdeling -> Mandor rollup cube of the filter state"""
+        if self.store is not None:
+            return get_store_rollup(self.dataset_key, self.filter_key, self.store)
+        # The cube's cells split every estate x level cell, so only a cutting threshold needs the rows
+        if self.cuts_cells():
+            return get_filtered_rollup(self.dataset_key, self.filter_key, self.rows)
+        return get_dataset_rollup(self.dataset_key, self.df)
+
+def current_context():
+    """The DashboardContext the entry script built for this run"""
+    return st.session_state[CONTEXT_KEY]
+
+def load_context():
+    """Render the upload and filter sidebar and return the run's DashboardContext"""
+    # Opt-in per-section profiling; the checkbox lives at the bottom of the sidebar
+    profiling = st.session_state.get('profiling', PROFILING_DEFAULT)
+    ctx = get_script_run_ctx()
+    get_profiler().trace(ctx.session_id if ctx else None, profiling, is_active_session)
+    timer = get_profiler().run(enabled=profiling)
+    timer.start('load_data')
+    
+    # Sidebar
+    with st.sidebar:
+        st.header("📁 Upload Data")
+        data_mode = st.radio("Mode Data", DATA_MODES, horizontal=True, key="data_mode")
+        daily_mode = data_mode == DATA_MODES[1]
+        store = get_analytical_store() if STORE_PATH and not daily_mode else None
+        
+        if daily_mode:
+            uploaded_files = []
+            roster_file = st.file_uploader("Upload Roster Pemanen (CSV)", type=['csv'], key="roster_file")
+            daily_files = st.file_uploader(
+                "Upload Data Panen Harian (CSV)",
+                type=['csv'],
+                accept_multiple_files=True,
+                key="daily_files"
+            )
+        else:
+            uploaded_files = st.file_uploader(
+                "Upload CSV Data Pemanen (bisa beberapa file)",
+                type=['csv'],
+                accept_multiple_files=True
+            )
+        
+        st.markdown("---")
+        st.header("⚙️ Filter")
+        
+        if daily_mode:
+            daily_store = get_daily_store()
+            try:
+                dataset_key, (df, filter_index, sketch_index, cell_aggregates, detail_table) = load_daily_data(daily_store, roster_file, daily_files)
+            except ValueError as e:
+                st.error(f"Data tidak valid: {e}")
+                st.stop()
+            if len(df) == 0:
+                st.info("Upload roster dan data panen harian yang mencakup periode sebelum dan sesudah sertifikasi")
+                show_upload_report(dataset_key)
+                st.stop()
+        elif store is not None:
+            # The store outlives sessions: an upload adds a dataset, otherwise the latest one is reused
+            release_dataset()
+            df = None
+            if uploaded_files:
+                raws = [f.getvalue() for f in uploaded_files]
+                dataset_key = uploads_key(raws)
+                if not store.has(dataset_key):
+                    with st.spinner("Menyimpan data ke penyimpanan lokal..."):
+                        try:
+                            store.load(load_uploads(dataset_key, raws, [f.name for f in uploaded_files]), dataset_key)
+                        except ValueError as e:
+                            st.error(f"Data tidak valid: {e}")
+                            show_upload_report(dataset_key)
+                            st.stop()
+            else:
+                dataset_key = store.latest()
+                if dataset_key is None:
+                    dataset_key = 'dummy'
+                    store.load(generate_demo_data(), dataset_key)
+                st.info("Membaca data dari penyimpanan lokal")
+            
+            # From here on, queries only read this session's dataset table
+            ctx = get_script_run_ctx()
+            store = store.acquire(ctx.session_id if ctx else None, dataset_key, is_active_session)
+        elif uploaded_files:
+            raws = [f.getvalue() for f in uploaded_files]
+            dataset_key = uploads_key(raws)
+            try:
+                df, filter_index, sketch_index, cell_aggregates, detail_table = acquire_dataset(
+                    dataset_key,
+                    lambda: load_uploads(dataset_key, raws, [f.name for f in uploaded_files])
+                )
+            except ValueError as e:
+                st.error(f"Data tidak valid: {e}")
+                show_upload_report(dataset_key)
+                st.stop()
+        else:
+            st.info("Menggunakan data dummy untuk demo")
+            dataset_key = 'dummy'
+            df, filter_index, sketch_index, cell_aggregates, detail_table = acquire_dataset(dataset_key, generate_demo_data)
+            
+            # Provide download link for dummy data
+            st.download_button(
+                label="📥 Download Template CSV",
+                data=get_template_csv,
+                file_name="template_data_pemanen.csv",
+                mime="text/csv"
+            )
+        
+        show_upload_report(dataset_key)
+        
+        # Filters
+        timer.start('filter')
+        if store is not None:
+            filter_options = store.options()
+            min_tonnage_gain, max_tonnage_gain = store.value_range()
+        else:
+            filter_options = filter_index.options
+            min_tonnage_gain, max_tonnage_gain = filter_index.value_range()
+        
+        selected_estates = st.multiselect(
+            "Pilih Estate",
+            options=filter_options['Estate'],
+            default=filter_options['Estate']
+        )
+        
+        selected_certification = st.multiselect(
+            "Tingkat Sertifikasi",
+            options=filter_options['Tingkat_Sertifikasi'],
+            default=filter_options['Tingkat_Sertifikasi']
+        )
+        
+        min_improvement = st.slider(
+            "Min. Peningkatan Tonase (%)",
+            min_value=min_tonnage_gain,
+            max_value=max_tonnage_gain,
+            value=min_tonnage_gain
+        )
+    
+    filter_key = (
+        tuple(sorted(map(str, selected_estates))),
+        tuple(sorted(map(str, selected_certification))),
+        min_improvement
+    )
+    
+    if store is None:
+        dataset = (df, filter_index, sketch_index, cell_aggregates, detail_table)
+    else:
+        dataset = None
+    context = DashboardContext(
+        dataset_key,
+        filter_key,
+        timer,
+        (min_tonnage_gain, max_tonnage_gain),
+        store=store,
+        dataset=dataset,
+        daily_store=daily_store if daily_mode else None
+    )
+    st.session_state[CONTEXT_KEY] = context
+    return context
+
+def show_profiler(profiling):
+    """Profiler panel at the bottom of the sidebar"""
+    with st.sidebar:
+        st.markdown("---")
+        st.header("⏱️ Profiler")
+        st.checkbox("Ukur waktu & memori per bagian", value=PROFILING_DEFAULT, key='profiling')
+        
+        if profiling:
+            profiler = get_profiler()
+            st.dataframe(pd.DataFrame(profiler.summary()), hide_index=True, use_container_width=True)
+            shared_refs = get_shared_datasets().stats()
+            st.caption(f"Dataset bersama di memori: {len(shared_refs)}, dipakai {sum(shared_refs.values())} sesi")
+            profiler.write(PROFILE_DIR)
+            st.caption(f"Histogram ditulis ke `{PROFILE_DIR}/metrics.json` dan `{PROFILE_DIR}/metrics.prom`")
+            st.download_button(
+                label="📥 Download Metrik (JSON)",
+                data=profiler.to_json(),
+                file_name="dashboard_metrics.json",
+                mime="application/json"
+            )
+            st.download_button(
+                label="📥 Download Metrik (Prometheus)",
+                data=profiler.to_prometheus(),
+                file_name="dashboard_metrics.prom",
+                mime="text/plain"
+            )
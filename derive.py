@@ -0,0 +1,63 @@
+import numpy as np
+
+# Quality score = 100 - sum(weight * defect %), per defect column prefix
+QUALITY_WEIGHTS = {
+    'Brondolan_Loss': 3,
+    'Buah_Mentah': 4,
+    'Buah_Busuk': 5,
+    'Gagang_Panjang': 2
+}
+
+PERIODS = ('Sebelum', 'Sesudah')
+
+
+def _has(df, *columns):
+    return all(col in df.columns for col in columns)
+
+
+def derive_metrics(df, quality_weights=QUALITY_WEIGHTS, base_wage=None, premium_per_kg=None):
+    """Compute improvement, quality score and income columns in place from the raw columns"""
+    # Each group is derived only when its raw inputs exist, so precomputed values shipped
+    # for a missing input are kept. base_wage (Rp/day) and premium_per_kg (Rp/kg) override
+    # the per-worker Upah_Dasar_per_hari and Premi_per_kg columns when given.
+    def values(col):
+        return df[col].to_numpy(dtype='float64')
+
+    # Calculate improvement metrics
+    if _has(df, 'Tonase_Sebelum_kg_per_hari', 'Tonase_Sesudah_kg_per_hari'):
+        tonnage_before = values('Tonase_Sebelum_kg_per_hari')
+        tonnage_after = values('Tonase_Sesudah_kg_per_hari')
+        # A zero baseline has no defined improvement: NaN rather than +-inf, which would break the filter range
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gain = (tonnage_after - tonnage_before) / tonnage_before * 100
+        df['Peningkatan_Tonase_pct'] = np.round(np.where(tonnage_before != 0, gain, np.nan), 2)
+    if _has(df, 'Jumlah_Pokok_Sebelum', 'Jumlah_Pokok_Sesudah'):
+        df['Peningkatan_Produktivitas_pokok'] = (df['Jumlah_Pokok_Sesudah'].to_numpy() -
+                                                 df['Jumlah_Pokok_Sebelum'].to_numpy())
+    if _has(df, 'Brondolan_Loss_Sebelum_pct', 'Brondolan_Loss_Sesudah_pct'):
+        df['Penurunan_Loss_pct'] = np.round(values('Brondolan_Loss_Sebelum_pct') - values('Brondolan_Loss_Sesudah_pct'), 2)
+
+    # Calculate quality score (0-100)
+    for period in PERIODS:
+        defect_columns = [f'{defect}_{period}_pct' for defect in quality_weights]
+        if _has(df, *defect_columns):
+            penalty = np.zeros(len(df))
+            for col, weight in zip(defect_columns, quality_weights.values()):
+                penalty += values(col) * weight
+            df[f'Kualitas_Score_{period}'] = np.round(100 - penalty, 1)
+
+    # Calculate earnings
+    wage_ok = base_wage is not None or _has(df, 'Upah_Dasar_per_hari')
+    premium_ok = premium_per_kg is not None or _has(df, 'Premi_per_kg')
+    if wage_ok and premium_ok:
+        wage = values('Upah_Dasar_per_hari') if base_wage is None else base_wage
+        premium = values('Premi_per_kg') if premium_per_kg is None else premium_per_kg
+        for period in PERIODS:
+            if _has(df, f'Hari_Kerja_{period}', f'Tonase_{period}_kg_per_hari'):
+                days = values(f'Hari_Kerja_{period}')
+                tonnage = values(f'Tonase_{period}_kg_per_hari')
+                df[f'Pendapatan_{period}'] = np.round(wage * days + tonnage * premium * days, 0)
+        if _has(df, 'Pendapatan_Sebelum', 'Pendapatan_Sesudah'):
+            df['Peningkatan_Pendapatan'] = np.round(values('Pendapatan_Sesudah') - values('Pendapatan_Sebelum'), 0)
+
+    return df
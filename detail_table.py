@@ -0,0 +1,68 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Columns matched by the detail table search box
+SEARCH_COLUMNS = ['ID_Pekerja', 'Nama_Pekerja']
+
+PAGE_SIZES = [25, 50, 100, 200]
+
+
+class DetailTable:
+    """Sort orders and search keys for paging through a frame without formatting all of it.
+
+    The stable sort order of each column is computed once, on first use, and shared
+    by every filter state: a filtered, sorted view is the column order restricted to
+    the selected rows, after which any page is a slice of it. Missing values sort
+    last in both directions, and ties keep row order, as sort_values(kind='stable').
+    """
+
+    def __init__(self, df, search_columns=SEARCH_COLUMNS):
+        self.df = df
+        self.search_columns = [col for col in search_columns if col in df.columns]
+        self._lock = threading.Lock()
+        self._orders = {}
+        self._search_keys = None
+
+    def order(self, column, ascending=True):
+        """Row positions of the whole frame sorted by column"""
+        key = (column, ascending)
+        with self._lock:
+            if key not in self._orders:
+                # Dense ranks sort every dtype in linear time with the stable (radix) sort
+                codes, uniques = pd.factorize(self.df[column], sort=True)
+                ranks = codes if ascending else len(uniques) - 1 - codes
+                ranks[codes < 0] = len(uniques)
+                self._orders[key] = np.argsort(ranks, kind='stable')
+            return self._orders[key]
+
+    def search(self, query):
+        """Boolean mask of rows whose search columns contain query, ignoring case"""
+        with self._lock:
+            if self._search_keys is None:
+                self._search_keys = [self.df[col].astype(str).str.lower() for col in self.search_columns]
+        query = query.strip().lower()
+        mask = np.zeros(len(self.df), dtype=bool)
+        for keys in self._search_keys:
+            mask |= keys.str.contains(query, regex=False).to_numpy()
+        return mask
+
+    def view(self, positions=None, sort_column=None, ascending=True, query=''):
+        """Positions of the selected rows (all when None) matching query, in display order"""
+        if positions is None and not query.strip() and sort_column is None:
+            return np.arange(len(self.df))
+        mask = np.zeros(len(self.df), dtype=bool)
+        mask[np.arange(len(self.df)) if positions is None else positions] = True
+        if query.strip():
+            mask &= self.search(query)
+        if sort_column is None:
+            return np.flatnonzero(mask)
+        order = self.order(sort_column, ascending)
+        return order[mask[order]]
+
+    def page(self, ordered, page, page_size, columns=None):
+        """Rows of one page of an ordered view; page numbers start at 1"""
+        start = (page - 1) * page_size
+        rows = self.df.iloc[ordered[start:start + page_size]]
+        return rows if columns is None else rows[columns]
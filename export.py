@@ -0,0 +1,67 @@
+import gzip
+import io
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # listed in requirements.txt; without it only the CSV formats are offered
+    pa = None
+    pq = None
+
+# Rows serialized per chunk; bounds the size of intermediate text buffers
+EXPORT_CHUNK_ROWS = 100_000
+
+
+def iter_csv_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield the frame as UTF-8 CSV bytes, one chunk of rows at a time"""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode('utf-8')
+
+
+def write_csv(df, target, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Stream the frame as CSV into a binary file-like object"""
+    for block in iter_csv_chunks(df, chunk_rows):
+        target.write(block)
+
+
+def write_parquet(df, target, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Stream the frame as Parquet into a path or binary file-like object, one row group per chunk"""
+    if pq is None:
+        raise ImportError("Export Parquet membutuhkan paket pyarrow")
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(target, schema, compression='snappy') as writer:
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export_csv(df):
+    """Serialize the frame to CSV bytes"""
+    buffer = io.BytesIO()
+    write_csv(df, buffer)
+    return buffer.getvalue()
+
+
+def export_csv_gzip(df):
+    """Serialize the frame to gzip-compressed CSV bytes"""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=6) as gz:
+        write_csv(df, gz)
+    return buffer.getvalue()
+
+
+def export_parquet(df):
+    """Serialize the frame to Parquet bytes"""
+    buffer = io.BytesIO()
+    write_parquet(df, buffer)
+    return buffer.getvalue()
+
+
+# Download formats: label -> (serializer, file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': (export_csv, 'csv', 'text/csv'),
+    'CSV (gzip)': (export_csv_gzip, 'csv.gz', 'application/gzip'),
+}
+if pq is not None:
+    EXPORT_FORMATS['Parquet'] = (export_parquet, 'parquet', 'application/vnd.apache.parquet')
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from schema import CELL_COLUMNS, IMPROVEMENT_COLUMN
+
+# Number of sorted-position buckets with precomputed suffix bitmaps
+RANGE_BUCKETS = 32
+
+
+class FilterIndex:
+    """Precomputed row bitmaps and sorted positions for the sidebar filters"""
+
+    def __init__(self, df, category_columns=CELL_COLUMNS, range_column=IMPROVEMENT_COLUMN):
+        self.n_rows = len(df)
+        self.range_column = range_column
+
+        # One packed bitmap per distinct value, in order of first appearance
+        self.options = {}
+        self.bitmaps = {}
+        for col in category_columns:
+            codes, uniques = pd.factorize(df[col], sort=False)
+            self.options[col] = list(uniques)
+            self.bitmaps[col] = {
+                value: np.packbits(codes == code) for code, value in enumerate(uniques)
+            }
+
+        # Row positions sorted by the range column; NaNs sort last and never match
+        values = df[range_column].to_numpy()
+        self.order = np.argsort(values, kind='stable')
+        self.sorted_values = values[self.order]
+        self.n_valid = int(np.count_nonzero(~np.isnan(self.sorted_values)))
+
+        # suffix_bitmaps[b] marks rows at sorted positions >= b * bucket_size, so a
+        # threshold only has to scatter the rows of one partial bucket
+        self.bucket_size = max(1, -(-self.n_valid // RANGE_BUCKETS))
+        n_buckets = -(-self.n_valid // self.bucket_size)
+        suffix = np.zeros(self.n_rows, dtype=bool)
+        self.suffix_bitmaps = [np.packbits(suffix)]
+        for bucket in reversed(range(n_buckets)):
+            stop = min((bucket + 1) * self.bucket_size, self.n_valid)
+            suffix[self.order[bucket * self.bucket_size:stop]] = True
+            self.suffix_bitmaps.append(np.packbits(suffix))
+        self.suffix_bitmaps.reverse()
+
+    def value_range(self):
+        """Return the (min, max) of the range column, ignoring NaNs"""
+        if self.n_valid == 0:
+            return 0.0, 0.0
+        return float(self.sorted_values[0]), float(self.sorted_values[self.n_valid - 1])
+
+    def select(self, selections, min_value=None):
+        """Return sorted row positions matching the category selections and minimum value"""
+        mask = None
+
+        # Bitmap union within a column, intersection across columns
+        for col, selected in selections.items():
+            bitmaps = self.bitmaps[col]
+            chosen = [bitmaps[value] for value in dict.fromkeys(selected) if value in bitmaps]
+            if len(chosen) == len(bitmaps):
+                continue
+            if not chosen:
+                return np.arange(0)
+            col_mask = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            for bitmap in chosen:
+                col_mask |= bitmap
+            mask = col_mask if mask is None else mask & col_mask
+
+        # Binary search for the threshold; everything from there up to the NaNs matches
+        if min_value is not None:
+            start = int(np.searchsorted(self.sorted_values[:self.n_valid],
+                                        self.sorted_values.dtype.type(min_value), side='left'))
+            if start > 0 or self.n_valid < self.n_rows:
+                bucket = -(-start // self.bucket_size)
+                range_mask = self.suffix_bitmaps[bucket]
+                partial = self.order[start:min(bucket * self.bucket_size, self.n_valid)]
+                if len(partial):
+                    partial_mask = np.zeros(self.n_rows, dtype=bool)
+                    partial_mask[partial] = True
+                    range_mask = range_mask | np.packbits(partial_mask)
+                mask = range_mask if mask is None else mask & range_mask
+
+        if mask is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(mask, count=self.n_rows).view(bool))
@@ -0,0 +1,150 @@
+import hashlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, union_categoricals
+
+from validation import REASON_COLUMN, estate_counts, suspect_estates, validate_harvester_frame
+
+# Columns stored as pandas categoricals (few distinct values, many rows)
+CATEGORICAL_COLUMNS = ['Estate', 'Afdeling', 'Mandor', 'Tingkat_Sertifikasi']
+
+# Columns parsed as datetimes
+DATE_COLUMNS = ['Tanggal_Sertifikasi', 'Tanggal']
+
+# Merged uploads keep one row per worker: the one with the latest certification date
+DEDUP_KEY = 'ID_Pekerja'
+DEDUP_ORDER = 'Tanggal_Sertifikasi'
+
+# Column name patterns that are downcast to compact numeric types
+FLOAT_PATTERNS = ('_pct', 'Tonase_')
+INT_PATTERNS = ('Hari_Kerja_',)
+
+
+def content_hash(raw):
+    """Return a short hex digest identifying the uploaded file content"""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def build_csv_schema(columns):
+    """Build the read_csv dtype mapping and date columns for the given header"""
+    dtypes = {}
+    for col in columns:
+        if col in CATEGORICAL_COLUMNS:
+            dtypes[col] = 'category'
+        elif any(pattern in col for pattern in FLOAT_PATTERNS):
+            dtypes[col] = 'float32'
+    parse_dates = [col for col in DATE_COLUMNS if col in columns]
+    int_columns = [col for col in columns if any(pattern in col for pattern in INT_PATTERNS)]
+    return dtypes, parse_dates, int_columns
+
+
+def read_harvester_csv(raw):
+    """Parse raw CSV bytes into a typed harvester DataFrame"""
+    header = pd.read_csv(io.BytesIO(raw), nrows=0).columns
+    dtypes, parse_dates, int_columns = build_csv_schema(header)
+
+    try:
+        df = pd.read_csv(io.BytesIO(raw), dtype=dtypes, parse_dates=parse_dates)
+    except ValueError:
+        # Text in a numeric column: read those columns untyped so validation can quarantine the rows
+        categorical = {col: dtype for col, dtype in dtypes.items() if dtype == 'category'}
+        df = pd.read_csv(io.BytesIO(raw), dtype=categorical, parse_dates=parse_dates)
+
+    return restore_dtypes(df, dtypes, int_columns)
+
+
+def restore_dtypes(df, dtypes, int_columns):
+    """Apply the compact numeric schema to columns that don't have it yet"""
+    for col, dtype in dtypes.items():
+        if dtype != 'category' and is_numeric_dtype(df[col]) and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+
+    # Integer columns are downcast after parsing so missing values don't break the read
+    for col in int_columns:
+        if is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+
+    return df
+
+
+def _timed_read(raw, name, allowed_estates=None, validate=validate_harvester_frame):
+    """Parse and validate one file; returns valid rows, quarantined rows and parse/validation seconds"""
+    start = time.perf_counter()
+    df = read_harvester_csv(raw)
+    parsed = time.perf_counter()
+    try:
+        df, quarantine = validate(df, allowed_estates)
+    except ValueError as e:
+        raise ValueError(f"{name}: {e}") from e
+    if len(quarantine):
+        # Coerced columns get the compact schema back once their bad rows are gone
+        dtypes, _, int_columns = build_csv_schema(df.columns)
+        df = restore_dtypes(df, dtypes, int_columns)
+    return df, quarantine, parsed - start, time.perf_counter() - parsed
+
+
+def merge_frames(frames):
+    """Concatenate typed frames, unifying categoricals first so they stay categorical"""
+    frames = [df for df in frames if len(df.columns)]
+    for col in CATEGORICAL_COLUMNS:
+        parts = [df[col] for df in frames if col in df.columns]
+        if len(parts) > 1:
+            categories = union_categoricals([part.astype('category') for part in parts]).categories
+            for df in frames:
+                if col in df.columns:
+                    df[col] = df[col].astype('category').cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def latest_per_worker(df, key=DEDUP_KEY, order=DEDUP_ORDER):
+    """Keep the row with the latest order value per key (on ties, the last one), in row order"""
+    if key not in df.columns or not df[key].duplicated().any():
+        return df
+    if order in df.columns:
+        # Missing dates sort first so they never win over a dated row
+        ranked = df[order].sort_values(kind='stable', na_position='first').index
+        keep = df.loc[ranked, key].drop_duplicates(keep='last').index
+    else:
+        keep = df[key].drop_duplicates(keep='last').index
+    return df.loc[keep.sort_values()].reset_index(drop=True)
+
+
+def read_harvester_files(raws, names=None, max_workers=None, allowed_estates=None,
+                         validate=validate_harvester_frame, dedup_key=DEDUP_KEY):
+    """Parse and validate several harvester CSVs concurrently, merge them and keep the latest certification per worker.
+
+    Returns the merged valid rows, a per-file report (File, Baris, Karantina,
+    Detik_Baca, Detik_Validasi), the number of duplicate rows dropped, the
+    quarantined rows with their file and reasons, and the estates that look like
+    typos of a more frequent name (rows kept; empty with an allowlist). pandas'
+    C parser releases the GIL while tokenizing, so a thread pool parses files in
+    parallel without copying them between processes.
+
+    validate is validate_harvester_frame or one of the daily-mode validators; daily
+    records have several rows per worker and are read with dedup_key=None.
+    """
+    names = names or [f'file_{i + 1}' for i in range(len(raws))]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_timed_read, raws, names, [allowed_estates] * len(raws), [validate] * len(raws)))
+
+    merged = merge_frames([df for df, _, _, _ in results])
+    df = latest_per_worker(merged, dedup_key) if dedup_key else merged
+    report = pd.DataFrame({
+        'File': names,
+        'Baris': [len(frame) + len(quarantine) for frame, quarantine, _, _ in results],
+        'Karantina': [len(quarantine) for _, quarantine, _, _ in results],
+        'Detik_Baca': [round(seconds, 3) for _, _, seconds, _ in results],
+        'Detik_Validasi': [round(seconds, 3) for _, _, _, seconds in results]
+    })
+    quarantine = pd.concat(
+        [q.assign(File=name)[['File', REASON_COLUMN] + list(q.columns.drop(REASON_COLUMN))]
+         for name, (_, q, _, _) in zip(names, results)],
+        ignore_index=True
+    )
+    typos = {}
+    if not allowed_estates and len(df) and 'Estate' in df.columns:
+        typos = suspect_estates(estate_counts(df['Estate']))
+    return df, report, len(merged) - len(df), quarantine, typos
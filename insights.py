@@ -0,0 +1,57 @@
+# Workers below this quantile of Peningkatan_Tonase_pct are flagged for mentoring
+LOW_PERFORMER_QUANTILE = 0.25
+
+NEXT_STEPS = """
+**Langkah Selanjutnya:**
+1. Scale up program sertifikasi ke seluruh estate
+2. Refreshment training untuk pemanen lama
+3. Sistem insentif berbasis kualitas
+4. Monitoring berkala performa pasca-sertifikasi
+"""
+
+
+def kpi_cards(kpis, estate_metrics):
+    """The five Ringkasan Performa cards as (label, value, delta) strings"""
+    improvement = (kpis['tonnage_after'] - kpis['tonnage_before']) / kpis['tonnage_before'] * 100
+    quality_improvement = kpis['quality_after'] - kpis['quality_before']
+    income_improvement = kpis['income_after'] - kpis['income_before']
+    return [
+        ("Rata-rata Tonase Harian", f"{kpis['tonnage_after']:.1f} kg", f"+{improvement:.1f}% vs sebelum"),
+        ("Skor Kualitas Rata-rata", f"{kpis['quality_after']:.1f}/100", f"+{quality_improvement:.1f} poin"),
+        ("Dampak Revenue", f"Rp {estate_metrics['Revenue_Impact_juta'].sum():.2f}M", "peningkatan produksi"),
+        ("Rata-rata Pendapatan", f"Rp {kpis['income_after']/1_000_000:.2f}M", f"+Rp {income_improvement/1_000:.0f}K"),
+        ("Total Pemanen Tersertifikasi", f"{kpis['count']}", "pekerja aktif")
+    ]
+
+
+def key_findings(kpis):
+    """Markdown for the Dampak Sertifikasi Positif box"""
+    return f"""
+**Dampak Sertifikasi Positif:**
+- Peningkatan produktivitas rata-rata: **{kpis['tonnage_gain_pct']:.1f}%**
+- Peningkatan skor kualitas: **+{kpis['quality_after'] - kpis['quality_before']:.1f} poin**
+- Penurunan brondolan loss: **{(kpis['loss_before'] - kpis['loss_after']):.1f}%**
+- Tambahan pendapatan pemanen: **Rp {kpis['income_gain']/1000:.0f}K/bulan**
+"""
+
+
+def best_estate(estate_metrics):
+    """Markdown naming the estate with the highest revenue impact, or None without rows"""
+    if len(estate_metrics) == 0:
+        return None
+    estate = estate_metrics.nlargest(1, 'Revenue_Impact_juta')['Estate'].values[0]
+    return f"""
+**Estate Terbaik:** {estate}
+- Menunjukkan peningkatan revenue tertinggi
+- Model best practice untuk estate lain
+"""
+
+
+def improvement_areas(low_performers):
+    """Markdown for the Area Perbaikan box"""
+    return f"""
+**Area Perbaikan:**
+- {low_performers} pemanen perlu pendampingan tambahan
+- Fokus pada pemanen dengan tingkat sertifikasi Dasar
+- Implementasi mentoring dari top performers
+"""
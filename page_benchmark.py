@@ -0,0 +1,91 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+
+APP = 'dashboard_sertifikasi_pemanen.py'
+
+# Budgets in seconds for the demo dataset on a single-vCPU VM. The cold start covers
+# importing Streamlit and the first run of the default page in a fresh interpreter;
+# each page then has a budget for its first visit and for a rerun with warm caches.
+COLD_START_BUDGET = 3.0
+PAGE_BUDGETS = {
+    'views/ringkasan.py': (0.25, 0.15),
+    'views/produktivitas.py': (1.0, 0.3),
+    'views/kualitas.py': (0.5, 0.3),
+    'views/finansial.py': (1.0, 0.3),
+    'views/estate.py': (0.5, 0.3),
+    'views/data.py': (0.5, 0.3),
+    'views/insight.py': (0.75, 0.3)
+}
+
+# Modules whose import is deferred to the pages that need them
+LAZY_MODULES = ['plotly.express', 'scipy.stats']
+
+
+def loaded_lazy_modules():
+    return ','.join(name.split('.')[0] for name in LAZY_MODULES if name in sys.modules) or '-'
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return seconds
+
+
+def measure(app=APP, reruns=3, timeout=120):
+    """Cold start, then the first visit and median rerun time of every page"""
+    # Streamlit is imported here so its import counts towards the cold start
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(app, default_timeout=timeout)
+    timed_run(at)
+    records = [{
+        'page': 'cold_start',
+        'seconds': round(time.perf_counter() - start, 3),
+        'budget': COLD_START_BUDGET,
+        'loaded': loaded_lazy_modules()
+    }]
+
+    for page, (first_budget, rerun_budget) in PAGE_BUDGETS.items():
+        at.switch_page(page)
+        first = timed_run(at)
+        rerun = statistics.median(timed_run(at) for _ in range(reruns))
+        records.append({'page': page, 'seconds': round(first, 3), 'budget': first_budget, 'loaded': loaded_lazy_modules()})
+        records.append({'page': f'{page} (rerun)', 'seconds': round(rerun, 3), 'budget': rerun_budget, 'loaded': loaded_lazy_modules()})
+    return records
+
+
+def print_report(records):
+    print(f"{'page':<34} {'seconds':>8} {'budget':>7}  {'lazy modules loaded'}")
+    for r in records:
+        flag = '' if r['seconds'] <= r['budget'] else '  OVER'
+        print(f"{r['page']:<34} {r['seconds']:>8.3f} {r['budget']:>7.2f}  {r['loaded']}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure dashboard cold start and per-page rerun times against their budgets")
+    parser.add_argument('--app', default=APP, help="Entry script of the dashboard")
+    parser.add_argument('--reruns', type=int, default=3, help="Reruns per page; the median is reported")
+    parser.add_argument('--output', help="Write the measurements as JSON")
+    args = parser.parse_args()
+
+    records = measure(args.app, args.reruns)
+    print_report(records)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(records, f, indent=2)
+
+    over = [r for r in records if r['seconds'] > r['budget']]
+    if over:
+        print(f"\n{len(over)} pengukuran melebihi budget")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Number of recent samples kept per section for percentiles
+ROLLING_WINDOW = 200
+
+
+class SectionProfiler:
+    """Process-wide rolling latency and memory statistics per named dashboard section"""
+
+    def __init__(self, window=ROLLING_WINDOW, buckets=LATENCY_BUCKETS):
+        self.window = window
+        self.buckets = buckets
+        self.sections = {}
+        self._lock = threading.Lock()
+        self._tracing_sessions = set()
+        self._owns_tracing = False
+
+    def record(self, name, seconds, peak_bytes=None):
+        """Add one timing (and optional traced memory peak) for a section"""
+        with self._lock:
+            stats = self.sections.get(name)
+            if stats is None:
+                stats = self.sections[name] = {
+                    'samples': deque(maxlen=self.window),
+                    'bucket_counts': [0] * len(self.buckets),
+                    'count': 0,
+                    'sum': 0.0,
+                    'peak_bytes': None
+                }
+            stats['samples'].append(seconds)
+            stats['count'] += 1
+            stats['sum'] += seconds
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats['bucket_counts'][i] += 1
+            if peak_bytes is not None:
+                stats['peak_bytes'] = peak_bytes
+
+    def trace(self, session_id, enabled, is_active=lambda session_id: True):
+        """Keep tracemalloc tracing while at least one active session profiles, and stop it once none does"""
+        with self._lock:
+            if enabled:
+                self._tracing_sessions.add(session_id)
+            else:
+                self._tracing_sessions.discard(session_id)
+            # Sessions that closed with profiling on no longer hold tracing
+            self._tracing_sessions = {s for s in self._tracing_sessions if s == session_id or is_active(s)}
+            if self._tracing_sessions and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            elif not self._tracing_sessions and self._owns_tracing:
+                # Tracing slows every allocation in the process; only stop what this profiler started
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+    def run(self, enabled=True):
+        """Start timing one script run; sections are delimited by RunTimer.start()"""
+        return RunTimer(self, enabled)
+
+    def summary(self):
+        """Return per-section rows with last, mean, p50 and p95 latency in milliseconds"""
+        with self._lock:
+            rows = []
+            for name, stats in self.sections.items():
+                samples = np.array(stats['samples'])
+                rows.append({
+                    'section': name,
+                    'count': stats['count'],
+                    'last_ms': round(samples[-1] * 1000, 1),
+                    'mean_ms': round(samples.mean() * 1000, 1),
+                    'p50_ms': round(np.percentile(samples, 50) * 1000, 1),
+                    'p95_ms': round(np.percentile(samples, 95) * 1000, 1),
+                    'peak_mb': None if stats['peak_bytes'] is None else round(stats['peak_bytes'] / 1_048_576, 1)
+                })
+            return rows
+
+    def to_json(self):
+        """Serialize the summary and cumulative histograms as JSON"""
+        with self._lock:
+            histograms = {
+                name: {
+                    'buckets': dict(zip(map(str, self.buckets), stats['bucket_counts'])),
+                    'count': stats['count'],
+                    'sum': stats['sum']
+                }
+                for name, stats in self.sections.items()
+            }
+        return json.dumps({'sections': self.summary(), 'histograms': histograms}, indent=2)
+
+    def to_prometheus(self):
+        """Serialize the histograms in the Prometheus text exposition format"""
+        lines = [
+            '# HELP dashboard_section_seconds Wall time per dashboard section',
+            '# TYPE dashboard_section_seconds histogram'
+        ]
+        peaks = []
+        with self._lock:
+            for name, stats in self.sections.items():
+                for bound, count in zip(self.buckets, stats['bucket_counts']):
+                    lines.append(f'dashboard_section_seconds_bucket{{section="{name}",le="{bound}"}} {count}')
+                lines.append(f'dashboard_section_seconds_bucket{{section="{name}",le="+Inf"}} {stats["count"]}')
+                lines.append(f'dashboard_section_seconds_sum{{section="{name}"}} {stats["sum"]:.6f}')
+                lines.append(f'dashboard_section_seconds_count{{section="{name}"}} {stats["count"]}')
+                if stats['peak_bytes'] is not None:
+                    peaks.append(f'dashboard_section_peak_bytes{{section="{name}"}} {stats["peak_bytes"]}')
+        if peaks:
+            lines += [
+                '# HELP dashboard_section_peak_bytes Traced memory growth peak during the last run of a section',
+                '# TYPE dashboard_section_peak_bytes gauge'
+            ] + peaks
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory):
+        """Atomically write metrics.json and metrics.prom into a directory"""
+        os.makedirs(directory, exist_ok=True)
+        for filename, content in (('metrics.json', self.to_json()), ('metrics.prom', self.to_prometheus())):
+            path = os.path.join(directory, filename)
+            with open(path + '.tmp', 'w') as f:
+                f.write(content)
+            os.replace(path + '.tmp', path)
+
+
+class RunTimer:
+    """Times consecutive sections of one script run; starting a section ends the previous one"""
+
+    def __init__(self, profiler, enabled=True):
+        self.profiler = profiler
+        self.enabled = enabled
+        self._name = None
+        self._start = None
+        self._base = 0
+
+    def start(self, name):
+        """End the current section (if any) and start timing a new one"""
+        self.stop()
+        if not self.enabled:
+            return
+        # Memory peaks are only sampled when tracemalloc is tracing; they are
+        # process-wide, so overlapping sessions make them approximate
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._base, _ = tracemalloc.get_traced_memory()
+        self._name = name
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """End the current section and record it"""
+        if self._name is None:
+            return
+        seconds = time.perf_counter() - self._start
+        peak_bytes = None
+        if tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            peak_bytes = max(peak - self._base, 0)
+        self.profiler.record(self._name, seconds, peak_bytes)
+        self._name = None
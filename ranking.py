@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Rank column added to every top/bottom-k result
+RANK_COLUMN = 'Peringkat'
+
+
+def _as_list(by):
+    if by is None:
+        return []
+    return [by] if isinstance(by, str) else list(by)
+
+
+def group_positions(df, by=None):
+    """Group keys (sorted) and the row positions of each group in row order; rows with missing keys are skipped"""
+    by = _as_list(by)
+    if not by:
+        return pd.DataFrame(index=range(1)), [np.arange(len(df))]
+
+    grouped = df.groupby(by, observed=True, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    keys = grouped.size().index.to_frame(index=False)
+
+    # Rows with a missing key have a NaN code; integer codes sort in linear time with the stable (radix) sort
+    rows = np.flatnonzero(codes >= 0)
+    codes = codes[rows].astype(np.int64)
+    rows = rows[np.argsort(codes, kind='stable')]
+    bounds = np.cumsum(np.bincount(codes, minlength=len(keys)))[:-1]
+    return keys, np.split(rows, bounds)
+
+
+def select_k(values, k, largest=True):
+    """Indices of the k largest (or smallest) values in rank order; ties keep position order, NaNs are skipped"""
+    keyed = values if largest else -values
+    candidates = np.flatnonzero(~np.isnan(keyed))
+    if k <= 0:
+        return candidates[:0]
+
+    # Partial selection: only the k winners are ever sorted
+    if len(candidates) > k:
+        candidate_values = keyed[candidates]
+        kth = np.partition(candidate_values, len(candidates) - k)[len(candidates) - k]
+        above = candidates[candidate_values > kth]
+        ties = candidates[candidate_values == kth][:k - len(above)]
+        candidates = np.concatenate([above, ties])
+    return candidates[np.lexsort((candidates, -keyed[candidates]))]
+
+
+def top_k(df, metric, k=10, by=None, largest=True, columns=None):
+    """Top (or bottom) k rows by metric within each group, with their rank; matches nlargest/nsmallest per group"""
+    by = _as_list(by)
+    columns = [col for col in (columns or [metric]) if col not in by]
+    values = df[metric].to_numpy(dtype='float64')
+    keys, groups = group_positions(df, by)
+
+    chosen = [positions[select_k(values[positions], k, largest)] for positions in groups]
+    sizes = [len(positions) for positions in chosen]
+    positions = np.concatenate(chosen) if chosen else np.arange(0)
+
+    result = keys.iloc[np.repeat(np.arange(len(keys)), sizes)].reset_index(drop=True)
+    result[RANK_COLUMN] = np.concatenate([np.arange(1, size + 1) for size in sizes]) if sizes else []
+    return pd.concat([result, df[columns].iloc[positions].reset_index(drop=True)], axis=1)
+
+
+def quantile(values, q):
+    """Linearly interpolated q-quantile (as pandas computes it) found by partial selection; NaNs are ignored"""
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.nan
+    position = (len(values) - 1) * q
+    low = math.floor(position)
+    high = min(low + 1, len(values) - 1)
+    partitioned = np.partition(values, [low, high])
+    return partitioned[low] + (partitioned[high] - partitioned[low]) * (position - low)
+
+
+def below_quantile(df, metric, q, by=None):
+    """Row positions whose metric is below the q-quantile of their group (of all rows when by is None)"""
+    values = df[metric].to_numpy(dtype='float64')
+    _, groups = group_positions(df, by)
+    below = [positions[values[positions] < quantile(values[positions], q)] for positions in groups]
+    return np.sort(np.concatenate(below)) if below else np.arange(0)
@@ -0,0 +1,267 @@
+import argparse
+import gzip
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from aggregation import aggregate_production, summary_kpis
+from charts import estate_figures, financial_figures, productivity_figures, quality_figures
+from derive import derive_metrics
+from ingest import read_harvester_csv
+from insights import (LOW_PERFORMER_QUANTILE, NEXT_STEPS, best_estate, improvement_areas, key_findings,
+                      kpi_cards)
+from ranking import below_quantile
+from sketch import SKETCH_COLUMNS, SketchIndex
+from synthetic import generate_dummy_data
+
+DEFAULT_OUTPUT = 'laporan'
+
+# Plotly.js is loaded from the CDN unless --offline copies it next to the reports
+PLOTLYJS_CDN = f'https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js'
+PLOTLYJS_FILE = 'plotly.min.js'
+
+# Estate metrics table formats, as in the Performa Estate tab
+ESTATE_TABLE_FORMATS = {
+    'Produksi_Sebelum_ton': '{:.2f}',
+    'Produksi_Sesudah_ton': '{:.2f}',
+    'Peningkatan_ton': '{:.2f}',
+    'Revenue_Impact_juta': 'Rp {:.2f}M',
+    'Avg_Quality_Before': '{:.1f}',
+    'Avg_Quality_After': '{:.1f}'
+}
+
+PAGE_STYLE = """
+body { font-family: sans-serif; margin: 2rem; color: #212121; }
+h1 { color: #2e7d32; padding-bottom: 10px; border-bottom: 3px solid #4caf50; }
+h2 { color: #1b5e20; margin-top: 2rem; }
+.cards { display: flex; gap: 1rem; flex-wrap: wrap; }
+.card { flex: 1; min-width: 160px; padding: 15px; border-radius: 8px; box-shadow: 1px 1px 3px rgba(0,0,0,0.1); }
+.card .label { font-size: 0.85rem; color: #616161; }
+.card .value { font-size: 1.6rem; margin: 4px 0; }
+.card .delta { color: #2e7d32; font-size: 0.85rem; }
+.row { display: flex; gap: 1rem; flex-wrap: wrap; }
+.row > div { flex: 1; min-width: 400px; }
+table { border-collapse: collapse; }
+th, td { padding: 4px 10px; border-bottom: 1px solid #e0e0e0; text-align: right; }
+.box { padding: 0.5rem 1rem; border-radius: 8px; margin-bottom: 1rem; }
+.success { background: #e8f5e9; } .info { background: #e3f2fd; } .warning { background: #fff8e1; }
+"""
+
+# Dataset shared with the worker processes, set once per process by init_worker
+_dataset = None
+
+
+def slugify(name):
+    return re.sub(r'[^0-9A-Za-z]+', '_', str(name)).strip('_').lower()
+
+
+def load_dataset(path=None, n_rows=None, estates=None):
+    """Read a harvester .csv, .csv.gz or .parquet file, or generate dummy data when no path is given"""
+    if path is None:
+        return generate_dummy_data(n_rows or 50, **({'estates': estates} if estates else {}))
+    if path.endswith('.parquet'):
+        return derive_metrics(pd.read_parquet(path))
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return derive_metrics(read_harvester_csv(f.read()))
+
+
+def report_scopes(df):
+    """Group summary, then one scope per estate and per certification level: (title, file name, selection)"""
+    scopes = [("Ringkasan Grup", 'ringkasan_grup.html', {})]
+    for col, prefix in (('Estate', 'estate'), ('Tingkat_Sertifikasi', 'sertifikasi')):
+        for value in pd.unique(df[col].dropna()):
+            scopes.append((str(value), f'{prefix}_{slugify(value)}.html', {col: [value]}))
+    return scopes
+
+
+def markdown_html(text):
+    """Render the bold/list markdown used by the insight texts"""
+    parts = []
+    open_list = None
+    for line in text.strip().splitlines():
+        line = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html.escape(line.strip()))
+        item = re.match(r'(- |\d+\. )(.*)', line)
+        kind = None if item is None else 'ul' if item.group(1) == '- ' else 'ol'
+        if kind != open_list:
+            if open_list:
+                parts.append(f'</{open_list}>')
+            if kind:
+                parts.append(f'<{kind}>')
+            open_list = kind
+        parts.append(f'<li>{item.group(2)}</li>' if item else f'<p>{line}</p>')
+    if open_list:
+        parts.append(f'</{open_list}>')
+    return '\n'.join(parts)
+
+
+def figure_html(fig):
+    return fig.to_html(full_html=False, include_plotlyjs=False)
+
+
+def render_report(title, df, sketches=None, plotlyjs_src=PLOTLYJS_CDN):
+    """Render the dashboard's KPIs, section figures, estate table and insights for df as one HTML page"""
+    kpis = summary_kpis(df)
+    estate_metrics = aggregate_production(df, by='Estate')
+    low_performers = len(below_quantile(df, 'Peningkatan_Tonase_pct', LOW_PERFORMER_QUANTILE))
+
+    productivity = productivity_figures(df, sketches=sketches)
+    quality = quality_figures(df)
+    financial = financial_figures(df, sketches=sketches)
+    estate = estate_figures(estate_metrics)
+
+    cards = ''.join(
+        f'<div class="card"><div class="label">{html.escape(label)}</div>'
+        f'<div class="value">{html.escape(value)}</div><div class="delta">{html.escape(delta)}</div></div>'
+        for label, value, delta in kpi_cards(kpis, estate_metrics)
+    )
+    defects = ''.join(
+        f'<div class="card"><div class="label">{html.escape(row.Metrik)}</div><div class="value">{row.Sesudah:.1f}%</div>'
+        f'<div class="delta">-{row.Penurunan:.1f}% ({row.Penurunan_pct:.0f}%)</div></div>'
+        for row in quality['quality_metrics'].itertuples()
+    )
+    breakdown = [
+        ("Rata-rata Upah Dasar/Bulan", f"Rp {financial['avg_base_salary']/1_000_000:.2f}M", ""),
+        ("Rata-rata Premi Sebelum", f"Rp {financial['avg_premium_before']/1_000_000:.2f}M", ""),
+        ("Rata-rata Premi Sesudah", f"Rp {financial['avg_premium_after']/1_000_000:.2f}M",
+         f"+Rp {(financial['avg_premium_after'] - financial['avg_premium_before'])/1_000:.0f}K"),
+        ("Total Tambahan Pendapatan", f"Rp {financial['total_additional_income']/1_000_000:.2f}M", "untuk semua pemanen")
+    ]
+    breakdown = ''.join(
+        f'<div class="card"><div class="label">{label}</div><div class="value">{value}</div><div class="delta">{delta}</div></div>'
+        for label, value, delta in breakdown
+    )
+    estate_table = estate['estate_metrics_display'].to_html(
+        index=False,
+        formatters={col: fmt.format for col, fmt in ESTATE_TABLE_FORMATS.items()}
+    )
+    best = best_estate(estate_metrics)
+    best = '' if best is None else f'<div class="box info">{markdown_html(best)}</div>'
+
+    return f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>Laporan Sertifikasi Pemanen - {html.escape(title)}</title>
+<script src="{plotlyjs_src}"></script>
+<style>{PAGE_STYLE}</style>
+</head>
+<body>
+<h1>🌴 Laporan Sertifikasi Pemanen Kelapa Sawit - {html.escape(title)}</h1>
+<p><strong>Perkebunan Nusantara - Digital Transformation Team</strong> · dibuat {datetime.now():%d-%m-%Y %H:%M}</p>
+
+<h2>📊 Ringkasan Performa</h2>
+<div class="cards">{cards}</div>
+
+<h2>📊 Produktivitas</h2>
+<div class="row"><div>{figure_html(productivity['fig_tonnage'])}</div><div>{figure_html(productivity['fig_trees'])}</div></div>
+{figure_html(productivity['fig_scatter'])}
+
+<h2>⭐ Kualitas Panen</h2>
+{figure_html(quality['fig_quality'])}
+<h3>🎯 Penurunan Defects</h3>
+<div class="cards">{defects}</div>
+{figure_html(quality['fig_quality_score'])}
+
+<h2>💰 Dampak Finansial</h2>
+<div class="row"><div>{figure_html(financial['fig_income'])}</div><div>{figure_html(financial['fig_cert_income'])}</div></div>
+<h3>💵 Breakdown Pendapatan</h3>
+<div class="cards">{breakdown}</div>
+
+<h2>🏢 Performa per Estate</h2>
+{figure_html(estate['fig_estate'])}
+{estate_table}
+
+<h2>💡 Insight &amp; Rekomendasi</h2>
+<div class="row">
+<div><h3>✅ Key Findings</h3><div class="box success">{markdown_html(key_findings(kpis))}</div>{best}</div>
+<div><h3>🎯 Rekomendasi Strategis</h3><div class="box warning">{markdown_html(improvement_areas(low_performers))}</div>
+<div class="box info">{markdown_html(NEXT_STEPS)}</div></div>
+</div>
+</body>
+</html>
+"""
+
+
+def init_worker(df, sketch_index):
+    """Hold the dataset in each worker process, so tasks only carry their scope"""
+    global _dataset
+    _dataset = (df, sketch_index)
+
+
+def write_report(title, file_name, selection, output_dir, plotlyjs_src):
+    """Render one scope of the worker's dataset to output_dir; returns (file name, title, row count)"""
+    df, sketch_index = _dataset
+    mask = pd.Series(True, index=df.index)
+    for col, values in selection.items():
+        mask &= df[col].isin(values)
+    rows = df if mask.all() else df[mask]
+
+    # Every scope is a union of whole estate x level cells, so their sketches describe it exactly
+    selections = {col: selection.get(col, pd.unique(df[col].dropna())) for col in sketch_index.cell_columns}
+    sketches = {col: sketch_index.merged(col, selections) for col in SKETCH_COLUMNS}
+
+    with open(os.path.join(output_dir, file_name), 'w', encoding='utf-8') as f:
+        f.write(render_report(title, rows, sketches, plotlyjs_src))
+    return file_name, title, len(rows)
+
+
+def write_index(output_dir, written):
+    """Write index.html linking every generated report"""
+    links = ''.join(
+        f'<li><a href="{file_name}">{html.escape(title)}</a> ({n_rows:,} pemanen)</li>'
+        for file_name, title, n_rows in written
+    )
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html><html lang="id"><head><meta charset="utf-8"><title>Laporan Sertifikasi Pemanen</title>'
+                f'<style>{PAGE_STYLE}</style></head><body><h1>🌴 Laporan Sertifikasi Pemanen</h1><ul>{links}</ul></body></html>')
+
+
+def generate_reports(df, output_dir=DEFAULT_OUTPUT, max_workers=None, offline=False):
+    """Render the group summary and every per-estate and per-level report, fanned out over a process pool"""
+    os.makedirs(output_dir, exist_ok=True)
+    plotlyjs_src = PLOTLYJS_CDN
+    if offline:
+        with open(os.path.join(output_dir, PLOTLYJS_FILE), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+        plotlyjs_src = PLOTLYJS_FILE
+
+    sketch_index = SketchIndex.from_frame(df)
+    tasks = [(title, file_name, selection, output_dir, plotlyjs_src) for title, file_name, selection in report_scopes(df)]
+
+    if not max_workers or max_workers <= 1:
+        init_worker(df, sketch_index)
+        written = [write_report(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                 initargs=(df, sketch_index)) as pool:
+            written = list(pool.map(write_report, *zip(*tasks)))
+
+    write_index(output_dir, written)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render static HTML reports per estate and certification level without a Streamlit server")
+    parser.add_argument('input', nargs='?', help="Harvester data (.csv, .csv.gz or .parquet); dummy data when omitted")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Output directory")
+    parser.add_argument('--rows', type=int, default=50, help="Dummy data rows when no input is given")
+    parser.add_argument('--estates', type=int, default=None, help="Dummy data estates when no input is given")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Process pool size (1 = single process)")
+    parser.add_argument('--offline', action='store_true', help=f"Copy {PLOTLYJS_FILE} next to the reports instead of using the CDN")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = load_dataset(args.input, args.rows, args.estates)
+    written = generate_reports(df, args.output, args.workers, args.offline)
+    print(f"{len(written)} laporan ditulis ke {args.output}/ dalam {time.perf_counter() - start:.1f} detik")
+
+
+if __name__ == "__main__":
+    main()
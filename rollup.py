@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from aggregation import FFB_PRICE, KPI_MEANS, finish_production
+from schema import DEFECT_COLUMNS, LEVEL_COLUMN
+
+# Drill-down levels, top to bottom; Afdeling and Mandor are optional and used when present
+HIERARCHY_COLUMNS = ['Estate', 'Afdeling', 'Mandor']
+
+# Label of workers without a value in an optional hierarchy column
+MISSING_LABEL = '(tanpa)'
+
+# Measures kept per cell as count, sum and sum of squares: name -> column or (column, column) product
+ROLLUP_MEASURES = {
+    **{col: col for col in KPI_MEANS.values()},
+    'Hari_Kerja_Sebelum': 'Hari_Kerja_Sebelum',
+    'Hari_Kerja_Sesudah': 'Hari_Kerja_Sesudah',
+    **{col: col for col in DEFECT_COLUMNS},
+    'prod_before': ('Tonase_Sebelum_kg_per_hari', 'Hari_Kerja_Sebelum'),
+    'prod_after': ('Tonase_Sesudah_kg_per_hari', 'Hari_Kerja_Sesudah')
+}
+
+# Spread and crew statistics shown next to PRODUCTION_COLUMNS at every drill level: column -> (measure, statistic)
+DRILL_STATS = {
+    'Tonase_Sesudah_Rata': ('Tonase_Sesudah_kg_per_hari', 'mean'),
+    'Tonase_Sesudah_Std': ('Tonase_Sesudah_kg_per_hari', 'std'),
+    'Hari_Kerja_Sesudah_Rata': ('Hari_Kerja_Sesudah', 'mean'),
+    'Brondolan_Loss_Sesudah_Rata': ('Brondolan_Loss_Sesudah_pct', 'mean'),
+    'Pendapatan_Sesudah_Rata': ('Pendapatan_Sesudah', 'mean'),
+    'Pendapatan_Sesudah_Std': ('Pendapatan_Sesudah', 'std')
+}
+
+
+def hierarchy_columns(columns):
+    """The HIERARCHY_COLUMNS present in a dataset, top to bottom"""
+    return [col for col in HIERARCHY_COLUMNS if col in columns]
+
+
+def rollup_cells(df):
+    """Worker count plus count, sum and sum of squares of every measure per (hierarchy, level) cell.
+
+    Rows are grouped once; each measure is then added up per cell with a bincount,
+    so only one measure column is materialized at a time.
+    """
+    keys = hierarchy_columns(df.columns) + [LEVEL_COLUMN]
+    grouped = df[keys].groupby(keys, observed=True, sort=False, dropna=False)
+    codes = grouped.ngroup().to_numpy()
+    cells = grouped.size().rename('Jumlah_Pemanen').reset_index()
+    n_cells = len(cells)
+
+    for name, source in ROLLUP_MEASURES.items():
+        if isinstance(source, tuple):
+            values = df[source[0]].to_numpy(dtype='float64') * df[source[1]].to_numpy(dtype='float64')
+        else:
+            values = df[source].to_numpy(dtype='float64')
+        valid = ~np.isnan(values)
+        values = np.where(valid, values, 0.0)
+        cells[f'{name}_n'] = np.bincount(codes, weights=valid.astype('float64'), minlength=n_cells)
+        cells[f'{name}_sum'] = np.bincount(codes, weights=values, minlength=n_cells)
+        cells[f'{name}_sumsq'] = np.bincount(codes, weights=values * values, minlength=n_cells)
+
+    for col in keys:
+        cells[col] = cells[col].astype(object).where(cells[col].notna(), MISSING_LABEL).astype(str)
+    return cells
+
+
+class RollupCube:
+    """Counts, sums and sums of squares per Estate -> Afdeling -> Mandor x Tingkat_Sertifikasi cell.
+
+    Every statistic the drill-down shows is a mean or a standard deviation, both of
+    which follow from the summed count, sum and sum of squares of the selected cells.
+    Drilling into a node or rolling back up is a filter and a group-by over the cells,
+    independent of the number of rows. Cells are in order of first appearance.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.hierarchy = hierarchy_columns(cells.columns)
+        self.keys = {col: cells[col].to_numpy(dtype=object) for col in self.hierarchy + [LEVEL_COLUMN]}
+        self.names = [col for col in cells.columns if col not in self.keys]
+        self.column = {name: j for j, name in enumerate(self.names)}
+        self.sums = cells[self.names].to_numpy(dtype='float64')
+
+    def __len__(self):
+        return len(self.cells)
+
+    def child_column(self, path):
+        """Hierarchy column below the node at path, or None at the lowest level"""
+        return self.hierarchy[len(path)] if len(path) < len(self.hierarchy) else None
+
+    def _selected(self, path, selections):
+        """Boolean mask of the cells under the node at path within the selections"""
+        mask = np.ones(len(self.cells), dtype=bool)
+        for col, values in selections.items():
+            mask &= np.isin(self.keys[col], [str(value) for value in values])
+        for col, value in zip(self.hierarchy, path):
+            mask &= self.keys[col] == str(value)
+        return mask
+
+    def _stat(self, sums, measure, stat):
+        n, total = sums[..., self.column[f'{measure}_n']], sums[..., self.column[f'{measure}_sum']]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / n
+            if stat == 'mean':
+                return mean
+            # Sample standard deviation, as pandas' std; rounding can push the variance just below zero
+            variance = (sums[..., self.column[f'{measure}_sumsq']] - total * mean) / (n - 1)
+            return np.sqrt(np.clip(variance, 0, None))
+
+    def production(self, path, selections, by, ffb_price=FFB_PRICE):
+        """PRODUCTION_COLUMNS and DRILL_STATS per value of by below the node at path"""
+        mask = self._selected(path, selections)
+        # Groups in order of first appearance, as aggregate_production with sort=False
+        codes, groups = pd.factorize(self.keys[by][mask])
+        sums = np.zeros((len(groups), len(self.names)))
+        np.add.at(sums, codes, self.sums[mask])
+        grouped = pd.DataFrame({
+            'Jumlah_Pemanen': sums[:, self.column['Jumlah_Pemanen']].astype('int64'),
+            'prod_before': sums[:, self.column['prod_before_sum']],
+            'prod_after': sums[:, self.column['prod_after_sum']],
+            'Avg_Quality_Before': self._stat(sums, 'Kualitas_Score_Sebelum', 'mean'),
+            'Avg_Quality_After': self._stat(sums, 'Kualitas_Score_Sesudah', 'mean'),
+            **{col: self._stat(sums, measure, stat) for col, (measure, stat) in DRILL_STATS.items()}
+        }, index=pd.Index(groups, name=by))
+        production = finish_production(grouped, ffb_price)
+        return production.join(grouped[list(DRILL_STATS)]).reset_index()
+
+    def children(self, path, selections, ffb_price=FFB_PRICE):
+        """Production rollup of the children of the node at path; per certification level at the lowest level"""
+        return self.production(path, selections, self.child_column(path) or LEVEL_COLUMN, ffb_price)
+
+    def kpis(self, path, selections):
+        """Worker count and KPI means of the node at path, keyed like aggregation.summary_kpis"""
+        sums = self.sums[self._selected(path, selections)].sum(axis=0)
+        kpis = {'count': int(sums[self.column['Jumlah_Pemanen']])}
+        for key, col in KPI_MEANS.items():
+            kpis[key] = float(self._stat(sums, col, 'mean')) if sums[self.column[f'{col}_n']] else np.nan
+        return kpis
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from aggregation import FFB_PRICE, SCENARIO_INPUTS
+
+# Default what-if grid: FFB price (Rp/kg), harvest premium (Rp/kg) and base wage (Rp/day)
+SCENARIO_PRICES = np.arange(2_200, 3_401, 200)
+SCENARIO_PREMIUMS = np.arange(125, 251, 25)
+SCENARIO_WAGES = np.arange(80_000, 105_001, 5_000)
+
+# Reference point of the sensitivity table; the grid value nearest to each is used
+BASE_PREMIUM = 175
+BASE_WAGE = 90_000
+
+# Scenario metrics: label -> (total measure, divide by worker count, display scale)
+SCENARIO_METRICS = {
+    'Dampak Bersih (Rp juta)': ('net_impact', False, 1_000_000),
+    'Dampak Revenue (Rp juta)': ('revenue_impact', False, 1_000_000),
+    'Tambahan Pendapatan Pemanen (Rp ribu/bulan)': ('payroll_gain', True, 1_000),
+    'Pendapatan Sesudah (Rp ribu/bulan)': ('payroll_after', True, 1_000)
+}
+
+SCENARIO_PARAMETERS = ['Harga TBS (Rp/kg)', 'Premi (Rp/kg)', 'Upah Dasar (Rp/hari)']
+
+
+def scenario_inputs(df, by='Estate'):
+    """Per-group worker count, summed work days and summed monthly production (kg) before and after"""
+    work = pd.DataFrame({by: df[by]})
+    for period, suffix in (('Sebelum', 'before'), ('Sesudah', 'after')):
+        days = df[f'Hari_Kerja_{period}'].to_numpy(dtype='float64')
+        work[f'days_{suffix}'] = days
+        work[f'prod_{suffix}'] = df[f'Tonase_{period}_kg_per_hari'].to_numpy(dtype='float64') * days
+    grouped = work.groupby(by, observed=True, sort=False)
+    inputs = grouped.sum()
+    inputs['Jumlah_Pemanen'] = grouped.size()
+    return inputs[SCENARIO_INPUTS]
+
+
+class ScenarioCube:
+    """Revenue impact and harvester pay of every group over a grid of FFB prices, premiums and wages.
+
+    Every measure is linear in the three rates, so the whole grid is one broadcast of
+    the per-group sums against the axes, shaped (groups, prices, premiums, wages).
+    The premium and wage replace the per-worker Premi_per_kg and Upah_Dasar_per_hari,
+    as derive_metrics(base_wage=..., premium_per_kg=...) does. The net impact is the
+    revenue from the production gain minus the extra pay it earns the harvesters.
+    """
+
+    def __init__(self, inputs, prices=SCENARIO_PRICES, premiums=SCENARIO_PREMIUMS, wages=SCENARIO_WAGES):
+        self.groups = list(inputs.index)
+        self.counts = inputs['Jumlah_Pemanen'].to_numpy(dtype='float64')
+        self.axes = [np.asarray(axis, dtype='float64') for axis in (prices, premiums, wages)]
+        price = self.axes[0][None, :, None, None]
+        premium = self.axes[1][None, None, :, None]
+        wage = self.axes[2][None, None, None, :]
+        sums = {col: inputs[col].to_numpy(dtype='float64')[:, None, None, None] for col in SCENARIO_INPUTS[1:]}
+
+        revenue = (sums['prod_after'] - sums['prod_before']) * price
+        pay_before = wage * sums['days_before'] + premium * sums['prod_before']
+        pay_after = wage * sums['days_after'] + premium * sums['prod_after']
+        shape = (len(self.groups),) + tuple(len(axis) for axis in self.axes)
+        self.totals = {
+            'revenue_impact': np.broadcast_to(revenue, shape),
+            'payroll_after': np.broadcast_to(pay_after, shape),
+            'payroll_gain': np.broadcast_to(pay_after - pay_before, shape),
+            'net_impact': revenue - (pay_after - pay_before)
+        }
+
+    def values(self, metric, groups=None):
+        """(prices, premiums, wages) grid of one SCENARIO_METRICS label, over the given groups (all when None)"""
+        measure, per_worker, scale = SCENARIO_METRICS[metric]
+        selected = np.ones(len(self.groups), dtype=bool) if groups is None else np.isin(self.groups, list(groups))
+        total = self.totals[measure][selected].sum(axis=0)
+        if per_worker:
+            count = self.counts[selected].sum()
+            total = total / count if count else np.full_like(total, np.nan)
+        return total / scale
+
+    def heatmap(self, metric, wage, groups=None):
+        """Premium x price frame of one metric at the grid wage nearest to wage"""
+        grid = self.values(metric, groups)[:, :, self._nearest(2, wage)]
+        return pd.DataFrame(grid.T, index=self.axes[1], columns=self.axes[0])
+
+    def _nearest(self, axis, value):
+        return int(np.abs(self.axes[axis] - value).argmin())
+
+    def sensitivity(self, base=(FFB_PRICE, BASE_PREMIUM, BASE_WAGE), groups=None):
+        """Change of every metric across the range of each rate, the other two held at the base point"""
+        point = [self._nearest(axis, value) for axis, value in enumerate(base)]
+        grids = {metric: self.values(metric, groups) for metric in SCENARIO_METRICS}
+        rows = []
+        for axis, parameter in enumerate(SCENARIO_PARAMETERS):
+            low, high = list(point), list(point)
+            low[axis], high[axis] = 0, len(self.axes[axis]) - 1
+            row = {'Parameter': parameter, 'Dari': self.axes[axis][0], 'Sampai': self.axes[axis][-1]}
+            for metric, grid in grids.items():
+                row[metric] = grid[tuple(high)] - grid[tuple(low)]
+            rows.append(row)
+        return pd.DataFrame(rows)
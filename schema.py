@@ -0,0 +1,14 @@
+from derive import PERIODS, QUALITY_WEIGHTS
+
+# Cell every per-cell index is keyed by and the sidebar filters select: estate x certification level
+ESTATE_COLUMN = 'Estate'
+LEVEL_COLUMN = 'Tingkat_Sertifikasi'
+CELL_COLUMNS = [ESTATE_COLUMN, LEVEL_COLUMN]
+
+CERTIFICATION_LEVELS = ['Dasar', 'Madya', 'Mahir']
+
+# Tonnage improvement, the range the sidebar threshold filters on
+IMPROVEMENT_COLUMN = 'Peningkatan_Tonase_pct'
+
+# Defect percentages per period, e.g. Brondolan_Loss_Sebelum_pct
+DEFECT_COLUMNS = [f'{defect}_{period}_pct' for period in PERIODS for defect in QUALITY_WEIGHTS]
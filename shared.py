@@ -0,0 +1,70 @@
+import threading
+
+
+class SharedDatasets:
+    """Process-wide registry of loaded datasets, shared read-only by all sessions.
+
+    Each session references at most one dataset. A dataset is loaded once however
+    many sessions ask for it concurrently, and dropped as soon as the last session
+    referencing it moves to another dataset or goes away, so memory follows the
+    datasets in use rather than the number of open sessions. Callers must treat
+    the shared values as immutable.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._datasets = {}
+        self._refs = {}
+        self._sessions = {}
+        self._loading = {}
+
+    def acquire(self, session_id, dataset_key, load):
+        """Return the dataset for dataset_key, calling load() only if no session holds it yet"""
+        with self._lock:
+            if dataset_key in self._datasets:
+                return self._hold(session_id, dataset_key)
+            loading = self._loading.setdefault(dataset_key, threading.Lock())
+
+        # One loader per key; sessions asking for the same key wait for it instead of loading again
+        with loading:
+            with self._lock:
+                if dataset_key in self._datasets:
+                    return self._hold(session_id, dataset_key)
+            value = load()
+            with self._lock:
+                self._datasets[dataset_key] = value
+                self._loading.pop(dataset_key, None)
+                return self._hold(session_id, dataset_key)
+
+    def _hold(self, session_id, dataset_key):
+        previous = self._sessions.get(session_id)
+        if previous != dataset_key:
+            self._refs[dataset_key] = self._refs.get(dataset_key, 0) + 1
+            self._sessions[session_id] = dataset_key
+            if previous is not None:
+                self._unref(previous)
+        return self._datasets[dataset_key]
+
+    def _unref(self, dataset_key):
+        self._refs[dataset_key] -= 1
+        if self._refs[dataset_key] == 0:
+            del self._refs[dataset_key]
+            self._datasets.pop(dataset_key, None)
+
+    def release(self, session_id):
+        """Drop the session's reference, evicting its dataset if no other session uses it"""
+        with self._lock:
+            dataset_key = self._sessions.pop(session_id, None)
+            if dataset_key is not None:
+                self._unref(dataset_key)
+
+    def prune(self, is_active):
+        """Release the references of every session for which is_active(session_id) is false"""
+        with self._lock:
+            for session_id in [s for s in self._sessions if not is_active(s)]:
+                self._unref(self._sessions.pop(session_id))
+
+    def stats(self):
+        """Return the number of referencing sessions per loaded dataset"""
+        with self._lock:
+            return dict(self._refs)
@@ -0,0 +1,180 @@
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from schema import CELL_COLUMNS
+
+# Before/after column pairs tested for a change, by display label
+METRIC_PAIRS = {
+    'Tonase (kg/hari)': ('Tonase_Sebelum_kg_per_hari', 'Tonase_Sesudah_kg_per_hari'),
+    'Jumlah Pokok': ('Jumlah_Pokok_Sebelum', 'Jumlah_Pokok_Sesudah'),
+    'Brondolan Loss (%)': ('Brondolan_Loss_Sebelum_pct', 'Brondolan_Loss_Sesudah_pct'),
+    'Buah Mentah (%)': ('Buah_Mentah_Sebelum_pct', 'Buah_Mentah_Sesudah_pct'),
+    'Buah Busuk (%)': ('Buah_Busuk_Sebelum_pct', 'Buah_Busuk_Sesudah_pct'),
+    'Gagang Panjang (%)': ('Gagang_Panjang_Sebelum_pct', 'Gagang_Panjang_Sesudah_pct'),
+    'Skor Kualitas': ('Kualitas_Score_Sebelum', 'Kualitas_Score_Sesudah'),
+    'Pendapatan (Rp)': ('Pendapatan_Sebelum', 'Pendapatan_Sesudah')
+}
+
+N_BOOTSTRAP = 1000
+CONFIDENCE = 0.95
+
+# Above this many workers a cell's bootstrap distribution of the mean is
+# indistinguishable from the normal approximation, which is used instead
+BOOTSTRAP_MAX_ROWS = 20_000
+
+# Resampling weights generated at once (replicates x rows), bounding memory per batch
+BOOTSTRAP_CHUNK_ELEMENTS = 4_000_000
+
+# Cells resampled together; batches are the unit of work for the process pool and each
+# has its own seed, so results don't depend on the number of workers
+CELLS_PER_BATCH = 32
+
+# Poisson(1) quantile table: indexing it with uniform 16-bit integers draws Poisson
+# bootstrap weights several times faster than Generator.poisson
+POISSON_WEIGHTS = stats.poisson.ppf((np.arange(65536) + 0.5) / 65536, 1)
+
+
+def normal_ci(diffs, confidence=CONFIDENCE):
+    """Normal-approximation CI of the mean of each column of diffs"""
+    z = stats.norm.ppf(1 - (1 - confidence) / 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(diffs, axis=0)
+        se = np.nanstd(diffs, axis=0, ddof=1) / np.sqrt((~np.isnan(diffs)).sum(axis=0))
+    return mean - z * se, mean + z * se
+
+
+def bootstrap_cis(cells, rng, n_boot=N_BOOTSTRAP, confidence=CONFIDENCE):
+    """Percentile CIs of the column means of several cells' difference matrices.
+
+    Poisson bootstrap: a replicate is a row of Poisson(1) weights, so the replicate
+    means of every metric come out of one matrix product. The cells of a batch share
+    one weight matrix (each uses its first len(cell) columns); their intervals are
+    individually valid, only correlated with each other.
+    """
+    n_max = max(len(diffs) for diffs in cells)
+    filled = [np.where(np.isnan(diffs), 0.0, diffs) for diffs in cells]
+    # Without missing values the per-metric weight totals are just the row sums
+    valid = [(~np.isnan(diffs)).astype('float64') if np.isnan(diffs).any() else None for diffs in cells]
+    means = [np.empty((n_boot, diffs.shape[1])) for diffs in cells]
+
+    chunk = max(1, BOOTSTRAP_CHUNK_ELEMENTS // n_max)
+    for start in range(0, n_boot, chunk):
+        stop = min(start + chunk, n_boot)
+        draws = rng.integers(0, len(POISSON_WEIGHTS), size=(stop - start, n_max), dtype=np.uint16)
+        weights = POISSON_WEIGHTS[draws]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for i, diffs in enumerate(cells):
+                w = weights[:, :len(diffs)]
+                totals = w.sum(axis=1)[:, None] if valid[i] is None else w @ valid[i]
+                means[i][start:stop] = (w @ filled[i]) / totals
+
+    alpha = 1 - confidence
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return [np.nanquantile(m, [alpha / 2, 1 - alpha / 2], axis=0) for m in means]
+
+
+def cell_batch_tests(cells, seed, n_boot=N_BOOTSTRAP, confidence=CONFIDENCE):
+    """Wilcoxon signed-rank tests and CIs for a batch of (rows x metrics) difference matrices"""
+    results = []
+    resampled = []
+    for diffs in cells:
+        if len(diffs) < 2:
+            empty = np.full(diffs.shape[1], np.nan)
+            results.append([empty, empty, empty, empty, 'n/a'])
+            continue
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            warnings.simplefilter('ignore')
+            wilcoxon = stats.wilcoxon(diffs, axis=0, nan_policy='omit')
+        result = [np.asarray(wilcoxon.statistic, dtype='float64'), np.asarray(wilcoxon.pvalue, dtype='float64')]
+        if len(diffs) > BOOTSTRAP_MAX_ROWS:
+            result += [*normal_ci(diffs, confidence), 'normal']
+        else:
+            result += [None, None, 'bootstrap']
+            resampled.append(len(results))
+        results.append(result)
+
+    if resampled:
+        cis = bootstrap_cis([cells[i] for i in resampled], np.random.default_rng(seed), n_boot, confidence)
+        for i, (low, high) in zip(resampled, cis):
+            results[i][2:4] = low, high
+    return results
+
+
+def paired_effects(df, by=CELL_COLUMNS, metrics=METRIC_PAIRS, n_boot=N_BOOTSTRAP, confidence=CONFIDENCE,
+                   seed=0, max_workers=None):
+    """Paired t-test, Wilcoxon test and bootstrap CI of the mean change, per cell and metric"""
+    by = list(by)
+    metrics = {label: cols for label, cols in metrics.items() if all(col in df.columns for col in cols)}
+    before = np.column_stack([df[col].to_numpy(dtype='float64') for col, _ in metrics.values()])
+    after = np.column_stack([df[col].to_numpy(dtype='float64') for _, col in metrics.values()])
+    diffs = after - before
+
+    if by:
+        grouped = df.groupby(by, observed=True, sort=True)
+        codes = grouped.ngroup().to_numpy()
+        cells = grouped.size().index.to_frame(index=False)
+        # Rows with a missing key belong to no cell (NaN code), as in ranking.group_positions
+        rows = np.flatnonzero(codes >= 0)
+        codes = codes[rows].astype(np.int64)
+        before, after, diffs = before[rows], after[rows], diffs[rows]
+    else:
+        codes = np.zeros(len(df), dtype=np.int64)
+        cells = pd.DataFrame(index=range(1))
+    n_cells = len(cells)
+
+    # Paired t-tests for all cells at once from grouped moments (two passes for stable variances)
+    valid = ~np.isnan(diffs)
+    count = np.empty((n_cells, len(metrics)))
+    mean = np.empty_like(count)
+    mean_before = np.empty_like(count)
+    mean_after = np.empty_like(count)
+    var = np.empty_like(count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for j in range(len(metrics)):
+            cell = codes[valid[:, j]]
+            count[:, j] = np.bincount(cell, minlength=n_cells)
+            mean[:, j] = np.bincount(cell, weights=diffs[valid[:, j], j], minlength=n_cells) / count[:, j]
+            mean_before[:, j] = np.bincount(cell, weights=before[valid[:, j], j], minlength=n_cells) / count[:, j]
+            mean_after[:, j] = np.bincount(cell, weights=after[valid[:, j], j], minlength=n_cells) / count[:, j]
+            deviation = diffs[valid[:, j], j] - mean[cell, j]
+            var[:, j] = np.bincount(cell, weights=deviation ** 2, minlength=n_cells) / (count[:, j] - 1)
+        t_stat = mean / np.sqrt(var / count)
+        t_stat[(count < 2) | (var == 0)] = np.nan
+        t_pvalue = 2 * stats.t.sf(np.abs(t_stat), count - 1)
+
+    # Rank tests and resampling per batch of cells, each batch with its own reproducible seed
+    order = np.argsort(codes, kind='stable')
+    bounds = np.cumsum(np.bincount(codes, minlength=n_cells))[:-1]
+    cell_diffs = np.split(diffs[order], bounds)
+    batches = [cell_diffs[i:i + CELLS_PER_BATCH] for i in range(0, n_cells, CELLS_PER_BATCH)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    n_repeat = [n_boot] * len(batches)
+    confidences = [confidence] * len(batches)
+    if max_workers and max_workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            batch_results = list(pool.map(cell_batch_tests, batches, seeds, n_repeat, confidences))
+    else:
+        batch_results = list(map(cell_batch_tests, batches, seeds, n_repeat, confidences))
+    results = [result for batch in batch_results for result in batch]
+
+    # One row per (cell, metric)
+    labels = list(metrics)
+    rows = cells.loc[cells.index.repeat(len(labels))].reset_index(drop=True)
+    rows['Metrik'] = labels * n_cells
+    rows['n'] = count.ravel().astype('int64')
+    rows['Sebelum'] = mean_before.ravel()
+    rows['Sesudah'] = mean_after.ravel()
+    rows['Selisih'] = mean.ravel()
+    rows['CI_Bawah'] = np.concatenate([result[2] for result in results])
+    rows['CI_Atas'] = np.concatenate([result[3] for result in results])
+    rows['t'] = t_stat.ravel()
+    rows['p_t'] = t_pvalue.ravel()
+    rows['W'] = np.concatenate([result[0] for result in results])
+    rows['p_wilcoxon'] = np.concatenate([result[1] for result in results])
+    rows['Metode_CI'] = np.repeat([result[4] for result in results], len(labels))
+    return rows
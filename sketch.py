@@ -0,0 +1,241 @@
+import math
+
+import numpy as np
+
+from schema import CELL_COLUMNS
+
+# Quantile values are returned within this relative error
+RELATIVE_ACCURACY = 0.01
+
+# Values closer to zero than this share the zero bucket
+MIN_INDEXABLE = 1e-6
+
+# Columns sketched per cell
+SKETCH_COLUMNS = [
+    'Peningkatan_Tonase_pct',
+    'Tonase_Sebelum_kg_per_hari', 'Tonase_Sesudah_kg_per_hari',
+    'Jumlah_Pokok_Sebelum', 'Jumlah_Pokok_Sesudah',
+    'Pendapatan_Sebelum', 'Pendapatan_Sesudah'
+]
+
+
+def _fraction_below(threshold, low, high):
+    """Share of each bucket [low, high] below threshold, assuming values spread evenly inside it"""
+    width = high - low
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = np.where(width > 0, (threshold - low) / width, (threshold > low).astype('float64'))
+    return fraction.clip(0, 1)
+
+
+def _add_counts(offset, counts, keys):
+    """Add bucket keys to a dense (offset, counts) store, growing it as needed"""
+    if len(keys) == 0:
+        return offset, counts
+    low, high = int(keys.min()), int(keys.max())
+    if counts is None:
+        offset, counts = low, np.zeros(high - low + 1)
+    elif low < offset or high >= offset + len(counts):
+        new_offset = min(low, offset)
+        grown = np.zeros(max(high, offset + len(counts) - 1) - new_offset + 1)
+        grown[offset - new_offset:offset - new_offset + len(counts)] = counts
+        offset, counts = new_offset, grown
+    counts += np.bincount(keys - offset, minlength=len(counts))
+    return offset, counts
+
+
+def _merge_counts(offset, counts, other_offset, other_counts):
+    if other_counts is None:
+        return offset, counts
+    if counts is None:
+        return other_offset, other_counts.copy()
+    new_offset = min(offset, other_offset)
+    merged = np.zeros(max(offset + len(counts), other_offset + len(other_counts)) - new_offset)
+    merged[offset - new_offset:offset - new_offset + len(counts)] += counts
+    merged[other_offset - new_offset:other_offset - new_offset + len(other_counts)] += other_counts
+    return new_offset, merged
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with relative-error guarantees (DDSketch-style log buckets).
+
+    Each value is counted in the bucket ceil(log_gamma(|x|)), so any quantile is
+    answered within RELATIVE_ACCURACY of the true value. Sketches of disjoint row
+    sets merge exactly by adding bucket counts, and appending rows only touches
+    the buckets of the new values.
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = (0, None)
+        self.negative = (0, None)
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _keys(self, magnitudes):
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def _values(self, keys):
+        """Bucket representatives, within relative_accuracy of every value in the bucket"""
+        return 2 * self.gamma ** keys.astype('float64') / (self.gamma + 1)
+
+    def _edges(self, keys, sign):
+        """Value range covered by buckets of the positive (sign 1) or negative (sign -1) store"""
+        upper = self.gamma ** keys.astype('float64')
+        lower = upper / self.gamma
+        low, high = (lower, upper) if sign > 0 else (-upper, -lower)
+        return low.clip(self.min, self.max), high.clip(self.min, self.max)
+
+    def _stores(self):
+        """(sign, offset, counts) of the non-empty negative and positive stores"""
+        return [(sign, offset, counts) for sign, (offset, counts) in ((-1, self.negative), (1, self.positive))
+                if counts is not None]
+
+    def add(self, values):
+        """Add an array of values; NaNs are ignored"""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        positive = values[values > MIN_INDEXABLE]
+        negative = -values[values < -MIN_INDEXABLE]
+        self.zero_count += len(values) - len(positive) - len(negative)
+        self.positive = _add_counts(*self.positive, self._keys(positive))
+        self.negative = _add_counts(*self.negative, self._keys(negative))
+        return self
+
+    def merge(self, other):
+        """Fold another sketch with the same accuracy into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Sketches with different accuracies cannot be merged")
+        self.positive = _merge_counts(*self.positive, *other.positive)
+        self.negative = _merge_counts(*self.negative, *other.negative)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def bucket_table(self):
+        """Non-empty buckets in ascending order: representatives, counts and value ranges"""
+        parts = []
+        for sign, offset, counts in self._stores():
+            keys = np.flatnonzero(counts > 0)
+            if sign < 0:
+                keys = keys[::-1]
+            parts.append((sign * self._values(keys + offset), counts[keys], *self._edges(keys + offset, sign)))
+            if sign < 0 and self.zero_count:
+                parts.append(self._zero_bucket())
+        if self.zero_count and self.negative[1] is None:
+            parts.insert(0, self._zero_bucket())
+        if not parts:
+            return tuple(np.zeros(0) for _ in range(4))
+        return tuple(np.concatenate([part[i] for part in parts]) for i in range(4))
+
+    def _zero_bucket(self):
+        low, high = np.clip([-MIN_INDEXABLE, MIN_INDEXABLE], self.min, self.max)
+        return np.zeros(1), np.array([float(self.zero_count)]), np.array([low]), np.array([high])
+
+    def buckets(self):
+        """Non-empty bucket representatives in ascending order and their counts"""
+        values, counts, _, _ = self.bucket_table()
+        return values, counts
+
+    def quantiles(self, qs):
+        """Approximate quantiles, interpolated inside their bucket; NaN for an empty sketch"""
+        qs = np.atleast_1d(np.asarray(qs, dtype='float64'))
+        if self.count <= 0:
+            return np.full(len(qs), np.nan)
+        _, counts, low, high = self.bucket_table()
+        cumulative = np.cumsum(counts)
+        ranks = qs * (self.count - 1)
+        index = np.searchsorted(cumulative, ranks, side='right').clip(max=len(counts) - 1)
+        into = (ranks - (cumulative[index] - counts[index])) / counts[index]
+        return (low[index] + into.clip(0, 1) * (high[index] - low[index])).clip(self.min, self.max)
+
+    def quantile(self, q):
+        return float(self.quantiles([q])[0])
+
+    def count_below(self, threshold):
+        """Approximate number of values below threshold, interpolating inside its bucket"""
+        _, counts, low, high = self.bucket_table()
+        return float((counts * _fraction_below(threshold, low, high)).sum())
+
+    def truncated(self, lower):
+        """Approximate sketch of the values >= lower; the bucket holding lower keeps its share above it"""
+        result = QuantileSketch(self.relative_accuracy)
+        if self.count <= 0:
+            return result
+        for sign, offset, counts in self._stores():
+            low, high = self._edges(np.arange(len(counts)) + offset, sign)
+            store = (offset, counts * (1 - _fraction_below(lower, low, high)))
+            if sign > 0:
+                result.positive = store
+            else:
+                result.negative = store
+        zero_edges = np.clip([-MIN_INDEXABLE, MIN_INDEXABLE], self.min, self.max)
+        result.zero_count = self.zero_count * (1 - float(_fraction_below(lower, *zero_edges)))
+
+        values, counts = result.buckets()
+        result.count = float(counts.sum())
+        if result.count:
+            result.sum = float((values * counts).sum())
+            result.min = max(self.min, lower)
+            result.max = self.max
+        return result
+
+
+class SketchIndex:
+    """Quantile sketches per (Estate, Tingkat_Sertifikasi) cell and column, built once per dataset.
+
+    Built with from_frame. A daily-mode append changes the before/after rows of the
+    workers it touches rather than adding rows, so the index is rebuilt per store
+    version instead of folding batches into the existing sketches.
+    """
+
+    def __init__(self, columns=SKETCH_COLUMNS, cell_columns=CELL_COLUMNS, relative_accuracy=RELATIVE_ACCURACY):
+        self.columns = columns
+        self.cell_columns = cell_columns
+        self.relative_accuracy = relative_accuracy
+        self.cells = {}
+
+    def merged(self, column, selections):
+        """Merge the sketches of every cell whose values are all selected, e.g. {'Estate': [...], ...}"""
+        chosen = [set(selections[col]) for col in self.cell_columns]
+        result = QuantileSketch(self.relative_accuracy)
+        for key, sketches in self.cells.items():
+            if column in sketches and all(value in allowed for value, allowed in zip(key, chosen)):
+                result.merge(sketches[column])
+        return result
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        """Sketch every column of every cell of df"""
+        index = cls(**kwargs)
+        columns = [col for col in index.columns if col in df.columns]
+        if len(df) == 0 or not columns:
+            return index
+        grouped = df.groupby(index.cell_columns, observed=True, sort=False)
+        codes = grouped.ngroup().to_numpy()
+        keys = list(grouped.size().index)
+        # Rows with a missing key have a NaN code and belong to no cell
+        rows = np.flatnonzero(codes >= 0)
+        codes = codes[rows].astype(np.int64)
+        rows = rows[np.argsort(codes, kind='stable')]
+        bounds = np.cumsum(np.bincount(codes, minlength=len(keys)))[:-1]
+        values = {col: df[col].to_numpy(dtype='float64') for col in columns}
+        for key, positions in zip(keys, np.split(rows, bounds)):
+            index.cells[key] = {
+                col: QuantileSketch(index.relative_accuracy).add(values[col][positions]) for col in columns
+            }
+        return index
@@ -0,0 +1,351 @@
+import logging
+import math
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from aggregation import FFB_PRICE, KPI_MEANS, SCENARIO_INPUTS, finish_production
+from cohort import COHORT_COLUMN, COHORT_DATE_COLUMN, COHORT_METRICS, empty_cohort_cells
+from ingest import CATEGORICAL_COLUMNS, build_csv_schema, content_hash
+from ranking import RANK_COLUMN
+from rollup import HIERARCHY_COLUMNS, MISSING_LABEL, ROLLUP_MEASURES
+from schema import ESTATE_COLUMN, IMPROVEMENT_COLUMN, LEVEL_COLUMN
+
+logger = logging.getLogger(__name__)
+
+# Layout version kept in SQLite's user_version; 2 = one table per dataset
+SCHEMA_VERSION = 2
+
+# Prefix of the tables holding one row per worker of a dataset, in the dashboard's schema
+TABLE = 'pemanen'
+
+# Datasets kept on disk; the least recently used beyond this are dropped once no session reads them
+MAX_STORED_DATASETS = 4
+
+# Rows written per INSERT batch when loading a dataset
+LOAD_CHUNK_ROWS = 50_000
+
+
+def table_name(dataset_key):
+    """Name of the table holding the dataset with dataset_key"""
+    return f'{TABLE}_{content_hash(str(dataset_key).encode())}'
+
+
+class AnalyticalStore:
+    """On-disk SQLite store of harvester datasets, shared by every session.
+
+    Each dataset gets its own table, named from its dataset key and never modified
+    once loaded, so a session only ever reads the dataset it asked for, whatever
+    other sessions load in the meantime. Sessions hold the dataset they read, like
+    SharedDatasets; beyond max_datasets the least recently used datasets that no
+    active session holds are dropped. Queries go through the StoredDataset that
+    acquire() returns. A new connection is opened per call, which keeps the store
+    safe to use from Streamlit's threads.
+    """
+
+    def __init__(self, path, max_datasets=MAX_STORED_DATASETS):
+        self.path = path
+        self.max_datasets = max_datasets
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._datasets = {}
+        con = self._connect()
+        try:
+            with con:
+                if con.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                    self._migrate(con)
+                con.execute('CREATE TABLE IF NOT EXISTS datasets '
+                            '(dataset_key TEXT PRIMARY KEY, table_name TEXT NOT NULL, last_used REAL NOT NULL)')
+                con.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        finally:
+            con.close()
+
+    def _migrate(self, con):
+        """Drop the single-table layout of earlier versions (one pemanen table plus meta), if present"""
+        legacy = [name for (name,) in con.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, 'meta')", (TABLE,))]
+        if legacy:
+            logger.warning("Migrating store %s to one table per dataset; dropping legacy tables %s",
+                           self.path, ', '.join(legacy))
+            for name in legacy:
+                con.execute(f'DROP TABLE {name}')
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def _query(self, sql, params=()):
+        con = self._connect()
+        try:
+            return pd.read_sql_query(sql, con, params=params)
+        finally:
+            con.close()
+
+    def _execute(self, sql, params=()):
+        con = self._connect()
+        try:
+            with con:
+                con.execute(sql, params)
+        finally:
+            con.close()
+
+    def has(self, dataset_key):
+        """Whether the dataset with dataset_key is stored"""
+        return len(self._query('SELECT 1 FROM datasets WHERE dataset_key = ?', [dataset_key])) > 0
+
+    def latest(self):
+        """Key of the most recently loaded or opened dataset, or None when the store is empty"""
+        keys = self._query('SELECT dataset_key FROM datasets ORDER BY last_used DESC LIMIT 1')['dataset_key']
+        return keys.iloc[0] if len(keys) else None
+
+    def load(self, df, dataset_key):
+        """Store df as a new dataset; a no-op when dataset_key is already stored"""
+        with self._lock:
+            if self.has(dataset_key):
+                return False
+            table = table_name(dataset_key)
+            con = self._connect()
+            try:
+                with con:
+                    # Leftover of an interrupted load; the dataset is only listed once complete
+                    con.execute(f'DROP TABLE IF EXISTS {table}')
+                    df.to_sql(table, con, index=False, chunksize=LOAD_CHUNK_ROWS)
+                    con.execute(f'CREATE INDEX idx_{table}_filter ON {table} ({ESTATE_COLUMN}, {LEVEL_COLUMN})')
+                    con.execute(f'CREATE INDEX idx_{table}_range ON {table} ({IMPROVEMENT_COLUMN})')
+                    con.execute('INSERT INTO datasets VALUES (?, ?, ?)', (dataset_key, table, time.time()))
+                con.execute(f'ANALYZE {table}')
+            finally:
+                con.close()
+            return True
+
+    def acquire(self, session_id, dataset_key, is_active=lambda session_id: True):
+        """Hold dataset_key for the session and return its StoredDataset"""
+        with self._lock:
+            if self._sessions.get(session_id) != dataset_key:
+                self._sessions[session_id] = dataset_key
+                self._execute('UPDATE datasets SET last_used = ? WHERE dataset_key = ?', (time.time(), dataset_key))
+            self._prune(is_active)
+            dataset = self._datasets.get(dataset_key)
+            if dataset is None:
+                dataset = self._datasets[dataset_key] = StoredDataset(self, table_name(dataset_key))
+            return dataset
+
+    def _prune(self, is_active):
+        """Drop the least recently used datasets beyond max_datasets that no active session holds"""
+        self._sessions = {s: key for s, key in self._sessions.items() if is_active(s)}
+        held = set(self._sessions.values())
+        stored = self._query('SELECT dataset_key, table_name FROM datasets ORDER BY last_used DESC')
+        for dataset_key, table in stored.iloc[self.max_datasets:].itertuples(index=False):
+            if dataset_key in held:
+                continue
+            self._execute(f'DROP TABLE IF EXISTS {table}')
+            self._execute('DELETE FROM datasets WHERE dataset_key = ?', (dataset_key,))
+            self._datasets.pop(dataset_key, None)
+
+
+class StoredDataset:
+    """Queries over one stored dataset's table.
+
+    The sidebar filters are translated into a WHERE clause, and KPI means, the
+    estate production rollup, per-group top/bottom-k rankings and the
+    low-performer count run as SQL, so only small results are brought back into
+    pandas.
+    """
+
+    def __init__(self, store, table):
+        self.table = table
+        self._query = store._query
+        self._bounds = None
+
+    def _filter_bounds(self):
+        """Options and value range of the dataset, memoized since the table never changes"""
+        if self._bounds is None:
+            options = {
+                col: self._query(f'SELECT {col} FROM {self.table} GROUP BY {col} ORDER BY MIN(rowid)')[col].tolist()
+                for col in (ESTATE_COLUMN, LEVEL_COLUMN)
+            }
+            low, high = self._query(f'SELECT MIN({IMPROVEMENT_COLUMN}), MAX({IMPROVEMENT_COLUMN}) FROM {self.table}').iloc[0]
+            value_range = (0.0, 0.0) if pd.isna(low) else (float(low), float(high))
+            self._bounds = (options, value_range)
+        return self._bounds
+
+    def options(self):
+        """Distinct Estate and Tingkat_Sertifikasi values in order of first appearance"""
+        return self._filter_bounds()[0]
+
+    def value_range(self):
+        """Return the (min, max) of Peningkatan_Tonase_pct, ignoring NULLs"""
+        return self._filter_bounds()[1]
+
+    def _where(self, estates, levels, min_improvement=None):
+        """Build the WHERE clause and parameters for the sidebar filters"""
+        options, (low, _) = self._filter_bounds()
+        clauses = ['1']
+        params = []
+        for col, selected in ((ESTATE_COLUMN, estates), (LEVEL_COLUMN, levels)):
+            selected = [str(value) for value in dict.fromkeys(selected)]
+            if not selected:
+                return 'WHERE 0', []
+            # A filter that keeps every value is dropped so SQLite can scan instead of probing the index
+            if set(selected) >= set(options[col]):
+                continue
+            clauses.append(f'{col} IN ({", ".join("?" * len(selected))})')
+            params += selected
+        if min_improvement is not None and min_improvement > low:
+            clauses.append(f'{IMPROVEMENT_COLUMN} >= ?')
+            params.append(float(min_improvement))
+        return 'WHERE ' + ' AND '.join(clauses), params
+
+    def kpis(self, estates, levels, min_improvement=None):
+        """Worker count and KPI means for the filtered rows, keyed like aggregation.summary_kpis"""
+        where, params = self._where(estates, levels, min_improvement)
+        means = ', '.join(f'AVG({col}) AS {key}' for key, col in KPI_MEANS.items())
+        row = self._query(f'SELECT COUNT(*) AS count, {means} FROM {self.table} {where}', params).iloc[0]
+        kpis = {key: float(value) if pd.notna(value) else float('nan') for key, value in row.items()}
+        kpis['count'] = int(row['count'])
+        return kpis
+
+    def estate_production(self, estates, levels, min_improvement=None, ffb_price=FFB_PRICE):
+        """Estate production rollup of the filtered rows, matching calculate_estate_production"""
+        where, params = self._where(estates, levels, min_improvement)
+        grouped = self._query(f"""
+            SELECT {ESTATE_COLUMN},
+                   COUNT(*) AS Jumlah_Pemanen,
+                   SUM(Tonase_Sebelum_kg_per_hari * Hari_Kerja_Sebelum) AS prod_before,
+                   SUM(Tonase_Sesudah_kg_per_hari * Hari_Kerja_Sesudah) AS prod_after,
+                   AVG(Kualitas_Score_Sebelum) AS Avg_Quality_Before,
+                   AVG(Kualitas_Score_Sesudah) AS Avg_Quality_After
+            FROM {self.table} {where}
+            GROUP BY {ESTATE_COLUMN}
+            ORDER BY MIN(rowid)
+        """, params).set_index(ESTATE_COLUMN)
+        return finish_production(grouped, ffb_price).reset_index()
+
+    def scenario_inputs(self, estates, levels, min_improvement=None):
+        """Per-estate inputs of the scenario sweep for the filtered rows, matching scenario.scenario_inputs"""
+        where, params = self._where(estates, levels, min_improvement)
+        return self._query(f"""
+            SELECT {ESTATE_COLUMN},
+                   COUNT(*) AS Jumlah_Pemanen,
+                   SUM(Hari_Kerja_Sebelum) AS days_before,
+                   SUM(Hari_Kerja_Sesudah) AS days_after,
+                   SUM(Tonase_Sebelum_kg_per_hari * Hari_Kerja_Sebelum) AS prod_before,
+                   SUM(Tonase_Sesudah_kg_per_hari * Hari_Kerja_Sesudah) AS prod_after
+            FROM {self.table} {where}
+            GROUP BY {ESTATE_COLUMN}
+            ORDER BY MIN(rowid)
+        """, params).set_index(ESTATE_COLUMN)[SCENARIO_INPUTS]
+
+    def _has_column(self, column):
+        return column in self._query(f'SELECT * FROM {self.table} LIMIT 0').columns
+
+    def cohort_cells(self, estates, levels, min_improvement=None):
+        """Cohort cells of the filtered rows in one GROUP BY, matching cohort.cohort_cells"""
+        if not self._has_column(COHORT_DATE_COLUMN):
+            return empty_cohort_cells()
+        where, params = self._where(estates, levels, min_improvement)
+        sums = []
+        for key, (_, source) in COHORT_METRICS.items():
+            expression = f'({source[0]} - {source[1]})' if isinstance(source, tuple) else source
+            sums.append(f'COALESCE(SUM({expression}), 0) AS {key}, COUNT({expression}) AS {key}_n')
+        cells = self._query(f"""
+            SELECT SUBSTR({COHORT_DATE_COLUMN}, 1, 7) || '-01' AS {COHORT_COLUMN},
+                   {ESTATE_COLUMN}, {LEVEL_COLUMN},
+                   COUNT(*) AS Jumlah_Pemanen,
+                   {", ".join(sums)}
+            FROM {self.table} {where} AND {COHORT_DATE_COLUMN} IS NOT NULL
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+        """, params)
+        if cells.empty:
+            return empty_cohort_cells()
+        cells[COHORT_COLUMN] = pd.to_datetime(cells[COHORT_COLUMN])
+        return cells
+
+    def cohort_reference(self):
+        """Month of the latest certification in the whole dataset, or None without dates"""
+        if not self._has_column(COHORT_DATE_COLUMN):
+            return None
+        latest = self._query(f'SELECT MAX({COHORT_DATE_COLUMN}) AS latest FROM {self.table}')['latest'].iloc[0]
+        return None if latest is None else pd.Timestamp(latest).to_period('M').to_timestamp()
+
+    def rollup_cells(self, estates, levels, min_improvement=None):
+        """Rollup cube cells of the filtered rows in one GROUP BY, matching rollup.rollup_cells"""
+        hierarchy = [col for col in HIERARCHY_COLUMNS if self._has_column(col)]
+        where, params = self._where(estates, levels, min_improvement)
+        keys = [f"COALESCE({col}, '{MISSING_LABEL}') AS {col}" for col in hierarchy] + [LEVEL_COLUMN]
+        sums = []
+        for name, source in ROLLUP_MEASURES.items():
+            expression = f'({source[0]} * {source[1]})' if isinstance(source, tuple) else source
+            sums.append(f'COUNT({expression}) AS {name}_n, COALESCE(SUM({expression}), 0) AS {name}_sum, '
+                        f'COALESCE(SUM({expression} * {expression}), 0) AS {name}_sumsq')
+        return self._query(f"""
+            SELECT {", ".join(keys)},
+                   COUNT(*) AS Jumlah_Pemanen,
+                   {", ".join(sums)}
+            FROM {self.table} {where}
+            GROUP BY {", ".join(str(i) for i in range(1, len(keys) + 1))}
+            ORDER BY MIN(rowid)
+        """, params).astype({col: str for col in hierarchy + [LEVEL_COLUMN]})
+
+    def top_k(self, estates, levels, min_improvement, metric, columns, k=10, by=None, largest=True):
+        """Top (or bottom) k filtered rows by metric within each group, ranked by a window function like ranking.top_k"""
+        where, params = self._where(estates, levels, min_improvement)
+        by = [] if by is None else [by] if isinstance(by, str) else list(by)
+        columns = [col for col in columns if col not in by]
+        partition = f'PARTITION BY {", ".join(by)} ' if by else ''
+        direction = 'DESC' if largest else 'ASC'
+        return self._query(f"""
+            SELECT {", ".join(by + [RANK_COLUMN] + columns)} FROM (
+                SELECT *, ROW_NUMBER() OVER ({partition}ORDER BY {metric} {direction}, rowid) AS {RANK_COLUMN}
+                FROM {self.table}
+                {where} AND {metric} IS NOT NULL
+            )
+            WHERE {RANK_COLUMN} <= ?
+            ORDER BY {", ".join(by + [RANK_COLUMN])}
+        """, params + [k])
+
+    def count_below_quantile(self, estates, levels, min_improvement, column, q):
+        """Count filtered rows below the q-th quantile of column, interpolated like pandas"""
+        where, params = self._where(estates, levels, min_improvement)
+        n_valid = int(self._query(
+            f'SELECT COUNT({column}) AS n FROM {self.table} {where}', params
+        )['n'].iloc[0])
+        if n_valid == 0:
+            return 0
+
+        # Linear interpolation between the two order statistics around (n - 1) * q
+        position = (n_valid - 1) * q
+        low = math.floor(position)
+        neighbours = self._query(f"""
+            SELECT {column} AS value FROM {self.table}
+            {where} AND {column} IS NOT NULL
+            ORDER BY {column}
+            LIMIT 2 OFFSET ?
+        """, params + [low])['value'].tolist()
+        threshold = neighbours[0]
+        if len(neighbours) > 1:
+            threshold += (neighbours[1] - neighbours[0]) * (position - low)
+
+        return int(self._query(
+            f'SELECT COUNT(*) AS n FROM {self.table} {where} AND {column} < ?', params + [threshold]
+        )['n'].iloc[0])
+
+    def fetch(self, estates, levels, min_improvement=None, columns=None):
+        """Materialize the filtered rows as a typed DataFrame, for row-level views"""
+        where, params = self._where(estates, levels, min_improvement)
+        selected = '*' if columns is None else ', '.join(columns)
+        df = self._query(f'SELECT {selected} FROM {self.table} {where} ORDER BY rowid', params)
+
+        # SQLite keeps only TEXT/REAL/INTEGER; restore the ingest dtypes
+        dtypes, parse_dates, _ = build_csv_schema(df.columns)
+        for col in parse_dates:
+            df[col] = pd.to_datetime(df[col])
+        for col, dtype in dtypes.items():
+            if col not in CATEGORICAL_COLUMNS:
+                df[col] = df[col].astype(dtype)
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        return df
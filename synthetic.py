@@ -0,0 +1,178 @@
+import argparse
+import gzip
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from derive import derive_metrics
+from schema import CERTIFICATION_LEVELS
+
+ESTATES = ['Estate A - Riau', 'Estate B - Jambi', 'Estate C - Sumut', 'Estate D - Kalbar']
+CERTIFICATION_MIX = [0.5, 0.35, 0.15]
+
+# Certification dates are spread uniformly over this window
+CERTIFICATION_START = '2024-01-15'
+CERTIFICATION_WINDOW_DAYS = 365
+
+# Rows generated per chunk; chunk boundaries (and so the output) don't depend on the worker count
+DEFAULT_CHUNK_ROWS = 250_000
+
+
+def resolve_estates(estates):
+    """Accept a list of estate names or a number of estates to name automatically"""
+    if isinstance(estates, int):
+        return [f'Estate {i:02d}' for i in range(1, estates + 1)]
+    return list(estates)
+
+
+def generate_chunk(start, n_workers, seed, estates, afdelings, certification_mix, mandors=None):
+    """Generate one chunk of workers numbered from start + 1 with its own seed"""
+    rng = np.random.default_rng(seed)
+    numbers = np.arange(start + 1, start + n_workers + 1).astype(str)
+
+    data = {
+        'ID_Pekerja': np.char.add('HRV', np.char.zfill(numbers, 4)),
+        'Nama_Pekerja': np.char.add('Pekerja ', numbers),
+        'Estate': rng.choice(estates, n_workers),
+    }
+    if afdelings:
+        data['Afdeling'] = np.char.add('AFD ', np.char.zfill(rng.integers(1, afdelings + 1, n_workers).astype(str), 2))
+    if mandors:
+        # Harvest crews are numbered within their afdeling (or estate)
+        data['Mandor'] = np.char.add('Mandor ', np.char.zfill(rng.integers(1, mandors + 1, n_workers).astype(str), 2))
+    data.update({
+        'Tanggal_Sertifikasi': (pd.Timestamp(CERTIFICATION_START) +
+                                pd.to_timedelta(rng.integers(0, CERTIFICATION_WINDOW_DAYS, n_workers), unit='D')),
+
+        # Performance BEFORE certification (baseline lower)
+        'Tonase_Sebelum_kg_per_hari': rng.normal(850, 120, n_workers).round(1),
+        'Jumlah_Pokok_Sebelum': rng.integers(45, 70, n_workers),
+        'Brondolan_Loss_Sebelum_pct': rng.normal(8.5, 2.1, n_workers).round(2).clip(0),
+        'Buah_Mentah_Sebelum_pct': rng.normal(6.8, 1.8, n_workers).round(2).clip(0),
+        'Buah_Busuk_Sebelum_pct': rng.normal(4.2, 1.2, n_workers).round(2).clip(0),
+        'Gagang_Panjang_Sebelum_pct': rng.normal(12.5, 3.2, n_workers).round(2).clip(0),
+        'Hari_Kerja_Sebelum': rng.integers(22, 26, n_workers),
+
+        # Performance AFTER certification (improved)
+        'Tonase_Sesudah_kg_per_hari': rng.normal(1050, 110, n_workers).round(1),
+        'Jumlah_Pokok_Sesudah': rng.integers(60, 85, n_workers),
+        'Brondolan_Loss_Sesudah_pct': rng.normal(4.2, 1.5, n_workers).round(2).clip(0),
+        'Buah_Mentah_Sesudah_pct': rng.normal(2.8, 1.1, n_workers).round(2).clip(0),
+        'Buah_Busuk_Sesudah_pct': rng.normal(1.5, 0.8, n_workers).round(2).clip(0),
+        'Gagang_Panjang_Sesudah_pct': rng.normal(5.2, 1.8, n_workers).round(2).clip(0),
+        'Hari_Kerja_Sesudah': rng.integers(24, 27, n_workers),
+
+        # Financial metrics
+        'Upah_Dasar_per_hari': rng.choice([85000, 90000, 95000], n_workers),
+        'Premi_per_kg': rng.choice([150, 175, 200], n_workers),
+
+        # Additional context
+        'Lama_Bekerja_tahun': rng.integers(1, 15, n_workers),
+        'Usia': rng.integers(22, 55, n_workers),
+        'Tingkat_Sertifikasi': rng.choice(CERTIFICATION_LEVELS, n_workers, p=certification_mix)
+    })
+
+    return derive_metrics(pd.DataFrame(data, index=pd.RangeIndex(start, start + n_workers)))
+
+
+def iter_dummy_chunks(n_workers=50, estates=ESTATES, afdelings=None, certification_mix=CERTIFICATION_MIX,
+                      seed=42, chunk_rows=DEFAULT_CHUNK_ROWS, max_workers=None, mandors=None):
+    """Yield generated chunks in order, optionally computed across a process pool"""
+    estates = resolve_estates(estates)
+    certification_mix = np.asarray(certification_mix, dtype='float64')
+    certification_mix = certification_mix / certification_mix.sum()
+
+    # One independent, reproducible seed per chunk
+    n_chunks = max(1, -(-n_workers // chunk_rows))
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    tasks = [
+        (i * chunk_rows, min(chunk_rows, n_workers - i * chunk_rows), seeds[i], estates, afdelings, certification_mix, mandors)
+        for i in range(n_chunks)
+    ]
+
+    if not max_workers or max_workers <= 1 or n_chunks == 1:
+        for task in tasks:
+            yield generate_chunk(*task)
+        return
+
+    # Keep a bounded number of chunks in flight so memory stays flat when writing to disk
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(generate_chunk, *task))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def generate_dummy_data(n_workers=50, estates=ESTATES, afdelings=None, certification_mix=CERTIFICATION_MIX,
+                        seed=42, chunk_rows=DEFAULT_CHUNK_ROWS, max_workers=None, mandors=None):
+    """Generate comprehensive dummy data for oil palm harvesters"""
+    chunks = iter_dummy_chunks(n_workers, estates, afdelings, certification_mix, seed, chunk_rows, max_workers, mandors)
+    return pd.concat(chunks) if n_workers > chunk_rows else next(chunks)
+
+
+def write_dummy_data(path, n_workers=50, estates=ESTATES, afdelings=None, certification_mix=CERTIFICATION_MIX,
+                     seed=42, chunk_rows=DEFAULT_CHUNK_ROWS, max_workers=None, mandors=None):
+    """Generate dummy data chunk by chunk straight to a .parquet, .csv or .csv.gz file"""
+    chunks = iter_dummy_chunks(n_workers, estates, afdelings, certification_mix, seed, chunk_rows, max_workers, mandors)
+    path = str(path)
+
+    if path.endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression='snappy')
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wb') as target:
+        for i, chunk in enumerate(chunks):
+            target.write(chunk.to_csv(index=False, header=i == 0).encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic harvester data for load testing")
+    parser.add_argument('output', help="Output file (.parquet, .csv or .csv.gz)")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Number of workers")
+    parser.add_argument('--estates', type=int, default=len(ESTATES), help="Number of estates")
+    parser.add_argument('--afdelings', type=int, default=0, help="Afdelings per estate (0 = no Afdeling column)")
+    parser.add_argument('--mandors', type=int, default=0, help="Harvest crews per afdeling (0 = no Mandor column)")
+    parser.add_argument('--mix', default=','.join(map(str, CERTIFICATION_MIX)),
+                        help="Dasar,Madya,Mahir proportions")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size (default: single process)")
+    args = parser.parse_args()
+
+    estates = ESTATES if args.estates == len(ESTATES) else args.estates
+    start = time.perf_counter()
+    write_dummy_data(
+        args.output,
+        n_workers=args.rows,
+        estates=estates,
+        afdelings=args.afdelings,
+        certification_mix=[float(p) for p in args.mix.split(',')],
+        seed=args.seed,
+        chunk_rows=args.chunk_rows,
+        max_workers=args.workers,
+        mandors=args.mandors
+    )
+    print(f"{args.rows:,} baris ditulis ke {args.output} dalam {time.perf_counter() - start:.1f} detik")
+
+
+if __name__ == "__main__":
+    main()
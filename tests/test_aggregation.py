@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from aggregation import CellAggregates, aggregate_production
+from filter_index import FilterIndex
+from synthetic import generate_dummy_data
+
+
+def test_estate_order_follows_the_rows_passing_the_threshold():
+    df = generate_dummy_data(3000, seed=4)
+    # The first row of the first estate falls below the threshold, so another estate appears first
+    first = df.loc[0, 'Estate']
+    other = df.loc[df['Estate'] != first, 'Estate'].iloc[0]
+    df.loc[0, 'Peningkatan_Tonase_pct'] = -50
+    df.loc[1:200, 'Estate'] = np.where(df.loc[1:200, 'Estate'] == first, other, df.loc[1:200, 'Estate'])
+
+    aggregates = CellAggregates(df, FilterIndex(df), buckets=16)
+    levels = list(df['Tingkat_Sertifikasi'].unique())
+    estates = list(df['Estate'].unique())
+    for min_value in (None, -10.0, 5.0, 12.5):
+        rows = df if min_value is None else df[df['Peningkatan_Tonase_pct'] >= min_value]
+        expected = aggregate_production(rows, by='Estate')
+        _, result = aggregates.summary({'Estate': estates, 'Tingkat_Sertifikasi': levels}, min_value)
+        assert result['Estate'].tolist() == expected['Estate'].tolist()
+        pd.testing.assert_series_equal(result['Jumlah_Pemanen'], expected['Jumlah_Pemanen'], check_dtype=False)
+
+
+def test_rows_with_a_missing_level_belong_to_no_cell():
+    df = generate_dummy_data(2000, seed=5)
+    df['Tingkat_Sertifikasi'] = df['Tingkat_Sertifikasi'].astype(object)
+    df.loc[:19, 'Tingkat_Sertifikasi'] = np.nan
+
+    aggregates = CellAggregates(df, FilterIndex(df), buckets=16)
+    selections = {'Estate': list(df['Estate'].unique()), 'Tingkat_Sertifikasi': ['Dasar', 'Madya', 'Mahir']}
+    for min_value in (None, -20.0, 10.0):
+        rows = df.iloc[20:] if min_value is None else df.iloc[20:][df['Peningkatan_Tonase_pct'].iloc[20:] >= min_value]
+        kpis, _ = aggregates.summary(selections, min_value)
+        assert kpis['count'] == len(rows)
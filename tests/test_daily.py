@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+
+from daily import DailyHarvestStore
+
+N_WORKERS = 30
+DAYS = pd.date_range('2024-01-01', periods=120)
+
+
+def make_roster(cert_offset=0, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'ID_Pekerja': [f'HRV{i:04d}' for i in range(N_WORKERS)],
+        'Nama_Pekerja': [f'Pekerja {i}' for i in range(N_WORKERS)],
+        'Tanggal_Sertifikasi': (pd.Timestamp('2024-02-15') + pd.to_timedelta(cert_offset, unit='D') +
+                                pd.to_timedelta(rng.integers(0, 30, N_WORKERS), unit='D')),
+        'Tingkat_Sertifikasi': rng.choice(['Dasar', 'Madya', 'Mahir'], N_WORKERS),
+        'Upah_Dasar_per_hari': 90_000,
+        'Premi_per_kg': 175,
+        'Lama_Bekerja_tahun': 3,
+        'Usia': 30
+    })
+
+
+def make_records(seed=1):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for day in DAYS:
+        worked = np.flatnonzero(rng.random(N_WORKERS) < 0.85)
+        n = len(worked)
+        frames.append(pd.DataFrame({
+            'ID_Pekerja': [f'HRV{i:04d}' for i in worked],
+            'Estate': np.array(['Estate A', 'Estate B'])[worked % 2],
+            'Tanggal': day,
+            'Tonase_kg': rng.normal(900, 100, n).round(1),
+            'Jumlah_Pokok': rng.integers(40, 80, n),
+            'Brondolan_Loss_pct': rng.normal(6, 1, n).round(2),
+            'Buah_Mentah_pct': rng.normal(4, 1, n).round(2),
+            'Buah_Busuk_pct': rng.normal(3, 1, n).round(2),
+            'Gagang_Panjang_pct': rng.normal(9, 2, n).round(2)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def load(roster, records, roster_first, batches=4):
+    store = DailyHarvestStore()
+    if roster_first:
+        store.register_roster(roster)
+    for i, rows in enumerate(np.array_split(np.arange(len(records)), batches)):
+        store.append(records.iloc[rows], batch_id=i)
+    if not roster_first:
+        store.register_roster(roster)
+    return store
+
+
+def summary(store):
+    return store.worker_summary().sort_values('ID_Pekerja').reset_index(drop=True)
+
+
+def test_roster_after_records_matches_roster_first():
+    roster, records = make_roster(), make_records()
+    expected = summary(load(roster, records, roster_first=True))
+    result = summary(load(roster, records, roster_first=False))
+
+    assert len(expected) == N_WORKERS
+    tm.assert_frame_equal(result, expected, check_exact=False, rtol=1e-9)
+
+
+def test_corrected_certification_dates_resplit_records():
+    records = make_records()
+    store = load(make_roster(), records, roster_first=True)
+    corrected = make_roster(cert_offset=14)
+    store.register_roster(corrected)
+
+    tm.assert_frame_equal(summary(store), summary(load(corrected, records, roster_first=True)),
+                          check_exact=False, rtol=1e-9)
+
+
+def test_resplit_survives_save_and_load(tmp_path):
+    roster, records = make_roster(), make_records()
+    store = load(roster, records, roster_first=False, batches=1)
+    store.save(tmp_path / 'daily.pkl')
+    restored = DailyHarvestStore.load(tmp_path / 'daily.pkl')
+    corrected = make_roster(cert_offset=7)
+    restored.register_roster(corrected)
+
+    tm.assert_frame_equal(summary(restored), summary(load(corrected, records, roster_first=True)),
+                          check_exact=False, rtol=1e-9)
+
+
+def test_empty_store_summary_is_empty():
+    store = DailyHarvestStore()
+    assert len(store.worker_summary()) == 0
+
+    # A roster alone has no records to compare yet
+    store.register_roster(make_roster())
+    assert len(store.worker_summary()) == 0
+
+
+def test_save_appends_only_new_batches(tmp_path):
+    roster, records = make_roster(), make_records()
+    path = tmp_path / 'daily.pkl'
+    halves = np.array_split(np.arange(len(records)), 2)
+    store = DailyHarvestStore()
+    store.append(records.iloc[halves[0]], batch_id=0)
+    store.save(path)
+    first_batch = (tmp_path / 'daily.pkl.history' / '000000.npz').stat().st_mtime_ns
+
+    store = DailyHarvestStore.load(path)
+    store.append(records.iloc[halves[1]], batch_id=1)
+    store.save(path)
+
+    # The saved store file holds no records; the second save adds one batch file and leaves the first alone
+    assert store.history == []
+    assert sorted(p.name for p in (tmp_path / 'daily.pkl.history').iterdir()) == ['000000.npz', '000001.npz']
+    assert (tmp_path / 'daily.pkl.history' / '000000.npz').stat().st_mtime_ns == first_batch
+
+    restored = DailyHarvestStore.load(path)
+    restored.register_roster(roster)
+    tm.assert_frame_equal(summary(restored), summary(load(roster, records, roster_first=True)),
+                          check_exact=False, rtol=1e-9)
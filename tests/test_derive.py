@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+
+from derive import derive_metrics
+
+
+def test_zero_baseline_tonnage_gives_nan_improvement():
+    df = pd.DataFrame({
+        'Tonase_Sebelum_kg_per_hari': [0.0, 800.0, 0.0],
+        'Tonase_Sesudah_kg_per_hari': [900.0, 1000.0, 0.0]
+    })
+
+    gain = derive_metrics(df)['Peningkatan_Tonase_pct'].to_numpy()
+
+    assert np.isnan(gain[0]) and np.isnan(gain[2])
+    assert gain[1] == 25.0
@@ -0,0 +1,18 @@
+import numpy as np
+
+from ranking import group_positions
+from synthetic import generate_dummy_data
+
+
+def test_rows_with_a_missing_key_are_skipped():
+    df = generate_dummy_data(300, seed=2)
+    df['Estate'] = df['Estate'].astype(object)
+    df.loc[[0, 5, 7], 'Estate'] = np.nan
+
+    keys, positions = group_positions(df, ['Estate', 'Tingkat_Sertifikasi'])
+
+    assert len(keys) == len(positions)
+    rows = np.concatenate(positions)
+    assert sorted(rows) == [row for row in range(300) if row not in (0, 5, 7)]
+    for (estate, level), group in zip(keys.itertuples(index=False), positions):
+        assert (df.loc[group, 'Estate'] == estate).all() and (df.loc[group, 'Tingkat_Sertifikasi'] == level).all()
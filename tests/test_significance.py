@@ -0,0 +1,15 @@
+import numpy as np
+
+from significance import paired_effects
+from synthetic import generate_dummy_data
+
+
+def test_rows_with_a_missing_cell_key_are_skipped():
+    df = generate_dummy_data(400, seed=3)
+    expected = paired_effects(df.iloc[10:], n_boot=50)
+
+    df['Estate'] = df['Estate'].astype(object)
+    df.loc[:9, 'Estate'] = np.nan
+    result = paired_effects(df, n_boot=50)
+
+    assert result.equals(expected)
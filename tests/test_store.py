@@ -0,0 +1,56 @@
+import logging
+import sqlite3
+
+from store import AnalyticalStore
+from synthetic import ESTATES, generate_dummy_data
+
+LEVELS = ['Dasar', 'Madya', 'Mahir']
+
+
+def test_sessions_read_their_own_dataset(tmp_path):
+    store = AnalyticalStore(str(tmp_path / 'store.db'))
+    store.load(generate_dummy_data(300, seed=1), 'X')
+    x = store.acquire('A', 'X')
+    store.load(generate_dummy_data(500, seed=2), 'Y')
+    y = store.acquire('B', 'Y')
+
+    assert x.kpis(ESTATES, LEVELS)['count'] == 300
+    assert y.kpis(ESTATES, LEVELS)['count'] == 500
+    assert store.latest() == 'Y'
+    assert not store.load(generate_dummy_data(300, seed=1), 'X')
+
+
+def test_prune_keeps_datasets_held_by_active_sessions(tmp_path):
+    store = AnalyticalStore(str(tmp_path / 'store.db'), max_datasets=1)
+    store.load(generate_dummy_data(100, seed=1), 'X')
+    x = store.acquire('A', 'X')
+    store.load(generate_dummy_data(100, seed=2), 'Y')
+    store.acquire('B', 'Y')
+
+    assert store.has('X') and store.has('Y')
+    assert x.kpis(ESTATES, LEVELS)['count'] == 100
+
+    # Once session A is gone, its dataset is the least recently used and is dropped
+    store.acquire('B', 'Y', is_active=lambda session_id: session_id == 'B')
+    assert not store.has('X') and store.has('Y')
+
+
+def test_legacy_layout_is_migrated_once(tmp_path, caplog):
+    path = str(tmp_path / 'store.db')
+    con = sqlite3.connect(path)
+    with con:
+        con.execute('CREATE TABLE pemanen (ID_Pekerja TEXT)')
+        con.execute('CREATE TABLE meta (key TEXT, value TEXT)')
+    con.close()
+
+    with caplog.at_level(logging.WARNING, logger='store'):
+        store = AnalyticalStore(path)
+    assert 'legacy tables' in caplog.text
+    store.load(generate_dummy_data(100, seed=1), 'X')
+
+    # A store already in the current layout is opened as is
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger='store'):
+        store = AnalyticalStore(path)
+    assert not caplog.text
+    assert store.has('X')
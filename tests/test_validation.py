@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthetic import generate_dummy_data
+from validation import (REASON_COLUMN, estate_counts, suspect_estates, validate_daily_frame,
+                        validate_harvester_frame, validate_roster_frame)
+
+
+def test_zero_baseline_tonnage_is_quarantined():
+    df = generate_dummy_data(20)
+    df.loc[3, 'Tonase_Sebelum_kg_per_hari'] = 0
+
+    valid, quarantine = validate_harvester_frame(df)
+
+    assert len(valid) == 19
+    assert quarantine[REASON_COLUMN].tolist() == ['Tonase_Sebelum_kg_per_hari <= 0']
+
+
+def test_small_estate_near_a_large_one_is_kept():
+    df = generate_dummy_data(2000)
+    df['Estate'] = np.where(np.arange(2000) < 1850, 'Estate A', 'Estate B')
+
+    valid, quarantine = validate_harvester_frame(df)
+
+    # Reported as a possible typo, but only an allowlist quarantines rows
+    assert len(valid) == 2000 and len(quarantine) == 0
+    assert suspect_estates(estate_counts(valid['Estate'])) == {'Estate B': 'Estate A'}
+
+    valid, quarantine = validate_harvester_frame(df, allowed_estates=['Estate A'])
+    assert len(valid) == 1850
+    assert set(quarantine[REASON_COLUMN]) == {'Estate tidak dikenal'}
+
+
+def test_daily_records_and_roster_are_validated():
+    records = pd.DataFrame({
+        'ID_Pekerja': ['HRV0001', 'HRV0002', 'HRV0003'],
+        'Estate': ['Estate A'] * 3,
+        'Tanggal': ['2024-03-01', '2024-03-01', 'kemarin'],
+        'Tonase_kg': [900.0, -5.0, 880.0],
+        'Jumlah_Pokok': [60, 61, 62],
+        'Brondolan_Loss_pct': [6.0, 6.0, 6.0],
+        'Buah_Mentah_pct': [4.0, 4.0, 4.0],
+        'Buah_Busuk_pct': [3.0, 3.0, 3.0],
+        'Gagang_Panjang_pct': [9.0, 9.0, 9.0]
+    })
+    valid, quarantine = validate_daily_frame(records)
+    assert valid['ID_Pekerja'].tolist() == ['HRV0001']
+    assert quarantine[REASON_COLUMN].tolist() == ['Tonase_kg < 0', 'Tanggal bukan tanggal; Tanggal kosong']
+
+    with pytest.raises(ValueError, match='Tonase_kg'):
+        validate_daily_frame(records.drop(columns='Tonase_kg'))
+
+    # Workers not certified yet have no date; a level is required for the dashboard's filter
+    roster = pd.DataFrame({
+        'ID_Pekerja': ['HRV0001', 'HRV0002'],
+        'Tanggal_Sertifikasi': ['2024-02-15', None],
+        'Tingkat_Sertifikasi': ['Madya', None]
+    })
+    valid, quarantine = validate_roster_frame(roster)
+    assert valid['ID_Pekerja'].tolist() == ['HRV0001']
+    assert quarantine[REASON_COLUMN].tolist() == ['Tingkat_Sertifikasi kosong']
+
+    with pytest.raises(ValueError, match='Tingkat_Sertifikasi'):
+        validate_roster_frame(roster.drop(columns='Tingkat_Sertifikasi'))
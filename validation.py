@@ -0,0 +1,196 @@
+import difflib
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+from daily import DAILY_COLUMNS, DEFECT_METRICS
+from schema import CERTIFICATION_LEVELS, DEFECT_COLUMNS, ESTATE_COLUMN, LEVEL_COLUMN
+
+# Columns every upload must have: identity, the certification level and the raw inputs behind all figures
+IDENTITY_COLUMNS = ['ID_Pekerja', 'Nama_Pekerja', ESTATE_COLUMN, LEVEL_COLUMN]
+NUMERIC_COLUMNS = [
+    'Tonase_Sebelum_kg_per_hari', 'Tonase_Sesudah_kg_per_hari',
+    'Jumlah_Pokok_Sebelum', 'Jumlah_Pokok_Sesudah',
+    *DEFECT_COLUMNS,
+    'Hari_Kerja_Sebelum', 'Hari_Kerja_Sesudah',
+    'Upah_Dasar_per_hari', 'Premi_per_kg', 'Lama_Bekerja_tahun'
+]
+REQUIRED_COLUMNS = IDENTITY_COLUMNS + NUMERIC_COLUMNS
+
+# Allowed (min, max) per column, checked when the column is present; None = unbounded
+RANGE_RULES = {
+    **{col: (0, 100) for col in DEFECT_COLUMNS},
+    'Tonase_Sebelum_kg_per_hari': (0, None),
+    'Tonase_Sesudah_kg_per_hari': (0, None),
+    'Jumlah_Pokok_Sebelum': (0, None),
+    'Jumlah_Pokok_Sesudah': (0, None),
+    'Hari_Kerja_Sebelum': (0, 31),
+    'Hari_Kerja_Sesudah': (0, 31),
+    'Upah_Dasar_per_hari': (0, None),
+    'Premi_per_kg': (0, None),
+    'Lama_Bekerja_tahun': (0, None),
+    'Usia': (15, 80)
+}
+
+# Columns whose lower bound is exclusive: the baseline tonnage divides the improvement percentage
+STRICT_LOWER_BOUNDS = {'Tonase_Sebelum_kg_per_hari'}
+
+DATE_COLUMN = 'Tanggal_Sertifikasi'
+
+# Daily mode: a roster needs the level the dashboard filters on and the date that splits
+# before/after (empty for workers not certified yet); every field of a daily record is required
+ROSTER_REQUIRED_COLUMNS = ['ID_Pekerja', 'Tanggal_Sertifikasi', LEVEL_COLUMN]
+ROSTER_NOT_NULL_COLUMNS = ['ID_Pekerja', LEVEL_COLUMN]
+DAILY_NUMERIC_COLUMNS = ['Tonase_kg', 'Jumlah_Pokok', *DEFECT_METRICS]
+DAILY_RANGE_RULES = {
+    **{col: (0, 100) for col in DEFECT_METRICS},
+    'Tonase_kg': (0, None),
+    'Jumlah_Pokok': (0, None)
+}
+
+# A name is reported as a likely typo of another name that is at least this many
+# times more frequent and differs by at most this many letters
+ESTATE_TYPO_RATIO = 10
+ESTATE_TYPO_MAX_EDITS = 2
+
+REASON_COLUMN = 'Alasan_Karantina'
+
+
+def _normalize(name):
+    return re.sub(r'[\W_]+', ' ', str(name)).strip().casefold()
+
+
+def _is_typo(name, other):
+    """Whether name differs from other only in case, punctuation or a few non-digit characters"""
+    a, b = _normalize(name), _normalize(other)
+    changed = ''.join(
+        a[i1:i2] + b[j1:j2]
+        for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+        if tag != 'equal'
+    )
+    # A substitution changes two characters; numbered estates (Estate 01 / Estate 02) are distinct names
+    return len(changed) <= 2 * ESTATE_TYPO_MAX_EDITS and not any(c.isdigit() for c in changed)
+
+
+def suspect_estates(counts):
+    """Rare near-duplicates of a frequent estate name, mapped to the name they likely meant.
+
+    Only a warning: a small estate can legitimately be one letter away from a large
+    one (Estate A / Estate B), so rows are quarantined only against an allowlist.
+    """
+    suspects = {}
+    for name, count in counts.items():
+        for other, other_count in counts.items():
+            if other != name and other_count >= ESTATE_TYPO_RATIO * count and _is_typo(name, other):
+                suspects[name] = other
+                break
+    return suspects
+
+
+def _codes(series):
+    """Integer codes and distinct values of a column, from the categorical codes when available"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Index(uniques)
+
+
+def estate_counts(series):
+    """Rows per estate name present in a column, in order of the distinct values"""
+    codes, estates = _codes(series)
+    counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(estates)), index=estates)
+    return counts[counts > 0]
+
+
+def validate_harvester_frame(df, allowed_estates=None):
+    """Split a parsed upload into valid rows and quarantined rows with the reasons they failed.
+
+    Every rule is evaluated column-wise over the whole frame; reason strings are only
+    built for the failing rows. Text in numeric or date columns is coerced in place.
+    Raises ValueError when required columns are missing.
+    """
+    return _validate(df, REQUIRED_COLUMNS, REQUIRED_COLUMNS, NUMERIC_COLUMNS, RANGE_RULES, [DATE_COLUMN], allowed_estates)
+
+
+def validate_roster_frame(df, allowed_estates=None):
+    """validate_harvester_frame for a daily-mode roster: one row per worker with its certification"""
+    return _validate(df, ROSTER_REQUIRED_COLUMNS, ROSTER_NOT_NULL_COLUMNS, [], RANGE_RULES, [DATE_COLUMN], allowed_estates)
+
+
+def validate_daily_frame(df, allowed_estates=None):
+    """validate_harvester_frame for daily harvest records: one row per worker per day"""
+    return _validate(df, DAILY_COLUMNS, DAILY_COLUMNS, DAILY_NUMERIC_COLUMNS, DAILY_RANGE_RULES, ['Tanggal'], allowed_estates)
+
+
+def _validate(df, required, not_null, numeric, range_rules, date_columns, allowed_estates):
+    """Shared rule engine of the validate_*_frame functions, parameterized by one schema's columns"""
+    missing = [col for col in required if col not in df.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(missing)}")
+
+    failures = []
+    originals = {}
+
+    def check(mask, reason):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            failures.append((reason, mask))
+
+    # Types: numeric and date columns read as text are coerced; values that don't parse fail
+    for col in numeric + [col for col in range_rules if col in df.columns and col not in numeric]:
+        if not is_numeric_dtype(df[col]):
+            coerced = pd.to_numeric(df[col], errors='coerce')
+            check(coerced.isna().to_numpy() & df[col].notna().to_numpy(), f"{col} bukan angka")
+            originals[col], df[col] = df[col], coerced
+    for col in date_columns:
+        if col in df.columns and not is_datetime64_any_dtype(df[col]):
+            coerced = pd.to_datetime(df[col], errors='coerce')
+            check(coerced.isna().to_numpy() & df[col].notna().to_numpy(), f"{col} bukan tanggal")
+            originals[col], df[col] = df[col], coerced
+
+    for col in not_null:
+        check(df[col].isna().to_numpy(), f"{col} kosong")
+
+    for col, (low, high) in range_rules.items():
+        if col not in df.columns:
+            continue
+        values = df[col].to_numpy()
+        if low is not None and col in STRICT_LOWER_BOUNDS:
+            check(values <= low, f"{col} <= {low}")
+        elif low is not None:
+            check(values < low, f"{col} < {low}")
+        if high is not None:
+            check(values > high, f"{col} > {high}")
+
+    # Categorical values: rules are decided once per distinct value, then mapped to rows by code
+    if LEVEL_COLUMN in df.columns:
+        codes, levels = _codes(df[LEVEL_COLUMN])
+        bad_levels = [i for i, level in enumerate(levels) if level not in CERTIFICATION_LEVELS]
+        check(np.isin(codes, bad_levels), f"{LEVEL_COLUMN} bukan {'/'.join(CERTIFICATION_LEVELS)}")
+
+    if allowed_estates and ESTATE_COLUMN in df.columns:
+        codes, estates = _codes(df[ESTATE_COLUMN])
+        allowed = set(allowed_estates)
+        bad_estates = [i for i, estate in enumerate(estates) if estate not in allowed]
+        check(np.isin(codes, bad_estates), "Estate tidak dikenal")
+
+    if not failures:
+        return df, df.iloc[:0].assign(**{REASON_COLUMN: pd.Series(dtype='str')})
+
+    bad = np.logical_or.reduce([mask for _, mask in failures])
+    rows = np.flatnonzero(bad)
+    matrix = np.column_stack([mask[rows] for _, mask in failures])
+    reasons = np.array([reason for reason, _ in failures], dtype=object)
+    # Quarantined rows keep the values as uploaded, so the report shows what to fix
+    quarantine = df.iloc[rows].copy()
+    for col, values in originals.items():
+        quarantine[col] = values.iloc[rows].to_numpy()
+    quarantine[REASON_COLUMN] = ['; '.join(reasons[row]) for row in matrix]
+
+    valid = df.iloc[np.flatnonzero(~bad)].reset_index(drop=True)
+    for col in (ESTATE_COLUMN, LEVEL_COLUMN):
+        if col in valid.columns and isinstance(valid[col].dtype, pd.CategoricalDtype):
+            valid[col] = valid[col].cat.remove_unused_categories()
+    return valid, quarantine.reset_index(drop=True)
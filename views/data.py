@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import streamlit as st
+
+from dashboard_context import current_context
+from detail_table import PAGE_SIZES
+from export import EXPORT_FORMATS
+
+# Data Lengkap Pemanen columns and formats; the paged view formats only the visible page
+DETAIL_VIEWS = ["Per Halaman", "Semua Baris"]
+DETAIL_COLUMNS = [
+    'ID_Pekerja', 'Nama_Pekerja', 'Estate', 'Tingkat_Sertifikasi',
+    'Tonase_Sebelum_kg_per_hari', 'Tonase_Sesudah_kg_per_hari', 'Peningkatan_Tonase_pct',
+    'Kualitas_Score_Sebelum', 'Kualitas_Score_Sesudah',
+    'Pendapatan_Sebelum', 'Pendapatan_Sesudah', 'Peningkatan_Pendapatan'
+]
+DETAIL_FORMATS = {
+    'Tonase_Sebelum_kg_per_hari': '{:.1f}',
+    'Tonase_Sesudah_kg_per_hari': '{:.1f}',
+    'Peningkatan_Tonase_pct': '{:.2f}%',
+    'Kualitas_Score_Sebelum': '{:.1f}',
+    'Kualitas_Score_Sesudah': '{:.1f}',
+    'Pendapatan_Sebelum': 'Rp {:,.0f}',
+    'Pendapatan_Sesudah': 'Rp {:,.0f}',
+    'Peningkatan_Pendapatan': 'Rp {:,.0f}'
+}
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def get_detail_view(dataset_key, filter_key, sort_column, ascending, query, _detail):
+    """Display order of the filtered rows for one sort and search; shared read-only, so paging never copies it"""
+    table, positions = _detail()
+    return table.view(positions, sort_column, ascending, query)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def get_filtered_export(dataset_key, filter_key, export_format, _rows):
+    """Serialize the filtered data on demand, cached per filter state and format"""
+    serializer, _, _ = EXPORT_FORMATS[export_format]
+    return serializer(_rows())
+
+context = current_context()
+dataset_key, filter_key = context.dataset_key, context.filter_key
+
+# ==================== DETAILED DATA TABLE ====================
+context.timer.start('detail_table')
+st.header("📋 Data Lengkap Pemanen")
+
+detail_view = st.radio("Tampilan", DETAIL_VIEWS, horizontal=True, key="detail_view")
+
+if detail_view == DETAIL_VIEWS[0]:
+    # Server-side search, sort and paging; only the visible page is formatted
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        query = st.text_input("Cari ID / Nama Pekerja", key="detail_query")
+    with col2:
+        sort_column = st.selectbox(
+            "Urutkan",
+            [None] + DETAIL_COLUMNS,
+            format_func=lambda col: "Urutan asli" if col is None else col,
+            key="detail_sort"
+        )
+    with col3:
+        ascending = st.radio("Arah", ["Naik", "Turun"], key="detail_direction") == "Naik"
+    with col4:
+        page_size = st.selectbox("Baris per halaman", PAGE_SIZES, index=1, key="detail_page_size")
+    
+    table, _ = context.detail()
+    ordered = get_detail_view(dataset_key, filter_key, sort_column, ascending, query, context.detail)
+    n_pages = max(1, -(-len(ordered) // page_size))
+    if st.session_state.get('detail_page', 1) > n_pages:
+        st.session_state['detail_page'] = n_pages
+    page = int(st.number_input(f"Halaman (dari {n_pages})", min_value=1, max_value=n_pages, key="detail_page"))
+    
+    st.dataframe(
+        table.page(ordered, page, page_size, DETAIL_COLUMNS).style.format(DETAIL_FORMATS),
+        use_container_width=True,
+        height=400
+    )
+    first_row = (page - 1) * page_size
+    if len(ordered):
+        st.caption(f"Menampilkan {first_row + 1:,}–{min(first_row + page_size, len(ordered)):,} dari {len(ordered):,} pemanen")
+    else:
+        st.caption("Tidak ada pemanen yang cocok")
+else:
+    st.dataframe(
+        context.rows()[DETAIL_COLUMNS].style.format(DETAIL_FORMATS),
+        use_container_width=True,
+        height=400
+    )
+
+# Download button for filtered data; the file is only built when clicked
+export_format = st.radio(
+    "Format Download",
+    list(EXPORT_FORMATS),
+    horizontal=True,
+    key="export_format"
+)
+_, export_extension, export_mime = EXPORT_FORMATS[export_format]
+st.download_button(
+    label=f"📥 Download Data Terfilter ({export_format})",
+    data=lambda: get_filtered_export(dataset_key, filter_key, export_format, context.rows),
+    file_name=f"data_pemanen_tersertifikasi_{datetime.now().strftime('%Y%m%d')}.{export_extension}",
+    mime=export_mime
+)
+if 'Parquet' not in EXPORT_FORMATS:
+    st.caption("Format Parquet tidak tersedia: paket pyarrow belum terpasang (lihat requirements.txt)")
@@ -0,0 +1,85 @@
+import streamlit as st
+
+from charts import estate_figures
+from dashboard_context import current_context
+from insights import kpi_cards
+
+# Session State key of the drill-down path: the Estate, Afdeling and Mandor opened so far
+DRILL_KEY = 'estate_drill_path'
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_estate_figures(dataset_key, filter_key, path, by, _estate_metrics):
+    """Performa Estate figure and rounded table, cached per (dataset, filter state, drill-down node)"""
+    return estate_figures(_estate_metrics, by)
+
+def open_node(path):
+    """Move the drill-down to the node at path and redraw the page"""
+    st.session_state[DRILL_KEY] = list(path)
+    st.rerun()
+
+context = current_context()
+
+# ==================== ESTATE PERFORMANCE ====================
+context.timer.start('estate_production')
+cube = context.rollup()
+
+# A node outside the current filter state (or dataset) rolls back up to its nearest ancestor that has workers
+path = tuple(st.session_state.get(DRILL_KEY, ()))[:len(cube.hierarchy)]
+while path and not cube.kpis(path, context.selections)['count']:
+    path = path[:-1]
+by = cube.child_column(path) or 'Tingkat_Sertifikasi'
+estate_metrics = cube.children(path, context.selections)
+
+context.timer.start('section_estate')
+st.header("🏢 Performa per Estate")
+
+# Breadcrumb of the opened nodes; each button rolls back up to that level
+crumbs = [("Semua Estate", ())] + [(value, path[:i + 1]) for i, value in enumerate(path)]
+for i, (column, (label, node)) in enumerate(zip(st.columns(len(crumbs) + 1), crumbs)):
+    with column:
+        if st.button(label, key=f"drill_crumb_{i}", disabled=node == path, use_container_width=True):
+            open_node(node)
+
+if path:
+    for column, (label, value, delta) in zip(st.columns(5), kpi_cards(cube.kpis(path, context.selections), estate_metrics)):
+        with column:
+            st.metric(label, value, delta)
+
+content = get_estate_figures(context.dataset_key, context.filter_key, path, by, estate_metrics)
+
+# Clicking a bar opens that estate, afdeling or crew; the lowest level is split per certification level
+if cube.child_column(path):
+    st.caption(f"Klik batang grafik untuk membuka {by} di dalamnya")
+    event = st.plotly_chart(
+        content['fig_estate'],
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key=f"drill_chart_{'/'.join(path)}"
+    )
+    points = event.selection.points if event else []
+    if points:
+        open_node(path + (str(points[0]['x']),))
+else:
+    st.plotly_chart(content['fig_estate'], use_container_width=True)
+
+estate_metrics_display = content['estate_metrics_display']
+
+st.dataframe(
+    estate_metrics_display.style.format({
+        'Produksi_Sebelum_ton': '{:.2f}',
+        'Produksi_Sesudah_ton': '{:.2f}',
+        'Peningkatan_ton': '{:.2f}',
+        'Revenue_Impact_juta': 'Rp {:.2f}M',
+        'Avg_Quality_Before': '{:.1f}',
+        'Avg_Quality_After': '{:.1f}',
+        'Tonase_Sesudah_Rata': '{:.1f}',
+        'Tonase_Sesudah_Std': '{:.1f}',
+        'Hari_Kerja_Sesudah_Rata': '{:.1f}',
+        'Brondolan_Loss_Sesudah_Rata': '{:.2f}',
+        'Pendapatan_Sesudah_Rata': 'Rp {:,.0f}',
+        'Pendapatan_Sesudah_Std': 'Rp {:,.0f}'
+    }),
+    use_container_width=True,
+    height=250
+)
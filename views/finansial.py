@@ -0,0 +1,92 @@
+import streamlit as st
+
+from charts import financial_figures, scenario_heatmap
+from dashboard_context import current_context
+from scenario import SCENARIO_METRICS, SCENARIO_WAGES, ScenarioCube
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_financial_figures(dataset_key, filter_key, _rows, _sketches):
+    """Dampak Finansial figures and income breakdown, cached per (dataset, filter state)"""
+    return financial_figures(_rows(), sketches=_sketches())
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_scenario_cube(dataset_key, filter_key, _inputs):
+    """FFB price x premium x wage scenario grid of the filtered rows, cached per (dataset, filter state)"""
+    return ScenarioCube(_inputs())
+
+context = current_context()
+
+# ==================== FINANCIAL IMPACT ====================
+context.timer.start('section_financial')
+st.header("💰 Dampak Finansial: Sebelum vs Sesudah Sertifikasi")
+
+content = get_financial_figures(context.dataset_key, context.filter_key, context.rows, context.sketches)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.plotly_chart(content['fig_income'], use_container_width=True)
+
+with col2:
+    st.plotly_chart(content['fig_cert_income'], use_container_width=True)
+
+# Financial breakdown
+st.markdown("### 💵 Breakdown Pendapatan")
+
+avg_premium_before = content['avg_premium_before']
+avg_premium_after = content['avg_premium_after']
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("Rata-rata Upah Dasar/Bulan", f"Rp {content['avg_base_salary']/1_000_000:.2f}M")
+
+with col2:
+    st.metric("Rata-rata Premi Sebelum", f"Rp {avg_premium_before/1_000_000:.2f}M")
+    st.metric("Rata-rata Premi Sesudah", f"Rp {avg_premium_after/1_000_000:.2f}M", f"+Rp {(avg_premium_after - avg_premium_before)/1_000:.0f}K")
+
+with col3:
+    st.metric("Total Tambahan Pendapatan", f"Rp {content['total_additional_income']/1_000_000:.2f}M", "untuk semua pemanen")
+
+st.markdown("---")
+
+# ==================== SCENARIO SWEEP ====================
+context.timer.start('scenario')
+st.header("🧮 Simulasi Skenario Harga TBS, Premi & Upah")
+
+# The whole price x premium x wage grid is computed at once from per-estate sums
+cube = get_scenario_cube(context.dataset_key, context.filter_key, context.scenario_inputs)
+col1, col2, col3 = st.columns(3)
+with col1:
+    scenario_metric = st.selectbox("Metrik", list(SCENARIO_METRICS), key="scenario_metric")
+with col2:
+    scenario_wage = st.select_slider(
+        "Upah Dasar (Rp/hari)",
+        options=[int(wage) for wage in SCENARIO_WAGES],
+        value=int(SCENARIO_WAGES[len(SCENARIO_WAGES) // 2]),
+        format_func=lambda wage: f"{wage:,}",
+        key="scenario_wage"
+    )
+with col3:
+    scenario_estate = st.selectbox("Estate", ["Semua Estate"] + cube.groups, key="scenario_estate")
+scenario_groups = None if scenario_estate == "Semua Estate" else [scenario_estate]
+
+col1, col2 = st.columns([3, 2])
+
+with col1:
+    st.plotly_chart(
+        scenario_heatmap(cube.heatmap(scenario_metric, scenario_wage, scenario_groups), scenario_metric, scenario_wage),
+        use_container_width=True
+    )
+
+with col2:
+    st.markdown("### 📐 Sensitivitas")
+    st.caption("Perubahan metrik dari nilai terendah ke tertinggi tiap parameter, parameter lain tetap di titik dasar")
+    st.dataframe(
+        cube.sensitivity(groups=scenario_groups).style.format({
+            'Dari': '{:,.0f}',
+            'Sampai': '{:,.0f}',
+            **{metric: '{:+,.1f}' for metric in SCENARIO_METRICS}
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
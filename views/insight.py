@@ -0,0 +1,140 @@
+import streamlit as st
+
+from charts import cohort_figures
+from cohort import COHORT_METRICS
+from dashboard_context import STATS_WORKERS, current_context
+from insights import NEXT_STEPS, best_estate, improvement_areas, key_findings
+
+@st.cache_data(max_entries=8, show_spinner="Menghitung uji signifikansi...")
+def get_paired_effects(dataset_key, filter_key, _rows):
+    """Overall and per Estate x Tingkat_Sertifikasi paired tests, cached per (dataset, filter state)"""
+    rows = _rows()
+    return (
+        paired_effects(rows, by=[], max_workers=STATS_WORKERS),
+        paired_effects(rows, max_workers=STATS_WORKERS)
+    )
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_cohort_views(dataset_key, filter_key, metric, _cohorts):
+    """Cohort heatmap, decay curves and cohort table of one metric, summed from the selected cohort cells"""
+    estates, levels, _ = filter_key
+    selections = {'Estate': estates, 'Tingkat_Sertifikasi': levels}
+    cohorts = _cohorts()
+    label = COHORT_METRICS[metric][0]
+    return {
+        **cohort_figures(cohorts.heatmap(metric, selections), cohorts.decay(metric, selections), label),
+        'cohort_table': cohorts.cohort_table(selections),
+        'reference': cohorts.reference
+    }
+
+context = current_context()
+dataset_key, filter_key = context.dataset_key, context.filter_key
+
+context.timer.start('estate_production')
+summary = context.summary()
+kpis = summary['kpis']
+
+# ==================== INSIGHTS & RECOMMENDATIONS ====================
+context.timer.start('insights')
+st.header("💡 Insight & Rekomendasi")
+
+# Paired tests are opt-in: they need the filtered rows and resample every estate x level cell
+show_significance = st.toggle(
+    "Uji signifikansi (paired t-test, Wilcoxon, bootstrap CI 95%)",
+    key="significance"
+)
+effects = None
+if show_significance and kpis['count'] > 1:
+    # scipy is only imported once the tests are switched on
+    from significance import METRIC_PAIRS, paired_effects
+    
+    context.timer.start('significance')
+    overall_effects, cell_effects = get_paired_effects(dataset_key, filter_key, context.rows)
+    effects = overall_effects.set_index('Metrik')
+    context.timer.start('insights')
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.markdown("### ✅ Key Findings")
+    st.success(key_findings(kpis))
+    
+    if effects is not None:
+        tonnage = effects.loc['Tonase (kg/hari)']
+        quality = effects.loc['Skor Kualitas']
+        st.markdown(f"""
+        **Signifikansi (sesudah − sebelum, CI 95%):**
+        - Tonase: **{tonnage['Selisih']:+.1f} kg/hari** ({tonnage['CI_Bawah']:+.1f} s/d {tonnage['CI_Atas']:+.1f}), p = {tonnage['p_t']:.2g}
+        - Skor kualitas: **{quality['Selisih']:+.1f} poin** ({quality['CI_Bawah']:+.1f} s/d {quality['CI_Atas']:+.1f}), p = {quality['p_t']:.2g}
+        """)
+    
+    best = best_estate(summary['estate_metrics'])
+    if best is not None:
+        st.info(best)
+
+with col2:
+    st.markdown("### 🎯 Rekomendasi Strategis")
+    
+    # Identify areas for improvement
+    st.warning(improvement_areas(summary['low_performers']))
+    
+    st.info(NEXT_STEPS)
+
+if effects is not None:
+    st.markdown("### 📐 Uji Signifikansi per Estate × Tingkat Sertifikasi")
+    metric = st.selectbox("Metrik", list(METRIC_PAIRS), key="significance_metric")
+    st.dataframe(
+        cell_effects[cell_effects['Metrik'] == metric].drop(columns='Metrik').style.format({
+            'Sebelum': '{:,.2f}',
+            'Sesudah': '{:,.2f}',
+            'Selisih': '{:+,.2f}',
+            'CI_Bawah': '{:+,.2f}',
+            'CI_Atas': '{:+,.2f}',
+            't': '{:.2f}',
+            'p_t': '{:.2g}',
+            'W': '{:,.0f}',
+            'p_wilcoxon': '{:.2g}'
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+
+st.markdown("---")
+
+# ==================== CERTIFICATION COHORTS ====================
+context.timer.start('cohort')
+st.header("🗓️ Analisis Kohort Sertifikasi")
+
+cohort_metric = st.selectbox(
+    "Metrik Kohort",
+    list(COHORT_METRICS),
+    format_func=lambda key: COHORT_METRICS[key][0],
+    key="cohort_metric"
+)
+cohort_views = get_cohort_views(dataset_key, filter_key, cohort_metric, context.cohorts)
+
+if cohort_views['reference'] is None or cohort_views['cohort_table'].empty:
+    st.info("Tidak ada data Tanggal_Sertifikasi untuk pemanen terfilter")
+else:
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.plotly_chart(cohort_views['fig_cohort'], use_container_width=True)
+    
+    with col2:
+        st.plotly_chart(cohort_views['fig_decay'], use_container_width=True)
+    
+    st.caption(f"Bulan sejak sertifikasi dihitung dari kohort terbaru ({cohort_views['reference']:%Y-%m})")
+    
+    # Training batches ranked by the selected gain
+    st.markdown("### 🏅 Peringkat Kohort")
+    st.dataframe(
+        cohort_views['cohort_table'].sort_values(COHORT_METRICS[cohort_metric][0], ascending=False).style.format({
+            COHORT_METRICS['tonnage_gain'][0]: '{:,.1f}',
+            COHORT_METRICS['quality_gain'][0]: '{:,.1f}',
+            COHORT_METRICS['income_gain'][0]: 'Rp {:,.0f}'
+        }),
+        use_container_width=True,
+        hide_index=True,
+        height=300
+    )
@@ -0,0 +1,35 @@
+import streamlit as st
+
+from charts import quality_figures
+from dashboard_context import current_context
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_quality_figures(dataset_key, filter_key, _rows):
+    """Kualitas figures and defect reductions, cached per (dataset, filter state)"""
+    return quality_figures(_rows())
+
+context = current_context()
+
+# ==================== QUALITY ====================
+context.timer.start('section_quality')
+st.header("⭐ Kualitas Panen: Sebelum vs Sesudah Sertifikasi")
+
+content = get_quality_figures(context.dataset_key, context.filter_key, context.rows)
+quality_metrics = content['quality_metrics']
+
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    st.plotly_chart(content['fig_quality'], use_container_width=True)
+
+with col2:
+    st.markdown("### 🎯 Penurunan Defects")
+    for idx, row in quality_metrics.iterrows():
+        st.metric(
+            row['Metrik'],
+            f"{row['Sesudah']:.1f}%",
+            f"-{row['Penurunan']:.1f}% ({row['Penurunan_pct']:.0f}%)",
+            delta_color="inverse"
+        )
+
+st.plotly_chart(content['fig_quality_score'], use_container_width=True)
@@ -0,0 +1,80 @@
+import streamlit as st
+
+from charts import productivity_figures
+from dashboard_context import current_context
+
+# Top performer tables
+TOP_PRODUCTIVITY_COLUMNS = ['Nama_Pekerja', 'Estate', 'Tonase_Sebelum_kg_per_hari', 'Tonase_Sesudah_kg_per_hari', 'Peningkatan_Tonase_pct']
+TOP_QUALITY_COLUMNS = ['Nama_Pekerja', 'Estate', 'Kualitas_Score_Sebelum', 'Kualitas_Score_Sesudah', 'Tingkat_Sertifikasi']
+
+# Top Performers groupings: label -> grouping column
+RANKING_GROUPS = {
+    "Semua": None,
+    "Per Estate": 'Estate',
+    "Per Tingkat Sertifikasi": 'Tingkat_Sertifikasi'
+}
+RANKING_ORDERS = ["Teratas", "Terbawah"]
+RANKING_K = 10
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_productivity_figures(dataset_key, filter_key, _rows, _sketches):
+    """Produktivitas figures, cached per (dataset, filter state); _rows returns the filtered rows"""
+    return productivity_figures(_rows(), sketches=_sketches())
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_rankings(dataset_key, filter_key, group, k, largest, _rank):
+    """Both Top Performers tables for one grouping and direction, cached with the filter state"""
+    by = RANKING_GROUPS[group]
+    return (
+        _rank('Peningkatan_Tonase_pct', TOP_PRODUCTIVITY_COLUMNS, k, by, largest),
+        _rank('Kualitas_Score_Sesudah', TOP_QUALITY_COLUMNS, k, by, largest)
+    )
+
+context = current_context()
+
+# ==================== PRODUCTIVITY ====================
+context.timer.start('section_productivity')
+st.header("📈 Produktivitas: Sebelum vs Sesudah Sertifikasi")
+
+content = get_productivity_figures(context.dataset_key, context.filter_key, context.rows, context.sketches)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.plotly_chart(content['fig_tonnage'], use_container_width=True)
+
+with col2:
+    st.plotly_chart(content['fig_trees'], use_container_width=True)
+
+st.plotly_chart(content['fig_scatter'], use_container_width=True)
+
+st.markdown("---")
+
+# ==================== TOP PERFORMERS ====================
+context.timer.start('top_performers')
+st.header("🏆 Top Performers")
+
+# Top or bottom k overall, per estate or per certification level (e.g. for mentoring assignments)
+col1, col2, col3 = st.columns([2, 2, 1])
+with col1:
+    ranking_group = st.selectbox("Kelompok", list(RANKING_GROUPS), key="ranking_group")
+with col2:
+    ranking_order = st.radio("Urutan", RANKING_ORDERS, horizontal=True, key="ranking_order")
+with col3:
+    ranking_k = int(st.number_input("Jumlah", min_value=1, max_value=100, value=RANKING_K, key="ranking_k"))
+largest = ranking_order == RANKING_ORDERS[0]
+top_productivity, top_quality = get_rankings(context.dataset_key, context.filter_key, ranking_group, ranking_k, largest, context.rank)
+
+ranking_title = f"{'Top' if largest else 'Bottom'} {ranking_k}"
+if RANKING_GROUPS[ranking_group] is not None:
+    ranking_title += f" {ranking_group.lower()}"
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.markdown(f"### 📈 {ranking_title} Peningkatan Produktivitas")
+    st.dataframe(top_productivity, use_container_width=True, height=400, hide_index=True)
+
+with col2:
+    st.markdown(f"### ⭐ {ranking_title} Kualitas {'Tertinggi' if largest else 'Terendah'}")
+    st.dataframe(top_quality, use_container_width=True, height=400, hide_index=True)
@@ -0,0 +1,29 @@
+import streamlit as st
+
+from daily import ROLLING_WINDOWS
+from dashboard_context import current_context, get_rolling_summary
+from insights import kpi_cards
+
+context = current_context()
+
+# ==================== KEY METRICS ====================
+context.timer.start('estate_production')
+summary = context.summary()
+
+context.timer.start('kpi')
+st.header("📊 Ringkasan Performa")
+
+for column, (label, value, delta) in zip(st.columns(5), kpi_cards(summary['kpis'], summary['estate_metrics'])):
+    with column:
+        st.metric(label, value, delta)
+
+# Rolling aggregates maintained incrementally by the daily store
+if context.daily_store is not None:
+    with st.expander("📅 Agregat Bergulir Data Harian", expanded=False):
+        window = st.radio("Jendela", ROLLING_WINDOWS, format_func=lambda w: f"{w} hari", horizontal=True)
+        rolling_estates = get_rolling_summary(context.dataset_key, window, context.daily_store)
+        st.dataframe(
+            rolling_estates[rolling_estates['Estate'].isin(context.selections['Estate'])],
+            use_container_width=True,
+            hide_index=True
+        )